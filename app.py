@@ -1,12 +1,51 @@
 import os
+import atexit
+import errno
+import gzip
 import hashlib
+import json
+import math
+import queue
+import re
+import secrets
+import shutil
+import tempfile
+import threading
 import time
-from flask import Flask, request, jsonify
+import uuid
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from flask import Flask, Request, request, jsonify, g, has_request_context
 from flask_cors import CORS
-from markitdown import MarkItDown
+from werkzeug.utils import secure_filename
+from werkzeug.wsgi import ClosingIterator
+from markitdown import MarkItDown, ConversionTimeoutException, ConversionMemoryException, DEFAULT_METRICS
+from markitdown import Tracer, ConsoleSpanExporter, FileSpanExporter
+from markitdown.__about__ import __version__ as markitdown_version
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 # import openai
 from openai import OpenAI
 
+# Optional response compression support
+try:
+    import brotli
+except ModuleNotFoundError:
+    brotli = None
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+
+# Optional cross-process locking (POSIX only)
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+
 # Constants
 MAX_FILE_SIZE = os.environ.get("MAX_CONTENT_LENGTH", None)
 if MAX_FILE_SIZE != None: MAX_FILE_SIZE = int(MAX_FILE_SIZE)
@@ -14,6 +53,83 @@ UPLOAD_FOLDER = "uploads"
 OUTPUT_FOLDER = "outputs"
 LOG_FOLDER = "logs"
 ERROR_LOG_FOLDER = "error_logs"
+CACHE_FOLDER = "cache"
+UPLOAD_SESSION_FOLDER = "upload_sessions"
+LOCK_FOLDER = "locks"
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read from the upload stream (and written to disk) at a time
+MIN_COMPRESS_SIZE = 1024  # Responses smaller than this are sent uncompressed
+
+# Logging: JSON lines, written by a background thread to per-worker files in LOG_FOLDER (access and
+# conversion records) and ERROR_LOG_FOLDER (errors). Files roll over daily, and at LOG_MAX_BYTES.
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 64 * 1024 * 1024))
+LOG_QUEUE_SIZE = 10000  # Records waiting to be written; past this, new records are dropped
+LOG_BATCH_SIZE = 500  # Records written (and flushed) together
+LOG_FLUSH_INTERVAL = 1.0  # Seconds a record may wait for others to batch with
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Tracing: "console" prints spans to stderr, "file" appends them (as JSON lines) to TRACE_FILE.
+# Incoming W3C traceparent headers are honoured, so requests join their callers' traces.
+TRACE_EXPORTER = os.environ.get("TRACE_EXPORTER", "").lower()
+TRACE_FILE = os.environ.get("TRACE_FILE", os.path.join(LOG_FOLDER, "traces.jsonl"))
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# Keep a copy of every conversion result in OUTPUT_FOLDER (written in the background)
+ARCHIVE_OUTPUTS = os.environ.get("ARCHIVE_OUTPUTS", "").lower() in ("1", "true", "yes")
+
+# Cache conversion results by content hash, so repeat uploads (or hash lookups) skip the work
+RESULT_CACHE = os.environ.get("RESULT_CACHE", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+CACHE_PRUNE_INTERVAL = 60  # Seconds between checks of the cache size (per worker)
+CONTENT_HASH_HEADER = "X-Content-Hash"
+CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{32}$")  # Hex BLAKE2b, 16-byte digest
+
+# Resumable uploads: large files are sent as ranges into an upload session, then finalized
+MAX_SESSION_SIZE = int(os.environ.get("MAX_SESSION_SIZE", 4 * 1024 * 1024 * 1024))
+SESSION_CHUNK_SIZE = 8 * 1024 * 1024  # Suggested size of each PUT
+SESSION_MAX_AGE = 24 * 60 * 60  # Unfinished sessions older than this (in seconds) are removed
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+# Identical conversions running at the same time are coalesced into one
+COALESCE_TIMEOUT = 600  # Seconds to wait on another worker's conversion before doing it ourselves
+COALESCE_POLL_INTERVAL = 0.05  # Seconds between attempts to take another worker's lock
+
+# Scheduling: conversions are costed up front (in rough seconds of work), then run in a
+# "small" or "large" lane, so one huge document can't hold up everything queued behind it
+MAX_CONCURRENT_CONVERSIONS = int(os.environ.get("MAX_CONCURRENT_CONVERSIONS", os.cpu_count() or 1))
+LARGE_LANE_CONCURRENCY = int(os.environ.get("LARGE_LANE_CONCURRENCY", max(1, MAX_CONCURRENT_CONVERSIONS // 4)))
+LARGE_JOB_COST = float(os.environ.get("LARGE_JOB_COST", 2.0))
+SMALL_LANE_WEIGHT = 4  # Share of conversion slots given to small jobs, relative to large ones
+LARGE_LANE_WEIGHT = 1
+COST_PER_MB = 0.02  # Fallback, for formats without a better measure
+COST_PER_PDF_PAGE = 0.05
+COST_PER_SHEET_CELL = 0.00002
+COST_PER_SLIDE = 0.02
+COST_PER_XML_MB = 0.5  # Uncompressed document XML, for DOCX
+SHEET_DIMENSION_PATTERN = re.compile(rb'<dimension ref="[A-Z]+(\d+)(?::([A-Z]+)(\d+))?"')
+
+# Sandboxing: when either limit is set, each conversion runs in a child process that is
+# stopped if it takes too long or needs too much memory
+CONVERSION_TIMEOUT = os.environ.get("CONVERSION_TIMEOUT", None)
+if CONVERSION_TIMEOUT != None: CONVERSION_TIMEOUT = float(CONVERSION_TIMEOUT)
+CONVERSION_MAX_MEMORY_MB = os.environ.get("CONVERSION_MAX_MEMORY_MB", None)
+if CONVERSION_MAX_MEMORY_MB != None: CONVERSION_MAX_MEMORY_MB = int(CONVERSION_MAX_MEMORY_MB)
+
+# Admission control: past these (per worker) budgets, requests are turned away with a 429
+MAX_IN_FLIGHT_CONVERSIONS = int(os.environ.get("MAX_IN_FLIGHT_CONVERSIONS", 4 * MAX_CONCURRENT_CONVERSIONS))
+MEMORY_BUDGET_MB = int(os.environ.get("MEMORY_BUDGET_MB", 2048))
+MAX_RETRY_AFTER = 60  # Seconds
+MEMORY_PER_PDF_PAGE = 256 * 1024  # Estimated peak memory, in bytes, on top of the file itself
+MEMORY_PER_SHEET_CELL = 1024
+MEMORY_PER_SLIDE = 512 * 1024
+MEMORY_PER_XML_BYTE = 10
+MEMORY_PER_BYTE = {"html": 12, "htm": 12, "xml": 12, "rss": 12, "atom": 12}  # Fallback multiples of file size
+DEFAULT_MEMORY_PER_BYTE = 4
+
+# Debugging: with this set, a request to /convert carrying "X-Debug-Profile: 1" is converted
+# afresh (bypassing the cache), and the response includes per-stage timings and a cProfile report
+ENABLE_DEBUG_HEADERS = os.environ.get("ENABLE_DEBUG_HEADERS", "").lower() in ("1", "true", "yes")
+DEBUG_PROFILE_HEADER = "X-Debug-Profile"
 
 # LLM Settings
 LLM_API_KEY = os.environ.get("LLM_API_KEY", None)
@@ -25,37 +141,332 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 os.makedirs(LOG_FOLDER, exist_ok=True)
 os.makedirs(ERROR_LOG_FOLDER, exist_ok=True)
+os.makedirs(CACHE_FOLDER, exist_ok=True)
+os.makedirs(UPLOAD_SESSION_FOLDER, exist_ok=True)
+os.makedirs(LOCK_FOLDER, exist_ok=True)
+
+# Disk writes that don't need to hold up a response (archiving)
+background_executor = ThreadPoolExecutor(max_workers=1)
+last_cache_prune = 0
+
+# Conversions in progress in this worker, by conversion key
+in_flight = {}
+in_flight_lock = threading.Lock()
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 CORS(app)  # Enable CORS for all routes
 
+if TRACE_EXPORTER == "console":
+    tracer = Tracer(ConsoleSpanExporter())
+elif TRACE_EXPORTER == "file":
+    tracer = Tracer(FileSpanExporter(TRACE_FILE))
+else:
+    tracer = None
+
+
+def trace(name, **attributes):
+    """A span covering a block of work, if tracing is on; otherwise, a context that does nothing."""
+    return tracer.span(name, **attributes) if tracer is not None else nullcontext()
+
+
+class TracingMiddleware:
+    """Runs each request in an "http.request" span (continuing the caller's trace, if it sent a
+    traceparent header), and returns a traceparent header for it. Spans started while handling
+    the request, including MarkItDown's, become its children."""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        attributes = {"method": environ.get("REQUEST_METHOD"), "path": environ.get("PATH_INFO")}
+        match = TRACEPARENT_PATTERN.match(environ.get("HTTP_TRACEPARENT", ""))
+        if match:
+            attributes.update(trace_id=match.group(1), parent_id=match.group(2))
+
+        span = tracer.start_span("http.request", **attributes)
+
+        def traced_start_response(status, headers, exc_info=None):
+            span.set_attribute("status", int(status.split(" ", 1)[0]))
+            headers.append(("traceparent", f"00-{span.trace_id}-{span.span_id}-01"))
+            return start_response(status, headers, exc_info)
+
+        try:
+            with tracer.use_span(span):
+                response = self.wsgi_app(environ, traced_start_response)
+        except BaseException as e:
+            tracer.end_span(span, e)
+            raise
+        # The span ends when the server closes the response, after the response's own close()
+        return ClosingIterator(response, lambda: tracer.end_span(span))
+
+
+if tracer is not None:
+    app.wsgi_app = TracingMiddleware(app.wsgi_app)
+
+# Metrics, served from /metrics. MarkItDown records its conversion metrics in the same registry.
+# Each worker process keeps its own.
+metrics = DEFAULT_METRICS
+metrics.describe("markitdown_http_requests_total", "counter", "HTTP requests, by endpoint, method and status code.")
+metrics.describe("markitdown_http_request_duration_seconds", "histogram", "Time taken to answer HTTP requests, by endpoint.")
+metrics.describe("markitdown_cache_results_total", "counter", "Conversion results served, by how they were obtained (HIT, MISS or COALESCED).")
+metrics.describe("markitdown_scheduler_queued", "gauge", "Conversions waiting for a slot, by lane.")
+metrics.describe("markitdown_scheduler_running", "gauge", "Conversions holding a slot, by lane.")
+metrics.describe("markitdown_admitted_conversions", "gauge", "Conversions admitted (queued or running).")
+metrics.describe("markitdown_admitted_memory_bytes", "gauge", "Estimated memory reserved by admitted conversions.")
+metrics.describe("process_resident_memory_bytes", "gauge", "Resident memory of this worker process.")
 
-def generate_unique_filename(file_stream, filename):
-    """Generate a unique filename based on file content and timestamp."""
-    file_stream.seek(0)  # Ensure reading from the beginning
-    md5_hash = hashlib.md5(file_stream.read()).hexdigest()
-    file_stream.seek(0)  # Reset file pointer
+
+def generate_unique_filename(content_hash, filename):
+    """Generate a unique filename based on file content hash, timestamp and a random suffix."""
     ext = filename.rsplit(".", 1)[-1].lower()
     timestamp = int(time.time())  # Get current timestamp
-    return f"{md5_hash}_{timestamp}.{ext}"
+    # Identical uploads can arrive in the same second, and each one removes its own file when done
+    return f"{content_hash}_{timestamp}_{secrets.token_hex(4)}.{ext}"
+
+
+class HashingUpload:
+    """A file in a multipart upload, written to a temporary file in UPLOAD_FOLDER and hashed
+    (BLAKE2b) as werkzeug parses it off the request. Unless save_upload() keeps it, the file is
+    removed when it is closed."""
+
+    def __init__(self):
+        self.hasher = hashlib.blake2b(digest_size=16)
+        self.size = 0
+        handle, self.path = tempfile.mkstemp(dir=UPLOAD_FOLDER)
+        self.file = os.fdopen(handle, "w+b")
+
+    def write(self, data):
+        self.hasher.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def keep(self, file_path):
+        """Move the file to file_path, rather than removing it on close."""
+        self.file.close()
+        os.replace(self.path, file_path)
+        self.path = None
+
+    def close(self):
+        self.file.close()
+        cleanup_files(self.path)
+        self.path = None
+
+
+class UploadRequest(Request):
+    """Writes each file in a multipart form straight to disk, hashing it on the way, instead of
+    spooling it for save_upload() to read back. Every one is closed with the request, including
+    those of a form that failed to parse."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.uploads = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        upload = HashingUpload()
+        self.uploads.append(upload)
+        return upload
+
+    def close(self):
+        super().close()
+        for upload in self.uploads:
+            upload.close()
+
+
+app.request_class = UploadRequest
+
+
+def save_upload(file):
+    """Keep an upload, which was written to disk and hashed as the request was parsed.
+
+    Returns the saved path, the content hash (BLAKE2b) and the size in bytes.
+    """
+    upload = file.stream
+    content_hash = upload.hasher.hexdigest()
+    file_path = os.path.join(UPLOAD_FOLDER, generate_unique_filename(content_hash, file.filename))
+    upload.keep(file_path)
+    return file_path, content_hash, upload.size
+
+
+def hash_file(file_path):
+    """Hash a file on disk (BLAKE2b, as in save_upload) in large chunks."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as in_file:
+        while True:
+            chunk = in_file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_session_dir(upload_id):
+    """Directory of an upload session, or None if the id is malformed or unknown."""
+    if not upload_id or not UPLOAD_ID_PATTERN.match(upload_id):
+        return None
+    session_dir = os.path.join(UPLOAD_SESSION_FOLDER, upload_id)
+    return session_dir if os.path.isdir(session_dir) else None
+
+
+def read_session(session_dir):
+    """Return an upload session's metadata, along with the byte ranges received so far.
+
+    Each stored range is an empty marker file named "<start>-<end>" (end exclusive), created
+    only once the range's bytes are on disk. Markers never need updating in place, so
+    concurrent PUTs, even from different worker processes, can't lose each other's progress.
+    """
+    with open(os.path.join(session_dir, "session.json"), "r", encoding="utf-8") as meta_file:
+        session = json.load(meta_file)
+
+    ranges = []
+    for name in os.listdir(os.path.join(session_dir, "ranges")):
+        start, end = name.split("-")
+        ranges.append((int(start), int(end)))
+
+    # Merge overlapping and adjacent ranges
+    received = []
+    for start, end in sorted(ranges):
+        if received and start <= received[-1][1]:
+            received[-1][1] = max(received[-1][1], end)
+        else:
+            received.append([start, end])
+    session["received"] = received
+    session["complete"] = received == [[0, session["size"]]] or session["size"] == 0
+    return session
+
+
+def prune_sessions():
+    """Remove upload sessions that were never finalized."""
+    cutoff = time.time() - SESSION_MAX_AGE
+    for entry in os.scandir(UPLOAD_SESSION_FOLDER):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class LogWriter:
+    """Writes log records as JSON lines from a background thread, so logging never waits on disk.
+
+    Records go into a bounded queue (if it is full, they are dropped and counted, rather than
+    blocking), and are written in batches of up to LOG_BATCH_SIZE, each with a single write and
+    flush. Every worker process writes its own files, named <date>.<pid>.<n>.jsonl, so writes
+    never interleave across processes; a new file is started each day, and whenever the
+    current one reaches LOG_MAX_BYTES.
+    """
+
+    def __init__(self, folders):
+        self.folders = folders  # Stream name -> folder
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.dropped = 0
+        self.files = {}  # Stream name -> (date, sequence number, open file)
+        self.pid = None
+        self.thread = None
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, stream, record):
+        """Queue a record for writing. Never blocks."""
+        if self.pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait((stream, record))
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        """Start the writer thread. Also run after a fork, since threads don't survive one."""
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.files = {}
+            self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            self.thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            batch = []
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= LOG_BATCH_SIZE:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            stopping = item is None
+            try:
+                self.write_batch(batch)
+            except Exception:
+                pass  # Nowhere left to report it
+
+    def write_batch(self, batch):
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            batch.append(("error", {"ts": time.time(), "level": "error", "event": "log_records_dropped", "count": dropped}))
+
+        lines = {}
+        for stream, record in batch:
+            lines.setdefault(stream, []).append(json.dumps(record, default=str))
+        for stream, stream_lines in lines.items():
+            log_file = self.open_file(stream)
+            log_file.write("\n".join(stream_lines) + "\n")
+            log_file.flush()
+
+    def open_file(self, stream):
+        """Return the file to write a stream to, rolling over to a new one when it's due."""
+        date = time.strftime("%Y-%m-%d")
+        current_date, sequence, log_file = self.files.get(stream, (None, 0, None))
+        if log_file is not None and current_date == date and log_file.tell() < LOG_MAX_BYTES:
+            return log_file
+
+        if log_file is not None:
+            log_file.close()
+        sequence = sequence + 1 if current_date == date else 0
+        path = os.path.join(self.folders[stream], f"{date}.{self.pid}.{sequence}.jsonl")
+        log_file = open(path, "a", encoding="utf-8")
+        self.files[stream] = (date, sequence, log_file)
+        return log_file
+
+    def close(self):
+        """Write out whatever is queued, and stop the writer thread."""
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=1)
+        except queue.Full:
+            return
+        self.thread.join(timeout=5)
+        for _, _, log_file in self.files.values():
+            log_file.close()
+
+
+log_writer = LogWriter({"access": LOG_FOLDER, "error": ERROR_LOG_FOLDER})
+
+
+def log_event(stream, level, event, **fields):
+    """Log a structured record, tagged with the current request's id (if there is one)."""
+    record = {"ts": time.time(), "level": level, "event": event, "pid": os.getpid()}
+    if has_request_context() and "request_id" in g:
+        record["request_id"] = g.request_id
+    record.update(fields)
+    log_writer.write(stream, record)
 
 
 def log_conversion(filename, file_size):
     """Log the file conversion details."""
-    file_size_mb = file_size / (1024 * 1024)  # Convert size to MB
-    log_filename = time.strftime("%Y-%m-%d") + ".txt"
-    log_path = os.path.join(LOG_FOLDER, log_filename)
-    
-    with open(log_path, "a", encoding="utf-8") as log_file:
-        log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - Filename: {filename}, Size: {file_size_mb:.2f} MB\n")
+    log_event("access", "info", "conversion", filename=filename, size_bytes=file_size)
 
 
 def log_error(message):
     """Log an error message."""
-    error_log_path = os.path.join(ERROR_LOG_FOLDER, f"{time.strftime('%Y-%m-%d')}.txt")
-    with open(error_log_path, "a", encoding="utf-8") as error_log_file:
-        error_log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
+    log_event("error", "error", "error", message=message)
 
 
 # def validate_api_key(api_key):
@@ -72,23 +483,507 @@ def log_error(message):
 #         return None
 
 
+def archive_output(output_path, markdown_content):
+    """Write a conversion result to OUTPUT_FOLDER. Runs in the background."""
+    try:
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            output_file.write(markdown_content)
+    except Exception as e:
+        log_error(f"Failed to archive output {output_path}: {str(e)}")
+
+
+def get_cache_path(content_hash):
+    """Path of the cached result for a content hash, or None if the hash is malformed.
+
+    Results are stored by conversion key, so that changing the LLM or upgrading markitdown
+    doesn't serve results converted the old way (which are left for prune_cache to remove)."""
+    if not content_hash or not CONTENT_HASH_PATTERN.match(content_hash):
+        return None
+    return os.path.join(CACHE_FOLDER, f"{conversion_key(content_hash)}.md")
+
+
+def read_cached_result(content_hash):
+    """Return the cached Markdown for a content hash, or None if there is none."""
+    cache_path = get_cache_path(content_hash) if RESULT_CACHE else None
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            return cache_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_cached_result(content_hash, markdown_content):
+    """Store a conversion result under its content hash."""
+    cache_path = get_cache_path(content_hash)
+    try:
+        # Write to a temporary file first, so other workers never see a partial result
+        handle, temp_path = tempfile.mkstemp(dir=CACHE_FOLDER)
+        with os.fdopen(handle, "w", encoding="utf-8") as cache_file:
+            cache_file.write(markdown_content)
+        os.replace(temp_path, cache_path)
+        prune_cache()
+    except Exception as e:
+        log_error(f"Failed to cache result {content_hash}: {str(e)}")
+
+
+def prune_cache():
+    """Delete the least recently written cache entries once the cache exceeds CACHE_MAX_BYTES."""
+    global last_cache_prune
+    if time.time() - last_cache_prune < CACHE_PRUNE_INTERVAL:
+        return
+    last_cache_prune = time.time()
+
+    entries = []
+    for entry in os.scandir(CACHE_FOLDER):
+        if entry.is_file() and entry.name.endswith(".md"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= CACHE_MAX_BYTES:
+            break
+        cleanup_files(path)
+        total_size -= size
+
+
+def conversion_options():
+    """The settings, besides the content itself, that determine a conversion's result."""
+    return {"llm_model": LLM_API_MODEL if LLM_API_KEY else None, "markitdown": markitdown_version}
+
+
+def conversion_key(content_hash):
+    """Key identifying a conversion: the content hash plus the options it is converted with."""
+    options = json.dumps(conversion_options(), sort_keys=True)
+    return hashlib.blake2b(f"{content_hash}:{options}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+@contextmanager
+def conversion_lock(key):
+    """Hold an exclusive lock on a conversion key across worker processes.
+
+    The lock only helps when results are shared through the cache, and needs fcntl; otherwise
+    this does nothing. If the lock can't be taken within COALESCE_TIMEOUT, carry on without it.
+    """
+    if fcntl is None or not RESULT_CACHE:
+        yield
+        return
+
+    lock_path = os.path.join(LOCK_FOLDER, f"{key}.lock")
+    with open(lock_path, "a") as lock_file:
+        locked = False
+        deadline = time.time() + COALESCE_TIMEOUT
+        while not locked and time.time() < deadline:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+            except BlockingIOError:
+                time.sleep(COALESCE_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if locked:
+                # Remove the lock file while still holding it (unless it was already replaced).
+                # Anyone still waiting on it re-checks the cache once they get it.
+                try:
+                    if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def convert_once(content_hash, convert):
+    """Run convert() for some content, unless an identical conversion is already running.
+
+    Concurrent duplicates in this worker wait on the first request's future; duplicates in
+    other workers wait on its lock, then find its result in the cache. Returns the Markdown
+    content and how it was obtained ("MISS", "HIT" or "COALESCED").
+    """
+    key = conversion_key(content_hash)
+    with in_flight_lock:
+        future = in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = in_flight[key] = Future()
+    if not leader:
+        return future.result(), "COALESCED"
+
+    try:
+        with conversion_lock(key):
+            markdown_content = read_cached_result(content_hash)
+            cache_status = "HIT"
+            if markdown_content is None:
+                markdown_content = convert()
+                cache_status = "MISS"
+                # Cache before releasing the lock, so waiting workers find the result
+                if RESULT_CACHE:
+                    write_cached_result(content_hash, markdown_content)
+        future.set_result(markdown_content)
+        return markdown_content, cache_status
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with in_flight_lock:
+            del in_flight[key]
+
+
+def conversion_response(markdown_content, content_hash, cache_status):
+    """Build the (compressed, where possible) success response for a conversion."""
+    metrics.inc("markitdown_cache_results_total", result=cache_status)
+    response = jsonify({"message": "Conversion successful", "content": markdown_content})
+    response.headers[CONTENT_HASH_HEADER] = content_hash
+    response.headers["X-Cache"] = cache_status
+    return compress_response(response)
+
+
+def compress_response(response):
+    """Compress a response body with the best encoding the client accepts (zstd, br or gzip)."""
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    available = ["gzip"]
+    if brotli is not None:
+        available.insert(0, "br")
+    if zstandard is not None:
+        available.insert(0, "zstd")
+
+    encoding = request.accept_encodings.best_match(available)
+    if encoding == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    elif encoding == "br":
+        body = brotli.compress(body, quality=5)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=6)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def collect_metrics(registry):
+    """Refresh the gauges that describe this worker's current state. Runs on each scrape."""
+    with scheduler.lock:
+        for name, lane in scheduler.lanes.items():
+            registry.set("markitdown_scheduler_queued", len(lane["queue"]), lane=name)
+            registry.set("markitdown_scheduler_running", lane["running"], lane=name)
+    with admission.lock:
+        registry.set("markitdown_admitted_conversions", len(admission.admitted))
+        registry.set("markitdown_admitted_memory_bytes", sum(memory for _, memory, _ in admission.admitted.values()))
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            registry.set("process_resident_memory_bytes", int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError):
+        pass
+
+
+metrics.add_collector(collect_metrics)
+
+
+@app.before_request
+def start_request():
+    """Time the request, and give it an id (the caller's, if they sent one) for its log records."""
+    g.request_started = time.perf_counter()
+    g.request_id = request.headers.get(REQUEST_ID_HEADER, "")[:128] or uuid.uuid4().hex
+
+
+@app.after_request
+def finish_request(response):
+    """Record the request's metrics and access log record, and return its id to the caller."""
+    endpoint = request.endpoint or "unknown"
+    duration = time.perf_counter() - g.request_started if "request_started" in g else None
+    metrics.inc("markitdown_http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code)
+    if duration is not None:
+        metrics.observe("markitdown_http_request_duration_seconds", duration, endpoint=endpoint)
+
+    log_event(
+        "access",
+        "info",
+        "request",
+        method=request.method,
+        path=request.path,
+        status=response.status_code,
+        duration_seconds=duration,
+        bytes_in=request.content_length,
+        bytes_out=response.calculate_content_length(),
+        remote_addr=request.remote_addr,
+    )
+    if "request_id" in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Expose this worker's metrics in the Prometheus text format."""
+    return app.response_class(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 def cleanup_files(*file_paths):
     """Remove files after processing."""
     for file_path in file_paths:
-        if os.path.exists(file_path):
+        if file_path and os.path.exists(file_path):
             os.remove(file_path)
 
 
+@app.route("/convert/<content_hash>", methods=["GET", "HEAD"])
+def get_converted_file(content_hash):
+    """Return the cached Markdown for a previously converted file, identified by its content hash."""
+    cache_path = get_cache_path(content_hash)
+    if cache_path is None:
+        return jsonify({"error": "Malformed content hash"}), 400
+
+    # HEAD only answers "is it there?", so don't read the result
+    if request.method == "HEAD":
+        found = RESULT_CACHE and os.path.exists(cache_path)
+        response = app.response_class(status=200 if found else 404)
+        response.headers[CONTENT_HASH_HEADER] = content_hash
+        return response
+
+    markdown_content = read_cached_result(content_hash)
+    if markdown_content is None:
+        return jsonify({"error": "No conversion found for this content hash"}), 404
+
+    return conversion_response(markdown_content, content_hash, "HIT"), 200
+
+
 @app.route("/convert", methods=["POST"])
 def convert_file():
     """Handle file conversion to Markdown."""
-    if "file" not in request.files:
+    debug = ENABLE_DEBUG_HEADERS and request.headers.get(DEBUG_PROFILE_HEADER, "").lower() in ("1", "true")
+
+    # If the client already knows the file's hash, and we have its result, skip the upload
+    claimed_hash = request.headers.get(CONTENT_HASH_HEADER, "").strip().lower()
+    markdown_content = read_cached_result(claimed_hash) if not debug else None
+    if markdown_content is not None:
+        return conversion_response(markdown_content, claimed_hash, "HIT"), 200
+
+    # Don't bother reading the upload if it can't be admitted
+    try:
+        admission.check()
+    except ServerBusy as e:
+        return busy_response(e)
+
+    # Reading request.files receives (and parses) the whole upload, writing its file to disk and
+    # hashing it as it goes
+    with trace("upload.receive", bytes=request.content_length):
+        has_file = "file" in request.files
+    if not has_file:
         return jsonify({"error": "No file part in the request"}), 400
 
     file = request.files["file"]
     if file.filename == "":
         return jsonify({"error": "No selected file"}), 400
 
+    file_path = None
+    try:
+        # Keep the uploaded file, and convert it
+        with trace("upload.save") as span:
+            file_path, content_hash, file_size = save_upload(file)
+            if span is not None:
+                span.set_attribute("bytes", file_size)
+        return convert_saved_file(file_path, content_hash, file.filename, file_size, debug=debug)
+    except ServerBusy as e:
+        cleanup_files(file_path)
+        return busy_response(e)
+    except BaseException as e:
+        cleanup_files(file_path)
+        log_error(f"Failed to convert file: {str(e)}")
+        return jsonify({"error": f"Failed to convert file: {str(e)}"}), 500
+
+
+def column_number(column):
+    """Convert a spreadsheet column name (A, B, ..., AA, ...) to its 1-based number."""
+    number = 0
+    for letter in column:
+        number = number * 26 + ord(letter) - ord("A") + 1
+    return number
+
+
+def estimate_job(file_path):
+    """Cheaply estimate what converting a file will take: (cost in rough seconds, peak memory in bytes).
+
+    Only metadata is read: the page count of a PDF, the dimensions of each sheet in a
+    workbook, the slide count of a presentation, and the XML size of a Word document.
+    Anything else (or anything unreadable) is estimated from its file size.
+    """
+    file_size = os.path.getsize(file_path)
+    ext = file_path.rsplit(".", 1)[-1].lower()
+    try:
+        if ext == "pdf":
+            with open(file_path, "rb") as pdf_file:
+                document = PDFDocument(PDFParser(pdf_file))
+                pages = resolve1(document.catalog["Pages"])["Count"]
+            return pages * COST_PER_PDF_PAGE, file_size + pages * MEMORY_PER_PDF_PAGE
+        if ext in ("xlsx", "pptx", "docx"):
+            with zipfile.ZipFile(file_path) as archive:
+                names = archive.namelist()
+                if ext == "xlsx":
+                    cells = 0
+                    for name in names:
+                        if name.startswith("xl/worksheets/") and name.endswith(".xml"):
+                            # The <dimension> element sits near the start of each sheet
+                            with archive.open(name) as sheet:
+                                match = SHEET_DIMENSION_PATTERN.search(sheet.read(4096))
+                            if match and match.group(2):
+                                cells += int(match.group(3)) * column_number(match.group(2).decode())
+                    return cells * COST_PER_SHEET_CELL, file_size + cells * MEMORY_PER_SHEET_CELL
+                if ext == "pptx":
+                    slides = [n for n in names if n.startswith("ppt/slides/slide") and n.endswith(".xml")]
+                    return len(slides) * COST_PER_SLIDE, file_size + len(slides) * MEMORY_PER_SLIDE
+                xml_size = archive.getinfo("word/document.xml").file_size
+                return xml_size / (1024 * 1024) * COST_PER_XML_MB, file_size + xml_size * MEMORY_PER_XML_BYTE
+    except Exception:
+        pass
+    return file_size / (1024 * 1024) * COST_PER_MB, file_size * MEMORY_PER_BYTE.get(ext, DEFAULT_MEMORY_PER_BYTE)
+
+
+class ServerBusy(Exception):
+    """Raised when a request is turned away by admission control. Becomes a 429 response."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Server busy, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Tracks the conversions admitted in this worker (queued or running), and their estimated
+    cost and memory, and turns away new ones once MAX_IN_FLIGHT_CONVERSIONS or the memory
+    budget would be exceeded. With nothing in flight, any single job is admitted, however big.
+    """
+
+    def __init__(self, max_in_flight, memory_budget):
+        self.max_in_flight = max_in_flight
+        self.memory_budget = memory_budget
+        self.admitted = {}  # Ticket -> (estimated cost, estimated memory, time admitted)
+        self.lock = threading.Lock()
+
+    def check(self):
+        """Turn a request away before its upload is read, if nothing more can be admitted anyway."""
+        with self.lock:
+            reserved = sum(memory for _, memory, _ in self.admitted.values())
+            if len(self.admitted) >= self.max_in_flight or reserved >= self.memory_budget:
+                raise ServerBusy(self.retry_after())
+
+    def admit(self, cost, memory):
+        """Admit a job, returning a ticket to release() once it's done. Raises ServerBusy if it doesn't fit."""
+        with self.lock:
+            reserved = sum(memory for _, memory, _ in self.admitted.values())
+            if len(self.admitted) >= self.max_in_flight or (self.admitted and reserved + memory > self.memory_budget):
+                raise ServerBusy(self.retry_after())
+            ticket = object()
+            self.admitted[ticket] = (cost, memory, time.time())
+            return ticket
+
+    def release(self, ticket):
+        with self.lock:
+            del self.admitted[ticket]
+
+    def retry_after(self):
+        """Seconds until the admitted work should have drained, from its estimated remaining cost.
+        Must be called with the lock held."""
+        now = time.time()
+        remaining = sum(max(cost - (now - admitted_at), 0) for cost, _, admitted_at in self.admitted.values())
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(remaining / MAX_CONCURRENT_CONVERSIONS)))
+
+
+admission = AdmissionController(MAX_IN_FLIGHT_CONVERSIONS, MEMORY_BUDGET_MB * 1024 * 1024)
+
+
+class ConversionScheduler:
+    """Runs conversions through a "small" and a "large" lane, with per-lane concurrency limits.
+
+    Lanes share MAX_CONCURRENT_CONVERSIONS slots by weighted fair queuing (start-time fair
+    queuing, on estimated cost): as a slot frees up, it goes to the waiting job with the
+    earliest virtual start time, so each lane gets throughput in proportion to its weight and
+    small jobs never wait behind a queue of large ones.
+    """
+
+    def __init__(self, max_concurrent, lanes):
+        self.max_concurrent = max_concurrent
+        self.lanes = {
+            name: {"weight": weight, "limit": limit, "running": 0, "queue": deque(), "last_finish": 0.0}
+            for name, (weight, limit) in lanes.items()
+        }
+        self.running = 0
+        self.virtual_time = 0.0
+        self.lock = threading.Lock()
+
+    def lane_for(self, cost):
+        """Pick the lane for a job of the given estimated cost."""
+        return "large" if cost >= LARGE_JOB_COST else "small"
+
+    def run(self, cost, func):
+        """Wait for a slot in the job's lane, then run func() and return its result."""
+        lane = self.lanes[self.lane_for(cost)]
+        ready = threading.Event()
+        with self.lock:
+            start = max(self.virtual_time, lane["last_finish"])
+            lane["last_finish"] = start + cost / lane["weight"]
+            lane["queue"].append((start, ready))
+            self._dispatch()
+        with trace("scheduler.wait", lane=self.lane_for(cost), cost=cost):
+            ready.wait()
+        try:
+            return func()
+        finally:
+            with self.lock:
+                lane["running"] -= 1
+                self.running -= 1
+                self._dispatch()
+
+    def _dispatch(self):
+        """Start waiting jobs while there are free slots. Must be called with the lock held."""
+        while self.running < self.max_concurrent:
+            eligible = [lane for lane in self.lanes.values() if lane["queue"] and lane["running"] < lane["limit"]]
+            if not eligible:
+                return
+            lane = min(eligible, key=lambda lane: lane["queue"][0][0])
+            start, ready = lane["queue"].popleft()
+            self.virtual_time = max(self.virtual_time, start)
+            lane["running"] += 1
+            self.running += 1
+            ready.set()
+
+
+scheduler = ConversionScheduler(
+    MAX_CONCURRENT_CONVERSIONS,
+    {
+        "small": (SMALL_LANE_WEIGHT, MAX_CONCURRENT_CONVERSIONS),
+        "large": (LARGE_LANE_WEIGHT, LARGE_LANE_CONCURRENCY),
+    },
+)
+
+
+def run_conversion(file_path, **options):
+    """Convert a file to Markdown with MarkItDown (if admitted, and once the scheduler allows),
+    and return the result."""
+    cost, memory = estimate_job(file_path)
+    if CONVERSION_MAX_MEMORY_MB is not None:
+        # A sandboxed conversion can't use more than its cap, whatever the estimate
+        memory = min(memory, CONVERSION_MAX_MEMORY_MB * 1024 * 1024)
+    ticket = admission.admit(cost, memory)
+    try:
+        return scheduler.run(cost, lambda: convert_with_markitdown(file_path, **options))
+    finally:
+        admission.release(ticket)
+
+
+def busy_response(e):
+    """The 429 response for a request turned away by admission control."""
+    response = jsonify({"error": "Server busy, please retry later"})
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response, 429
+
+
+def convert_with_markitdown(file_path, **options):
+    """Convert a file to Markdown with MarkItDown, passing on any conversion options, and return the result."""
     # api_key = request.form.get('APIKey', None)
     api_key = LLM_API_KEY
     client = None
@@ -98,41 +993,225 @@ def convert_file():
             base_url=LLM_BASE_URL
         )
 
-    markitdown = MarkItDown(llm_client=client, llm_model=LLM_API_MODEL) if client else MarkItDown()
+    limits = {
+        "timeout": CONVERSION_TIMEOUT,
+        "max_memory": CONVERSION_MAX_MEMORY_MB * 1024 * 1024 if CONVERSION_MAX_MEMORY_MB is not None else None,
+    }
+    markitdown = MarkItDown(llm_client=client, llm_model=LLM_API_MODEL, **limits) if client else MarkItDown(**limits)
+
+    result = markitdown.convert(file_path, **options)
+    if not result or not hasattr(result, "text_content"):
+        raise ValueError("Conversion failed: No content extracted")
+    return result
+
+
+def convert_saved_file(file_path, content_hash, filename, file_size, debug=False):
+    """Convert an upload saved in UPLOAD_FOLDER, remove it, and build the response.
 
+    With debug set, the file is always converted (no cache, no coalescing), and the
+    response includes the conversion's per-stage timings and a cProfile report.
+    """
     try:
-        # Generate logs and unique filename
-        log_conversion(file.filename, os.fstat(file.stream.fileno()).st_size)
-        unique_filename = generate_unique_filename(file.stream, file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
+        log_conversion(filename, file_size)
+        unique_filename = os.path.basename(file_path)
         output_path = os.path.join(OUTPUT_FOLDER, unique_filename.rsplit(".", 1)[0] + ".md")
 
-        # Save the uploaded file
-        file.save(file_path)
+        if debug:
+            result = run_conversion(file_path, collect_timings=True, profiler="cprofile")
+            cleanup_files(file_path)
+            response = jsonify({
+                "message": "Conversion successful",
+                "content": result.text_content,
+                "timings": result.timings,
+                "profile": result.profile,
+            })
+            response.headers[CONTENT_HASH_HEADER] = content_hash
+            return compress_response(response), 200
 
-        # Convert the file to Markdown
-        result = markitdown.convert(file_path)
-        if not result or not hasattr(result, "text_content"):
-            raise ValueError("Conversion failed: No content extracted")
+        # The same content may have been converted before
+        markdown_content = read_cached_result(content_hash)
+        if markdown_content is not None:
+            cleanup_files(file_path)
+            return conversion_response(markdown_content, content_hash, "HIT"), 200
 
-        # Write the Markdown content to a file
-        with open(output_path, "w", encoding="utf-8") as output_file:
-            output_file.write(result.text_content)
+        # Convert the file to Markdown, sharing the work with any identical conversions
+        markdown_content, cache_status = convert_once(content_hash, lambda: run_conversion(file_path).text_content)
 
-        # Read and return Markdown content
-        with open(output_path, "r", encoding="utf-8") as output_file:
-            markdown_content = output_file.read()
+        # Optionally archive the Markdown content, without holding up the response
+        if ARCHIVE_OUTPUTS and cache_status == "MISS":
+            background_executor.submit(archive_output, output_path, markdown_content)
 
         # Clean up files after processing
-        cleanup_files(file_path, output_path)
+        cleanup_files(file_path)
 
-        return jsonify({"message": "Conversion successful", "content": markdown_content}), 200
+        return conversion_response(markdown_content, content_hash, cache_status), 200
 
+    except ServerBusy:
+        # Leave the upload to the caller, which may want to keep it for a retry
+        raise
+    except ConversionTimeoutException as e:
+        cleanup_files(file_path)
+        log_error(f"Conversion timed out: {filename}: {str(e)}")
+        return jsonify({"error": f"Conversion timed out: {str(e)}"}), 422
+    except ConversionMemoryException as e:
+        cleanup_files(file_path)
+        log_error(f"Conversion ran out of memory: {filename}: {str(e)}")
+        return jsonify({"error": f"Conversion ran out of memory: {str(e)}"}), 422
     except BaseException as e:
-        cleanup_files(file_path, output_path)
+        cleanup_files(file_path)
         log_error(f"Failed to convert file: {str(e)}")
         return jsonify({"error": f"Failed to convert file: {str(e)}"}), 500
 
 
+@app.route("/uploads", methods=["POST"])
+def create_upload():
+    """Start a resumable upload. Expects JSON with the file's "filename" and total "size" in bytes."""
+    params = request.get_json(silent=True) or {}
+    filename = secure_filename(str(params.get("filename", "")))
+    size = params.get("size")
+    if not filename:
+        return jsonify({"error": "No filename given"}), 400
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        return jsonify({"error": "Size must be a positive integer"}), 400
+    if size > MAX_SESSION_SIZE:
+        return jsonify({"error": f"File too large (limit is {MAX_SESSION_SIZE} bytes)"}), 413
+
+    prune_sessions()
+
+    upload_id = secrets.token_hex(16)
+    session_dir = os.path.join(UPLOAD_SESSION_FOLDER, upload_id)
+    os.makedirs(os.path.join(session_dir, "ranges"))
+    with open(os.path.join(session_dir, "session.json"), "w", encoding="utf-8") as meta_file:
+        json.dump({"upload_id": upload_id, "filename": filename, "size": size, "created": time.time()}, meta_file)
+
+    # Ranges are written straight into place, so the file starts out (sparsely) at full size
+    try:
+        with open(os.path.join(session_dir, "data"), "wb") as data_file:
+            data_file.truncate(size)
+    except OSError as e:
+        shutil.rmtree(session_dir, ignore_errors=True)
+        if e.errno == errno.EFBIG:
+            return jsonify({"error": "File too large for the server's storage"}), 413
+        if e.errno in (errno.ENOSPC, errno.EDQUOT):
+            return jsonify({"error": "Not enough storage for this upload"}), 507
+        raise
+
+    response = jsonify({"upload_id": upload_id, "chunk_size": SESSION_CHUNK_SIZE})
+    response.headers["Location"] = f"/uploads/{upload_id}"
+    return response, 201
+
+
+@app.route("/uploads/<upload_id>", methods=["GET"])
+def get_upload(upload_id):
+    """Report which byte ranges of an upload have been received, so an interrupted client can resume."""
+    session_dir = get_session_dir(upload_id)
+    if session_dir is None:
+        return jsonify({"error": "Unknown upload"}), 404
+    return jsonify(read_session(session_dir)), 200
+
+
+@app.route("/uploads/<upload_id>", methods=["PUT"])
+def put_upload_range(upload_id):
+    """Store one range of an upload. The body is the raw bytes; the header "Content-Range: bytes
+    <first>-<last>/<size>" says where they go. Ranges may arrive in any order, and in parallel."""
+    session_dir = get_session_dir(upload_id)
+    if session_dir is None:
+        return jsonify({"error": "Unknown upload"}), 404
+    try:
+        with open(os.path.join(session_dir, "session.json"), "r", encoding="utf-8") as meta_file:
+            size = json.load(meta_file)["size"]
+    except FileNotFoundError:
+        # Finalized (and removed) since it was looked up
+        return jsonify({"error": "Unknown upload"}), 404
+
+    match = CONTENT_RANGE_PATTERN.match(request.headers.get("Content-Range", ""))
+    if match is None:
+        return jsonify({"error": "Missing or malformed Content-Range header"}), 400
+    start, end = int(match.group(1)), int(match.group(2)) + 1
+    if end <= start or end > size or match.group(3) not in ("*", str(size)):
+        return jsonify({"error": f"Range does not fit in an upload of {size} bytes"}), 416
+
+    # Write the range in place; it only counts as received once all of it is on disk
+    received = 0
+    try:
+        data_file = open(os.path.join(session_dir, "data"), "r+b")
+    except FileNotFoundError:
+        # Finalizing has claimed the data already; a late or retried range can't be stored
+        return jsonify({"error": "Upload is already being finalized"}), 409
+    with data_file:
+        data_file.seek(start)
+        while received < end - start:
+            chunk = request.stream.read(min(UPLOAD_CHUNK_SIZE, end - start - received))
+            if not chunk:
+                break
+            data_file.write(chunk)
+            received += len(chunk)
+    if received != end - start:
+        return jsonify({"error": f"Expected {end - start} bytes, received {received}"}), 400
+
+    try:
+        open(os.path.join(session_dir, "ranges", f"{start}-{end}"), "wb").close()
+    except FileNotFoundError:
+        return jsonify({"error": "Upload is already being finalized"}), 409
+    return jsonify(read_session(session_dir)), 200
+
+
+@app.route("/uploads/<upload_id>/complete", methods=["POST"])
+def complete_upload(upload_id):
+    """Finish an upload once every byte has been received, and convert the file."""
+    session_dir = get_session_dir(upload_id)
+    if session_dir is None:
+        return jsonify({"error": "Unknown upload"}), 404
+
+    session = read_session(session_dir)
+    if not session["complete"]:
+        return jsonify({"error": "Upload is incomplete", "received": session["received"]}), 409
+
+    # Leave the session in place, so finalizing can be retried
+    try:
+        admission.check()
+    except ServerBusy as e:
+        return busy_response(e)
+
+    # Claim the assembled file by moving it out of the session; only one finalize can succeed
+    data_path = os.path.join(session_dir, "data")
+    handle, file_path = tempfile.mkstemp(dir=UPLOAD_FOLDER)
+    os.close(handle)
+    try:
+        os.replace(data_path, file_path)
+    except FileNotFoundError:
+        cleanup_files(file_path)
+        return jsonify({"error": "Upload is already being finalized"}), 409
+
+    try:
+        # Ranges arrive out of order, so the content is hashed here rather than on the way in
+        with trace("upload.hash", bytes=session["size"]):
+            content_hash = hash_file(file_path)
+        unique_path = os.path.join(UPLOAD_FOLDER, generate_unique_filename(content_hash, session["filename"]))
+        os.replace(file_path, unique_path)
+        file_path = unique_path
+        response = convert_saved_file(file_path, content_hash, session["filename"], session["size"])
+    except ServerBusy as e:
+        # Hand the file back to the session, so finalizing can be retried without re-uploading
+        os.replace(file_path, data_path)
+        return busy_response(e)
+    except BaseException as e:
+        cleanup_files(file_path)
+        response = jsonify({"error": f"Failed to convert file: {str(e)}"}), 500
+        log_error(f"Failed to convert file: {str(e)}")
+    shutil.rmtree(session_dir, ignore_errors=True)
+    return response
+
+
+@app.route("/uploads/<upload_id>", methods=["DELETE"])
+def delete_upload(upload_id):
+    """Abandon an upload and discard what was received."""
+    session_dir = get_session_dir(upload_id)
+    if session_dir is None:
+        return jsonify({"error": "Unknown upload"}), 404
+    shutil.rmtree(session_dir, ignore_errors=True)
+    return jsonify({"message": "Upload deleted"}), 200
+
+
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
@@ -0,0 +1 @@
+"""Benchmarks for markitdown and the web service. Nothing here needs network access."""
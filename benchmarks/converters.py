@@ -0,0 +1,309 @@
+"""Benchmarks every registered converter through MarkItDown.convert, on a synthetic corpus.
+
+    python -m benchmarks.converters --scale 2 --repeat 5 -o results.json
+    python -m benchmarks.converters --only html docx --html-parser lxml --html-parser html.parser
+
+Each document is converted `--warmup` times untimed, then `--repeat` times timed, in a child
+process of its own so that its peak RSS isn't masked by earlier documents. Throughput is reported
+from the median time, in pages per second (what counts as a page depends on the format, and is
+reported alongside) and in input MB per second. Results are written as JSON; a summary table goes
+to stderr.
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from markitdown import MarkItDown
+from markitdown.__about__ import __version__
+from markitdown._markitdown import DEFAULT_HTML_PARSER
+
+from .corpus import GENERATORS, Case, generate_corpus
+
+try:
+    import resource
+
+    IS_RUSAGE_CAPABLE = True
+except ModuleNotFoundError:
+    IS_RUSAGE_CAPABLE = False
+
+IS_FORK_CAPABLE = "fork" in multiprocessing.get_all_start_methods()
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process, in bytes, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_rss() -> Optional[int]:
+    """Peak resident set size of this process, in bytes."""
+    if not IS_RUSAGE_CAPABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes everywhere but macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(case: Case, html_parser: str, repeat: int, warmup: int) -> Dict[str, Any]:
+    """Converts `case` repeatedly, returning its timings, throughput and memory use."""
+    markitdown = MarkItDown(html_parser=html_parser)
+    baseline_rss = _current_rss()
+    samples = []
+    for i in range(warmup + repeat):
+        started = time.perf_counter()
+        result = markitdown.convert(case.path, collect_timings=True)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed)
+    peak_rss = _peak_rss()
+
+    converter = next(
+        (
+            a["converter"]
+            for a in result.timings["attempts"]
+            if a["outcome"] == "success"
+        ),
+        None,
+    )
+    median = statistics.median(samples)
+    return {
+        "converter": converter,
+        "output_chars": len(result.text_content),
+        "samples_seconds": samples,
+        "min_seconds": min(samples),
+        "median_seconds": median,
+        "mean_seconds": statistics.fmean(samples),
+        "stdev_seconds": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "pages_per_second": case.pages / median if median > 0 else None,
+        "mb_per_second": case.size / (1024 * 1024) / median if median > 0 else None,
+        "peak_rss_mb": peak_rss / (1024 * 1024) if peak_rss is not None else None,
+        "rss_growth_mb": (
+            (peak_rss - baseline_rss) / (1024 * 1024)
+            if peak_rss is not None and baseline_rss is not None
+            else None
+        ),
+    }
+
+
+def _isolated_main(connection, func, args):
+    try:
+        connection.send(("ok", func(*args)))
+    except BaseException:
+        connection.send(("error", traceback.format_exc().strip().splitlines()[-1]))
+    finally:
+        connection.close()
+
+
+def run_isolated(func: Callable, *args) -> Dict[str, Any]:
+    """Runs func(*args) in a forked child, so that it gets a peak RSS of its own."""
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated_main, args=(sender, func, args))
+    process.start()
+    sender.close()
+    try:
+        status, payload = receiver.recv()
+    except EOFError:
+        status, payload = "error", "benchmark process exited unexpectedly"
+    process.join()
+    if status != "ok":
+        raise RuntimeError(payload)
+    return payload
+
+
+def run(
+    cases: List[Case],
+    html_parsers: List[str],
+    repeat: int = 5,
+    warmup: int = 1,
+    isolate: bool = IS_FORK_CAPABLE,
+) -> List[Dict[str, Any]]:
+    """Benchmarks each case with each HTML parser, returning one result per pair."""
+    results = []
+    for html_parser in html_parsers:
+        for case in cases:
+            result = {
+                "case": case.name,
+                "extension": case.extension,
+                "html_parser": html_parser,
+                "input_bytes": case.size,
+                "pages": case.pages,
+                "page_unit": case.page_unit,
+            }
+            try:
+                if isolate:
+                    result.update(
+                        run_isolated(measure, case, html_parser, repeat, warmup)
+                    )
+                else:
+                    result.update(measure(case, html_parser, repeat, warmup))
+                result["error"] = None
+            except Exception as e:
+                result["error"] = str(e)
+            results.append(result)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Describes where the benchmark ran."""
+    return {
+        "markitdown": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _format(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_summary(results: List[Dict[str, Any]], stream=sys.stderr) -> None:
+    header = f"{'case':<10} {'parser':<12} {'converter':<20} {'median s':>9} {'pages/s':>10} {'unit':<10} {'MB/s':>8} {'peak MB':>8} {'+RSS MB':>8}"
+    print(header, file=stream)
+    print("-" * len(header), file=stream)
+    for r in results:
+        if r["error"] is not None:
+            print(
+                f"{r['case']:<10} {str(r['html_parser']):<12} error: {r['error']}",
+                file=stream,
+            )
+            continue
+        print(
+            f"{r['case']:<10} {str(r['html_parser']):<12} {str(r['converter']):<20} "
+            f"{r['median_seconds']:>9.4f} {_format(r['pages_per_second'], '>10.1f')} {r['page_unit']:<10} "
+            f"{_format(r['mb_per_second'], '>8.2f')} {_format(r['peak_rss_mb'], '>8.1f')} "
+            f"{_format(r['rss_growth_mb'], '>8.1f')}",
+            file=stream,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.converters",
+        description="Benchmark markitdown's converters on a generated corpus.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplies the size of every document (default: 1)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="timed conversions per document (default: 5)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="untimed conversions per document first (default: 1)",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted(GENERATORS),
+        help="benchmark only these documents",
+    )
+    parser.add_argument(
+        "--html-parser",
+        action="append",
+        dest="html_parsers",
+        help="BeautifulSoup parser to use. Repeat to compare parsers (default: markitdown's default)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for the generated corpus (default: 0)"
+    )
+    parser.add_argument(
+        "--corpus-dir",
+        help="write the corpus here, and keep it (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="convert in this process, rather than a child per document",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the JSON results here (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+    if not args.no_isolate and not IS_FORK_CAPABLE:
+        print(
+            "Forking is not supported here; converting in-process (--no-isolate).",
+            file=sys.stderr,
+        )
+        args.no_isolate = True
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="markitdown_bench_")
+    try:
+        started = time.perf_counter()
+        cases = generate_corpus(
+            corpus_dir, scale=args.scale, only=args.only, seed=args.seed
+        )
+        print(
+            f"Generated {len(cases)} documents in {time.perf_counter() - started:.1f}s",
+            file=sys.stderr,
+        )
+
+        results = run(
+            cases,
+            args.html_parsers or [DEFAULT_HTML_PARSER],
+            repeat=args.repeat,
+            warmup=args.warmup,
+            isolate=not args.no_isolate,
+        )
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    print_summary(results)
+    report = {
+        "benchmark": "converters",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "isolated": not args.no_isolate,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    # Non-zero when any document failed to convert
+    return 1 if any(r["error"] is not None for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,762 @@
+"""Generates a synthetic, representative corpus of documents for the benchmarks.
+
+Everything is built locally and deterministically (from a seed), using only packages markitdown
+already depends on. Formats without a writer among those (PDF, DOCX, XLS, MSG) are written by hand,
+with just enough structure for the converters to read them the way they read real files.
+"""
+
+import io
+import json
+import os
+import random
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import openpyxl
+import pptx
+from pptx.util import Inches, Pt
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut "
+    "labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris "
+    "nisi aliquip ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse "
+    "cillum fugiat nulla pariatur excepteur sint occaecat cupidatat non proident sunt culpa qui "
+    "officia deserunt mollit anim id est laborum"
+).split()
+
+
+@dataclass
+class Case:
+    """A generated document, and how much of it there is."""
+
+    name: str
+    path: str
+    extension: str
+    pages: int
+    # What counts as a "page" for this format (pages, slides, rows, items, cells, files...)
+    page_unit: str
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _sentences(rng: random.Random, count: int) -> str:
+    return " ".join(
+        _words(rng, rng.randint(6, 18)).capitalize() + "." for _ in range(count)
+    )
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def _png(rng: random.Random, width: int, height: int) -> bytes:
+    """A noisy RGB PNG, so that images don't compress down to nothing."""
+    # Each scanline starts with its filter type (0, none)
+    rows = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(rows))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+##########################################################################################
+# OLE compound files (XLS, MSG)
+##########################################################################################
+
+_SECTOR_SIZE = 512
+_MINI_SECTOR_SIZE = 64
+_MINI_STREAM_CUTOFF = 4096
+_ENDOFCHAIN = 0xFFFFFFFE
+_FREESECT = 0xFFFFFFFF
+_FATSECT = 0xFFFFFFFD
+_NOSTREAM = 0xFFFFFFFF
+
+
+def _chain(table: List[int], count: int) -> int:
+    """Appends a chain of `count` consecutive sectors to a FAT or MiniFAT, returning its start."""
+    if count == 0:
+        return _ENDOFCHAIN
+    start = len(table)
+    table.extend(range(start + 1, start + count))
+    table.append(_ENDOFCHAIN)
+    return start
+
+
+def _pad(data: bytes, size: int) -> bytes:
+    return data + b"\0" * (-len(data) % size)
+
+
+_EMPTY_DIRECTORY_ENTRY = struct.pack(
+    "<64sHBBIII16sIQQIQ",
+    b"",
+    0,
+    0,
+    0,
+    _NOSTREAM,
+    _NOSTREAM,
+    _NOSTREAM,
+    b"",
+    0,
+    0,
+    0,
+    0,
+    0,
+)
+
+
+def _directory_entry(name, entry_type, child, left, right, start, size) -> bytes:
+    encoded = (name + "\0").encode("utf-16-le")
+    return struct.pack(
+        "<64sHBBIII16sIQQIQ",
+        encoded,
+        len(encoded),
+        entry_type,
+        1,  # Black. Readers don't check the red-black invariants
+        left,
+        right,
+        child,
+        b"\0" * 16,
+        0,
+        0,
+        0,
+        start,
+        size,
+    )
+
+
+def write_compound_file(path: str, streams: Dict[str, bytes]) -> None:
+    """Writes `streams` (all in the root storage) as a version 3 OLE compound file."""
+    # Directory entries are kept in a binary tree, ordered by length then by upper-cased name
+    names = sorted(streams, key=lambda name: (len(name), name.upper()))
+    tree: Dict[int, tuple] = {}
+
+    def build(lo, hi):
+        if lo > hi:
+            return _NOSTREAM
+        mid = (lo + hi) // 2
+        tree[mid] = (build(lo, mid - 1), build(mid + 1, hi))
+        return mid
+
+    root_child = build(1, len(names))
+
+    fat: List[int] = []
+    minifat: List[int] = []
+    sectors = bytearray()
+    mini_stream = bytearray()
+    placement = {}
+    for name in names:
+        data = streams[name]
+        if len(data) < _MINI_STREAM_CUTOFF:
+            placement[name] = _chain(minifat, -(-len(data) // _MINI_SECTOR_SIZE))
+            mini_stream += _pad(data, _MINI_SECTOR_SIZE)
+        else:
+            placement[name] = _chain(fat, -(-len(data) // _SECTOR_SIZE))
+            sectors += _pad(data, _SECTOR_SIZE)
+
+    mini_stream_start = _chain(fat, -(-len(mini_stream) // _SECTOR_SIZE))
+    sectors += _pad(bytes(mini_stream), _SECTOR_SIZE)
+
+    minifat_data = struct.pack(f"<{len(minifat)}I", *minifat)
+    minifat_data += b"\xff" * (-len(minifat_data) % _SECTOR_SIZE)
+    minifat_sectors = len(minifat_data) // _SECTOR_SIZE
+    minifat_start = _chain(fat, minifat_sectors)
+    sectors += minifat_data
+
+    directory = _directory_entry(
+        "Root Entry",
+        5,
+        root_child,
+        _NOSTREAM,
+        _NOSTREAM,
+        mini_stream_start,
+        len(mini_stream),
+    )
+    for index, name in enumerate(names, start=1):
+        left, right = tree[index]
+        directory += _directory_entry(
+            name, 2, _NOSTREAM, left, right, placement[name], len(streams[name])
+        )
+    # Unused entries must still be well formed
+    while len(directory) % _SECTOR_SIZE:
+        directory += _EMPTY_DIRECTORY_ENTRY
+    directory_start = _chain(fat, len(directory) // _SECTOR_SIZE)
+    sectors += directory
+
+    # The FAT describes itself, too
+    fat_sectors = 1
+    while (len(fat) + fat_sectors) > fat_sectors * (_SECTOR_SIZE // 4):
+        fat_sectors += 1
+    if fat_sectors > 109:
+        raise ValueError("Compound file too large for a header-only DIFAT")
+    difat = list(range(len(fat), len(fat) + fat_sectors))
+    fat.extend([_FATSECT] * fat_sectors)
+    fat.extend([_FREESECT] * (fat_sectors * (_SECTOR_SIZE // 4) - len(fat)))
+
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+        b"\0" * 16,
+        0x003E,
+        0x0003,
+        0xFFFE,
+        9,
+        6,
+        b"\0" * 6,
+        0,
+        fat_sectors,
+        directory_start,
+        0,
+        _MINI_STREAM_CUTOFF,
+        minifat_start,
+        minifat_sectors,
+        _ENDOFCHAIN,
+        0,
+    )
+    header += struct.pack("<109I", *(difat + [_FREESECT] * (109 - len(difat))))
+
+    with open(path, "wb") as fh:
+        fh.write(header)
+        fh.write(sectors)
+        fh.write(struct.pack(f"<{len(fat)}I", *fat))
+
+
+def _biff_record(record_type: int, data: bytes = b"") -> bytes:
+    return struct.pack("<HH", record_type, len(data)) + data
+
+
+def _biff_string(text: str, length_format: str) -> bytes:
+    # Uncompressed (UTF-16) strings, flagged as such
+    return struct.pack(length_format, len(text)) + b"\x01" + text.encode("utf-16-le")
+
+
+def _biff_boundsheet(offset: int, name: str) -> bytes:
+    return _biff_record(
+        0x0085, struct.pack("<IBB", offset, 0, 0) + _biff_string(name, "<B")
+    )
+
+
+def _biff_workbook(sheets: Dict[str, List[list]]) -> bytes:
+    """A BIFF8 Workbook stream, with string (LABEL) and number (NUMBER) cells."""
+    bof_globals = _biff_record(
+        0x0809, struct.pack("<HHHHII", 0x0600, 0x0005, 0x0DBB, 0x07CC, 0, 6)
+    )
+    # Cell formats refer to an XF (extended format) record. One "General" cell XF will do
+    globals_head = bof_globals + _biff_record(0x0042, struct.pack("<H", 1200))
+    globals_head += _biff_record(
+        0x0031,
+        struct.pack("<HHHHHBBBB", 200, 0, 0x7FFF, 400, 0, 0, 0, 0, 0)
+        + _biff_string("Arial", "<B"),
+    )
+    for index in range(16):
+        # Excel expects 15 style XFs ahead of the first cell XF
+        used_attributes = 0xF4 if index < 15 else 0x00
+        type_and_parent = 0xFFF5 if index < 15 else 0x0000
+        globals_head += _biff_record(
+            0x00E0,
+            struct.pack(
+                "<HHHBBBBIIH",
+                0,
+                0,
+                type_and_parent,
+                0x20,
+                0,
+                0,
+                used_attributes,
+                0,
+                0,
+                0x20C0,
+            ),
+        )
+
+    sheet_streams = []
+    for rows in sheets.values():
+        body = _biff_record(
+            0x0809, struct.pack("<HHHHII", 0x0600, 0x0010, 0x0DBB, 0x07CC, 0, 6)
+        )
+        columns = max((len(row) for row in rows), default=0)
+        body += _biff_record(0x0200, struct.pack("<IIHHH", 0, len(rows), 0, columns, 0))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                if isinstance(value, str):
+                    body += _biff_record(
+                        0x0204,
+                        struct.pack("<HHH", r, c, 15) + _biff_string(value, "<H"),
+                    )
+                else:
+                    body += _biff_record(0x0203, struct.pack("<HHHd", r, c, 15, value))
+        body += _biff_record(0x000A)
+        sheet_streams.append(body)
+
+    # BOUNDSHEET records hold the absolute offset of each sheet's BOF, so size the globals first
+    offset = (
+        len(globals_head) + sum(len(_biff_boundsheet(0, name)) for name in sheets) + 4
+    )
+    stream = bytearray(globals_head)
+    for name, body in zip(sheets, sheet_streams):
+        stream += _biff_boundsheet(offset, name)
+        offset += len(body)
+    stream += _biff_record(0x000A)
+    for body in sheet_streams:
+        stream += body
+    return bytes(stream)
+
+
+def _mapi_string(text: str) -> bytes:
+    return text.encode("utf-16-le")
+
+
+##########################################################################################
+# Generators. Each takes a directory, a seeded random number generator and a size, and
+# returns the Case it wrote.
+##########################################################################################
+
+
+def generate_pdf(directory: str, rng: random.Random, pages: int) -> Case:
+    """A multi-page PDF of plain text, set in Helvetica."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # The page tree, once the pages are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = [f"Page {page + 1}"] + [
+            _words(rng, rng.randint(8, 14)) for _ in range(50)
+        ]
+        content = (
+            "BT /F1 10 Tf 14 TL 50 780 Td "
+            + " ".join(f"({line}) Tj T*" for line in lines)
+            + " ET"
+        )
+        content = content.encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+
+    path = os.path.join(directory, "document.pdf")
+    with open(path, "wb") as fh:
+        fh.write(pdf)
+    return Case("pdf", path, ".pdf", pages, "pages")
+
+
+def _xlsx(directory, name, rng, rows, columns) -> Case:
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append([f"Column {c + 1}" for c in range(columns)])
+    for r in range(rows):
+        sheet.append(
+            [
+                rng.choice(WORDS) if c % 3 == 0 else round(rng.uniform(0, 10000), 2)
+                for c in range(columns)
+            ]
+        )
+    path = os.path.join(directory, f"{name}.xlsx")
+    workbook.save(path)
+    return Case(name, path, ".xlsx", rows, "rows")
+
+
+def generate_xlsx_long(directory: str, rng: random.Random, rows: int) -> Case:
+    """A narrow sheet, with many rows."""
+    return _xlsx(directory, "xlsx-long", rng, rows, 8)
+
+
+def generate_xlsx_wide(directory: str, rng: random.Random, columns: int) -> Case:
+    """A sheet with many columns, and 200 rows."""
+    return _xlsx(directory, "xlsx-wide", rng, 200, columns)
+
+
+def generate_xls(directory: str, rng: random.Random, rows: int) -> Case:
+    """A legacy (BIFF8) workbook, with two sheets sharing the rows between them."""
+    sheets = {}
+    for s in range(2):
+        header = [f"Column {c + 1}" for c in range(10)]
+        sheets[f"Sheet{s + 1}"] = [header] + [
+            [
+                rng.choice(WORDS) if c % 3 == 0 else round(rng.uniform(0, 10000), 2)
+                for c in range(10)
+            ]
+            for _ in range(rows // 2)
+        ]
+    path = os.path.join(directory, "document.xls")
+    write_compound_file(path, {"Workbook": _biff_workbook(sheets)})
+    return Case("xls", path, ".xls", 2 * (rows // 2), "rows")
+
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Default Extension="png" ContentType="image/png"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+_DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCX_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"'
+)
+
+
+def _docx_paragraph(text: str, style: Optional[str] = None) -> str:
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{properties}<w:r><w:t>{escape(text)}</w:t></w:r></w:p>"
+
+
+def _docx_image(relationship: str, number: int, description: str) -> str:
+    return (
+        f'<w:p><w:r><w:drawing><wp:inline><wp:extent cx="2743200" cy="1828800"/>'
+        f'<wp:docPr id="{number}" name="Picture {number}" descr="{escape(description)}"/>'
+        f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+        f'<pic:pic><pic:blipFill><a:blip r:embed="{relationship}"/></pic:blipFill></pic:pic>'
+        f"</a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>"
+    )
+
+
+def _docx_table(rng: random.Random, rows: int, columns: int) -> str:
+    cells = lambda: "".join(  # noqa: E731
+        f"<w:tc><w:p><w:r><w:t>{_words(rng, 2)}</w:t></w:r></w:p></w:tc>"
+        for _ in range(columns)
+    )
+    return (
+        "<w:tbl>" + "".join(f"<w:tr>{cells()}</w:tr>" for _ in range(rows)) + "</w:tbl>"
+    )
+
+
+def generate_docx(directory: str, rng: random.Random, pages: int) -> Case:
+    """An image-heavy DOCX: each page has a heading, text, a table and two pictures."""
+    body = []
+    relationships = []
+    media = {}
+    for page in range(pages):
+        body.append(
+            _docx_paragraph(f"Section {page + 1}: {_words(rng, 4)}", "Heading1")
+        )
+        body.append(_docx_paragraph(_sentences(rng, 6)))
+        for _ in range(2):
+            number = len(media) + 1
+            relationship = f"rId{number + 100}"
+            media[f"word/media/image{number}.png"] = _png(rng, 160, 120)
+            relationships.append(
+                f'<Relationship Id="{relationship}" '
+                f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" '
+                f'Target="media/image{number}.png"/>'
+            )
+            body.append(_docx_image(relationship, number, _words(rng, 6)))
+        body.append(_docx_table(rng, 4, 4))
+        body.append(_docx_paragraph(_sentences(rng, 4)))
+        if page < pages - 1:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<w:document {_DOCX_NAMESPACES}><w:body>{''.join(body)}</w:body></w:document>"
+    )
+    document_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + "".join(relationships)
+        + "</Relationships>"
+    )
+    path = os.path.join(directory, "document.docx")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        docx.writestr("_rels/.rels", _DOCX_RELS)
+        docx.writestr("word/document.xml", document)
+        docx.writestr("word/_rels/document.xml.rels", document_rels)
+        for name, data in media.items():
+            docx.writestr(name, data)
+    return Case("docx", path, ".docx", pages, "pages")
+
+
+def generate_pptx(directory: str, rng: random.Random, slides: int) -> Case:
+    """An image-heavy PPTX: each slide has a title, bullet text, a table and two pictures."""
+    presentation = pptx.Presentation()
+    layout = presentation.slide_layouts[5]  # Title only
+    for number in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {number + 1}: {_words(rng, 3)}"
+        text = slide.shapes.add_textbox(
+            Inches(0.5), Inches(1.5), Inches(4.5), Inches(2)
+        ).text_frame
+        text.text = _sentences(rng, 1)
+        for _ in range(3):
+            text.add_paragraph().text = _sentences(rng, 1)
+        for p in text.paragraphs:
+            for run in p.runs:
+                run.font.size = Pt(12)
+        for i in range(2):
+            picture = slide.shapes.add_picture(
+                io.BytesIO(_png(rng, 160, 120)),
+                Inches(5.5),
+                Inches(1.5 + 2.5 * i),
+                width=Inches(3),
+            )
+            picture._element.nvPicPr.cNvPr.set("descr", _words(rng, 6))
+        table = slide.shapes.add_table(
+            4, 4, Inches(0.5), Inches(4), Inches(4.5), Inches(2)
+        ).table
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = _words(rng, 2)
+    path = os.path.join(directory, "presentation.pptx")
+    presentation.save(path)
+    return Case("pptx", path, ".pptx", slides, "slides")
+
+
+def _html_section(rng: random.Random, number: int) -> str:
+    items = "".join(f"<li>{_words(rng, 8)}</li>" for _ in range(5))
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{_words(rng, 2)}</td>" for _ in range(5)) + "</tr>"
+        for _ in range(6)
+    )
+    return (
+        f"<section><h2>Section {number}</h2>"
+        + "".join(
+            f"<p>{_sentences(rng, 5)} <a href='#s{number}'>link</a></p>"
+            for _ in range(4)
+        )
+        + f"<ul>{items}</ul><table><tr><th>A</th><th>B</th><th>C</th><th>D</th><th>E</th></tr>{rows}</table>"
+        + "</section>"
+    )
+
+
+def generate_html(directory: str, rng: random.Random, sections: int) -> Case:
+    """A long HTML page, with navigation, scripts and styles around the content."""
+    body = "".join(_html_section(rng, n + 1) for n in range(sections))
+    html = (
+        "<!DOCTYPE html><html><head><title>Benchmark page</title>"
+        "<style>body { font-family: sans-serif; }</style><script>var x = 1;</script></head>"
+        "<body><nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+        f"<main><h1>Benchmark page</h1>{body}</main><footer>Footer</footer></body></html>"
+    )
+    path = os.path.join(directory, "page.html")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(html)
+    return Case("html", path, ".html", sections, "sections")
+
+
+def generate_rss(directory: str, rng: random.Random, items: int) -> Case:
+    """An RSS 2.0 feed, with HTML descriptions."""
+    entries = "".join(
+        f"<item><title>{_words(rng, 5)}</title><link>https://example.com/{n}</link>"
+        f"<pubDate>Mon, 0{n % 9 + 1} Jan 2024 12:00:00 GMT</pubDate>"
+        f"<description>{escape('<p>' + _sentences(rng, 4) + '</p><ul><li>' + _words(rng, 6) + '</li></ul>')}</description>"
+        "</item>"
+        for n in range(items)
+    )
+    rss = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>Benchmark feed</title><link>https://example.com/</link>"
+        f"<description>{_words(rng, 10)}</description>{entries}</channel></rss>"
+    )
+    path = os.path.join(directory, "feed.rss")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(rss)
+    return Case("rss", path, ".rss", items, "items")
+
+
+def generate_ipynb(directory: str, rng: random.Random, cells: int) -> Case:
+    """A Jupyter notebook alternating Markdown and code cells, with outputs."""
+    notebook_cells = []
+    for n in range(cells):
+        if n % 2 == 0:
+            notebook_cells.append(
+                {
+                    "cell_type": "markdown",
+                    "metadata": {},
+                    "source": [f"## Step {n // 2 + 1}\n", _sentences(rng, 3)],
+                }
+            )
+        else:
+            notebook_cells.append(
+                {
+                    "cell_type": "code",
+                    "execution_count": n,
+                    "metadata": {},
+                    "source": [
+                        f"values_{n} = [{', '.join(str(rng.randint(0, 99)) for _ in range(20))}]\n",
+                        f"sum(values_{n})",
+                    ],
+                    "outputs": [
+                        {
+                            "output_type": "execute_result",
+                            "execution_count": n,
+                            "metadata": {},
+                            "data": {"text/plain": [str(rng.randint(0, 2000))]},
+                        }
+                    ],
+                }
+            )
+    notebook = {
+        "cells": notebook_cells,
+        "metadata": {
+            "kernelspec": {
+                "name": "python3",
+                "display_name": "Python 3",
+                "language": "python",
+            }
+        },
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    path = os.path.join(directory, "notebook.ipynb")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(notebook, fh, indent=1)
+    return Case("ipynb", path, ".ipynb", cells, "cells")
+
+
+def generate_msg(directory: str, rng: random.Random, paragraphs: int) -> Case:
+    """An Outlook message, with a long plain-text body."""
+    streams = {
+        # Header for a top-level message's property stream: reserved, next recipient and attachment ids, counts
+        "__properties_version1.0": struct.pack("<8sIIII8s", b"", 1, 0, 1, 0, b""),
+        "__substg1.0_0037001F": _mapi_string(f"Benchmark: {_words(rng, 5)}"),
+        "__substg1.0_0C1F001F": _mapi_string("sender@example.com"),
+        "__substg1.0_0E04001F": _mapi_string("recipient@example.com"),
+        "__substg1.0_1000001F": _mapi_string(
+            "\r\n\r\n".join(_sentences(rng, 5) for _ in range(paragraphs))
+        ),
+    }
+    path = os.path.join(directory, "message.msg")
+    write_compound_file(path, streams)
+    return Case("msg", path, ".msg", paragraphs, "paragraphs")
+
+
+def generate_zip(directory: str, rng: random.Random, files: int) -> Case:
+    """A zip of text, HTML, CSV and JSON files, with another such zip nested inside, two levels deep."""
+
+    def build(depth):
+        buffer = io.BytesIO()
+        count = 0
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for n in range(files):
+                kind = n % 4
+                if kind == 0:
+                    archive.writestr(f"notes/{n}.txt", _sentences(rng, 20))
+                elif kind == 1:
+                    archive.writestr(
+                        f"pages/{n}.html",
+                        f"<html><body>{_html_section(rng, n)}</body></html>",
+                    )
+                elif kind == 2:
+                    archive.writestr(
+                        f"data/{n}.csv",
+                        "\n".join(
+                            ",".join(_words(rng, 1) for _ in range(6))
+                            for _ in range(50)
+                        ),
+                    )
+                else:
+                    archive.writestr(
+                        f"data/{n}.json",
+                        json.dumps({"id": n, "text": _sentences(rng, 5)}),
+                    )
+                count += 1
+            if depth > 0:
+                inner, inner_count = build(depth - 1)
+                archive.writestr(f"nested/level{depth}.zip", inner)
+                count += inner_count + 1
+        return buffer.getvalue(), count
+
+    data, count = build(2)
+    path = os.path.join(directory, "archive.zip")
+    with open(path, "wb") as fh:
+        fh.write(data)
+    return Case("zip", path, ".zip", count, "files")
+
+
+def generate_png(directory: str, rng: random.Random, width: int) -> Case:
+    """A photo-sized (4:3) PNG. With an LLM client configured, it gets described."""
+    path = os.path.join(directory, "image.png")
+    with open(path, "wb") as fh:
+        fh.write(_png(rng, width, width * 3 // 4))
+    return Case("png", path, ".png", 1, "images")
+
+
+# Name: (generator, size at scale 1)
+GENERATORS: Dict[str, tuple] = {
+    "pdf": (generate_pdf, 20),
+    "docx": (generate_docx, 20),
+    "pptx": (generate_pptx, 20),
+    "xlsx-long": (generate_xlsx_long, 5000),
+    "xlsx-wide": (generate_xlsx_wide, 200),
+    "xls": (generate_xls, 4000),
+    "html": (generate_html, 200),
+    "rss": (generate_rss, 500),
+    "ipynb": (generate_ipynb, 400),
+    "msg": (generate_msg, 500),
+    "zip": (generate_zip, 20),
+    "png": (generate_png, 800),
+}
+
+
+def generate_corpus(
+    directory: str,
+    scale: float = 1.0,
+    only: Optional[List[str]] = None,
+    seed: int = 0,
+) -> List[Case]:
+    """Writes the corpus into `directory`, and returns its cases.
+
+    `scale` multiplies the size of every document (pages, rows, items, ...), and `only` restricts the
+    corpus to the named generators. The same seed and scale always give the same documents.
+    """
+    if only:
+        unknown = set(only) - set(GENERATORS)
+        if unknown:
+            raise ValueError(f"Unknown corpus entries: {', '.join(sorted(unknown))}")
+
+    os.makedirs(directory, exist_ok=True)
+    cases = []
+    for name, (generator, size) in GENERATORS.items():
+        if only and name not in only:
+            continue
+        cases.append(
+            generator(
+                directory, random.Random(f"{seed}:{name}"), max(1, round(size * scale))
+            )
+        )
+    return cases
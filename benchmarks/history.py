@@ -0,0 +1,599 @@
+"""Keeps a history of converter benchmark results, and catches regressions against it.
+
+    python -m benchmarks.converters -o results.json
+    python -m benchmarks.history check results.json      # compare to the baseline, then record
+    python -m benchmarks.history run -- --scale 1 --repeat 7   # both of the above, in one go
+    python -m benchmarks.history report --last 20
+
+Results are kept in a local store (--store, by default .benchmarks/ in the repository), as one
+JSON-lines file per machine fingerprint, each line a run tagged with the commit it measured.
+Numbers are only ever compared with runs from the same machine, at the same corpus scale and seed.
+
+The baseline for a document is the timing samples of the last --window runs at other commits
+(and changes are only flagged once there are --min-runs of them). A document has regressed in
+throughput when its median time is more than --threshold slower than the baseline's, and a
+bootstrap confidence interval for that ratio, which allows for drift between runs as well as
+within them, lies wholly above 1. That way a noisy run doesn't raise a false alarm. Memory has
+regressed when peak RSS exceeds every baseline run, and the baseline median by more than
+--memory-threshold (and --memory-floor MB).
+Several result files for the same commit can be given at once; their samples are pooled.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import converters
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE = os.path.join(REPO_ROOT, ".benchmarks")
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as fh:
+            for line in fh:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def _total_memory() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def machine_fingerprint() -> Tuple[str, Dict[str, Any]]:
+    """A short id for this machine and Python, and what it was derived from.
+
+    Anything that moves the numbers goes in: the CPU model and count, memory, OS and Python version.
+    """
+    machine = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "memory_bytes": _total_memory(),
+        "python": f"{platform.python_implementation()} {'.'.join(platform.python_version_tuple()[:2])}",
+    }
+    digest = hashlib.sha256(
+        json.dumps(machine, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return digest[:12], machine
+
+
+def current_commit() -> Tuple[str, bool]:
+    """The checked-out commit, and whether the working tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}/{result['html_parser']}"
+
+
+def make_run(reports: List[Dict[str, Any]], commit: str, dirty: bool) -> Dict[str, Any]:
+    """One history entry from one or more benchmarks.converters reports, pooling their samples."""
+    settings = reports[0]["settings"]
+    for report in reports[1:]:
+        if (report["settings"]["scale"], report["settings"]["seed"]) != (
+            settings["scale"],
+            settings["seed"],
+        ):
+            raise ValueError("Reports to pool must share a corpus scale and seed")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for report in reports:
+        for r in report["results"]:
+            entry = results.setdefault(
+                _result_key(r),
+                {
+                    "case": r["case"],
+                    "html_parser": r["html_parser"],
+                    "page_unit": r["page_unit"],
+                    "pages": r["pages"],
+                    "input_bytes": r["input_bytes"],
+                    "converter": None,
+                    "samples_seconds": [],
+                    "peak_rss_mb": [],
+                    "errors": [],
+                },
+            )
+            if r["error"] is not None:
+                entry["errors"].append(r["error"])
+                continue
+            entry["converter"] = r["converter"]
+            entry["samples_seconds"].extend(r["samples_seconds"])
+            if r["peak_rss_mb"] is not None:
+                entry["peak_rss_mb"].append(r["peak_rss_mb"])
+
+    for entry in results.values():
+        samples = entry["samples_seconds"]
+        entry["median_seconds"] = statistics.median(samples) if samples else None
+        entry["mb_per_second"] = (
+            entry["input_bytes"] / (1024 * 1024) / entry["median_seconds"]
+            if entry["median_seconds"]
+            else None
+        )
+        # The median of the reports' peaks, so one noisy report doesn't set it
+        entry["peak_rss_mb"] = (
+            statistics.median(entry["peak_rss_mb"]) if entry["peak_rss_mb"] else None
+        )
+
+    fingerprint, machine = machine_fingerprint()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "recorded": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "created": max(report["created"] for report in reports),
+        "fingerprint": fingerprint,
+        "machine": machine,
+        "markitdown": reports[0]["environment"]["markitdown"],
+        "settings": {"scale": settings["scale"], "seed": settings["seed"]},
+        "reports": len(reports),
+        "results": results,
+    }
+
+
+class HistoryStore:
+    """Benchmark runs on disk: one JSON-lines file per machine fingerprint, oldest run first."""
+
+    def __init__(self, directory: str = DEFAULT_STORE):
+        self.directory = directory
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.jsonl")
+
+    def append(self, run: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(run["fingerprint"]), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(run) + "\n")
+
+    def runs(
+        self, fingerprint: str, settings: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Runs recorded on a machine, optionally only those at the given corpus settings."""
+        path = self._path(fingerprint)
+        if not os.path.exists(path):
+            return []
+        runs = []
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    # A torn final line, from an interrupted write
+                    continue
+                if settings is None or run["settings"] == settings:
+                    runs.append(run)
+        return runs
+
+    def baseline(self, run: Dict[str, Any], window: int) -> List[Dict[str, Any]]:
+        """The last `window` comparable runs, at commits other than the run's own."""
+        previous = [
+            r
+            for r in self.runs(run["fingerprint"], run["settings"])
+            if r["commit"] != run["commit"]
+        ]
+        return previous[-window:]
+
+
+def bootstrap_ratio(
+    candidate: List[float],
+    baseline: List[List[float]],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int = 0,
+) -> Tuple[float, float, float]:
+    """The ratio of medians (candidate / pooled baseline), and a bootstrap confidence interval for it.
+
+    The baseline is resampled in two stages, runs and then samples within each run, because times
+    drift more between runs than within one, and the interval has to allow for that.
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        pooled = []
+        for samples in rng.choices(baseline, k=len(baseline)):
+            pooled.extend(rng.choices(samples, k=len(samples)))
+        ratios.append(
+            statistics.median(rng.choices(candidate, k=len(candidate)))
+            / statistics.median(pooled)
+        )
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * resamples)]
+    high = ratios[min(resamples - 1, int((1 - tail) * resamples))]
+    pooled = [s for samples in baseline for s in samples]
+    return statistics.median(candidate) / statistics.median(pooled), low, high
+
+
+def compare(
+    run: Dict[str, Any],
+    baseline: List[Dict[str, Any]],
+    threshold: float = 0.05,
+    memory_threshold: float = 0.10,
+    memory_floor_mb: float = 5.0,
+    confidence: float = 0.95,
+    min_runs: int = 3,
+) -> List[Dict[str, Any]]:
+    """Compares each document in `run` with the baseline runs, and classifies the change."""
+    comparisons = []
+    for key, result in sorted(run["results"].items()):
+        previous = [
+            b["results"][key]
+            for b in baseline
+            if key in b["results"] and b["results"][key]["samples_seconds"]
+        ]
+        pooled = [s for p in previous for s in p["samples_seconds"]]
+        peaks = [p["peak_rss_mb"] for p in previous if p["peak_rss_mb"] is not None]
+        comparison = {
+            "key": key,
+            "case": result["case"],
+            "html_parser": result["html_parser"],
+            "baseline_runs": len(previous),
+            "median_seconds": result["median_seconds"],
+            "baseline_median_seconds": statistics.median(pooled) if pooled else None,
+            "time_ratio": None,
+            "time_ratio_ci": None,
+            "throughput_change": None,
+            "peak_rss_mb": result["peak_rss_mb"],
+            "baseline_peak_rss_mb": statistics.median(peaks) if peaks else None,
+            "status": "ok",
+            "reasons": [],
+        }
+        comparisons.append(comparison)
+
+        if result["errors"] and not result["samples_seconds"]:
+            comparison["status"] = "error"
+            comparison["reasons"].append(result["errors"][0])
+            continue
+        if len(previous) < min_runs:
+            # Too few runs to tell a change from the usual run-to-run drift
+            comparison["status"] = "new" if not previous else "baseline"
+            continue
+
+        ratio, low, high = bootstrap_ratio(
+            result["samples_seconds"],
+            [p["samples_seconds"] for p in previous],
+            confidence,
+        )
+        comparison["time_ratio"] = ratio
+        comparison["time_ratio_ci"] = [low, high]
+        comparison["throughput_change"] = 1 / ratio - 1
+        if ratio > 1 + threshold and low > 1:
+            comparison["status"] = "regression"
+            comparison["reasons"].append(
+                f"throughput down {1 - 1 / ratio:.1%} "
+                f"(time x{ratio:.2f}, {confidence:.0%} CI {low:.2f}-{high:.2f})"
+            )
+        elif ratio < 1 - threshold and high < 1:
+            comparison["status"] = "improvement"
+            comparison["reasons"].append(
+                f"throughput up {1 / ratio - 1:.1%} "
+                f"(time x{ratio:.2f}, {confidence:.0%} CI {low:.2f}-{high:.2f})"
+            )
+
+        peak = result["peak_rss_mb"]
+        if peak is not None and peaks:
+            base = statistics.median(peaks)
+            if peak > max(peaks) and peak - base > max(
+                memory_threshold * base, memory_floor_mb
+            ):
+                comparison["status"] = "regression"
+                comparison["reasons"].append(
+                    f"peak RSS up {peak - base:.1f} MB ({peak / base - 1:.1%})"
+                )
+    return comparisons
+
+
+def _format(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_comparison(comparisons: List[Dict[str, Any]], stream=sys.stderr) -> None:
+    header = f"{'document':<24} {'runs':>4} {'median s':>9} {'baseline':>9} {'throughput':>10} {'peak MB':>8} {'base MB':>8}  status"
+    print(header, file=stream)
+    print("-" * len(header), file=stream)
+    for c in comparisons:
+        print(
+            f"{c['key']:<24} {c['baseline_runs']:>4} {_format(c['median_seconds'], '>9.4f')} "
+            f"{_format(c['baseline_median_seconds'], '>9.4f')} {_format(c['throughput_change'], '>+10.1%')} "
+            f"{_format(c['peak_rss_mb'], '>8.1f')} {_format(c['baseline_peak_rss_mb'], '>8.1f')}  "
+            f"{c['status']}{': ' + '; '.join(c['reasons']) if c['reasons'] else ''}",
+            file=stream,
+        )
+
+
+def sparkline(values: List[Optional[float]]) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return ""
+    low, high = min(present), max(present)
+    span = high - low or 1.0
+    return "".join(
+        (
+            " "
+            if v is None
+            else SPARK_CHARS[int((v - low) / span * (len(SPARK_CHARS) - 1))]
+        )
+        for v in values
+    )
+
+
+def render_report(runs: List[Dict[str, Any]], case: Optional[str] = None) -> str:
+    """A trend report: per document, throughput and peak RSS over the runs, oldest first."""
+    lines = []
+    keys = sorted({key for run in runs for key in run["results"]})
+    for key in keys:
+        if case is not None and not key.startswith(case + "/"):
+            continue
+        throughput = []
+        memory = []
+        rows = []
+        for run in runs:
+            result = run["results"].get(key)
+            mb_per_second = result["mb_per_second"] if result else None
+            peak = result["peak_rss_mb"] if result else None
+            throughput.append(mb_per_second)
+            memory.append(peak)
+            if result is not None:
+                rows.append(
+                    f"  {run['commit'][:10]}{'+' if run['dirty'] else ' '} {run['created'][:19]}  "
+                    f"{_format(result['median_seconds'], '>9.4f')} s  {_format(mb_per_second, '>8.2f')} MB/s  "
+                    f"{_format(peak, '>7.1f')} MB"
+                )
+        lines.append(f"{key}")
+        lines.append(f"  throughput {sparkline(throughput)}")
+        lines.append(f"  peak RSS   {sparkline(memory)}")
+        lines.extend(rows)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _load_reports(paths: List[str]) -> List[Dict[str, Any]]:
+    reports = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as fh:
+            report = json.load(fh)
+        if report.get("benchmark") != "converters":
+            raise ValueError(f"{path} is not a benchmarks.converters report")
+        reports.append(report)
+    return reports
+
+
+def check(args, reports: List[Dict[str, Any]]) -> int:
+    """Compares reports with the baseline, records them unless told not to, and returns an exit status."""
+    commit, dirty = current_commit()
+    run = make_run(
+        reports, args.commit or commit, dirty if args.commit is None else False
+    )
+    store = HistoryStore(args.store)
+    baseline = store.baseline(run, args.window)
+    comparisons = compare(
+        run,
+        baseline,
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+        memory_floor_mb=args.memory_floor,
+        confidence=args.confidence,
+        min_runs=args.min_runs,
+    )
+    print(
+        f"Commit {run['commit'][:10]}{' (dirty)' if run['dirty'] else ''} on machine {run['fingerprint']}, "
+        f"against {len(baseline)} baseline run(s)",
+        file=sys.stderr,
+    )
+    print_comparison(comparisons)
+    if not args.no_record:
+        store.append(run)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "run": run,
+                    "baseline_commits": [b["commit"] for b in baseline],
+                    "comparisons": comparisons,
+                },
+                fh,
+                indent=2,
+            )
+    return 1 if any(c["status"] in ("regression", "error") for c in comparisons) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.history",
+        description="Record converter benchmark results, and detect regressions against past runs.",
+    )
+    parser.add_argument(
+        "--store",
+        default=DEFAULT_STORE,
+        help=f"history directory (default: {DEFAULT_STORE})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def comparison_options(command):
+        command.add_argument(
+            "--commit", help="the commit measured (default: the checked-out commit)"
+        )
+        command.add_argument(
+            "--window",
+            type=int,
+            default=5,
+            help="baseline runs to compare with (default: 5)",
+        )
+        command.add_argument(
+            "--min-runs",
+            type=int,
+            default=3,
+            help="baseline runs needed before flagging changes (default: 3)",
+        )
+        command.add_argument(
+            "--threshold",
+            type=float,
+            default=0.05,
+            help="throughput drop that counts, as a fraction (default: 0.05)",
+        )
+        command.add_argument(
+            "--memory-threshold",
+            type=float,
+            default=0.10,
+            help="peak RSS rise that counts, as a fraction (default: 0.10)",
+        )
+        command.add_argument(
+            "--memory-floor",
+            type=float,
+            default=5.0,
+            help="smallest peak RSS rise that counts, in MB (default: 5)",
+        )
+        command.add_argument(
+            "--confidence",
+            type=float,
+            default=0.95,
+            help="confidence level of the intervals (default: 0.95)",
+        )
+        command.add_argument(
+            "--no-record",
+            action="store_true",
+            help="compare only; don't add the run to the history",
+        )
+        command.add_argument(
+            "-o", "--output", help="write the comparison here, as JSON"
+        )
+
+    record = commands.add_parser("record", help="add benchmark results to the history")
+    record.add_argument(
+        "results",
+        nargs="+",
+        help="benchmarks.converters JSON reports; several are pooled",
+    )
+    record.add_argument(
+        "--commit", help="the commit measured (default: the checked-out commit)"
+    )
+
+    check_command = commands.add_parser(
+        "check", help="compare results with the history, then record them"
+    )
+    check_command.add_argument(
+        "results",
+        nargs="+",
+        help="benchmarks.converters JSON reports; several are pooled",
+    )
+    comparison_options(check_command)
+
+    run_command = commands.add_parser(
+        "run",
+        help="run benchmarks.converters (with the arguments after --), then check",
+    )
+    run_command.add_argument(
+        "--runs", type=int, default=1, help="benchmark runs to pool (default: 1)"
+    )
+    run_command.add_argument(
+        "benchmark_args",
+        nargs=argparse.REMAINDER,
+        help="arguments for benchmarks.converters",
+    )
+    comparison_options(run_command)
+
+    report = commands.add_parser("report", help="show throughput and memory trends")
+    report.add_argument("--case", help="only this document (e.g. pdf)")
+    report.add_argument(
+        "--last", type=int, default=20, help="runs to show (default: 20)"
+    )
+    report.add_argument(
+        "--fingerprint", help="machine to report on (default: this one)"
+    )
+    report.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="corpus scale of the runs to show (default: 1)",
+    )
+    report.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="corpus seed of the runs to show (default: 0)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        commit, dirty = current_commit()
+        run = make_run(
+            _load_reports(args.results),
+            args.commit or commit,
+            dirty if args.commit is None else False,
+        )
+        HistoryStore(args.store).append(run)
+        print(
+            f"Recorded {run['commit'][:10]} for machine {run['fingerprint']}",
+            file=sys.stderr,
+        )
+        return 0
+
+    if args.command == "check":
+        return check(args, _load_reports(args.results))
+
+    if args.command == "run":
+        benchmark_args = [a for a in args.benchmark_args if a != "--"]
+        reports = []
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(args.runs):
+                output = os.path.join(directory, f"results{i}.json")
+                status = converters.main(benchmark_args + ["-o", output])
+                if not os.path.exists(output):
+                    return status or 1
+                reports.extend(_load_reports([output]))
+        return check(args, reports)
+
+    fingerprint = args.fingerprint or machine_fingerprint()[0]
+    runs = HistoryStore(args.store).runs(
+        fingerprint, {"scale": args.scale, "seed": args.seed}
+    )
+    if not runs:
+        print(
+            f"No runs recorded for machine {fingerprint} at scale {args.scale}, seed {args.seed}",
+            file=sys.stderr,
+        )
+        return 1
+    print(render_report(runs[-args.last :], args.case))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,793 @@
+"""Drives the web service (app.py) under load, to size a deployment.
+
+    python -m benchmarks.load --workers 1 2 4 --threads 1 4 --concurrency 16 --duration 30
+    python -m benchmarks.load --rate 20 --mix pdf=3,docx=2,html=2,png=1 --endpoints convert=4,uploads=1
+    python -m benchmarks.load --url http://localhost:8000 --concurrency 8
+
+By default, app.py is started under gunicorn once per --workers/--threads combination, in a scratch
+directory. Each run starts with the result cache off and an OpenAI-compatible stub standing in for
+the LLM, so image descriptions cost a fixed --llm-latency instead of a network round trip. Documents
+come from the benchmark corpus (see benchmarks.corpus), in --variants seeded variants of each, so
+that identical concurrent uploads don't just coalesce.
+
+Load is either closed-loop (--concurrency clients, each sending its next request as soon as the last
+one finishes) or open-loop (--rate requests per second, sent on schedule whether or not earlier
+ones finished; latency is measured from when a request was due, so a backlog shows up in it).
+
+Each run reports request counts, throughput, error and 429 rates, p50/p95/p99 latency (overall,
+by document and by endpoint), and a per-second timeline including the server's RSS.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .converters import environment
+from .corpus import GENERATORS, generate_corpus
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("convert", "uploads")
+
+
+class StubLLMServer:
+    """A local stand-in for an OpenAI-compatible chat completions API, with a fixed latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.calls += 1
+                time.sleep(stub.latency)
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": "stub",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {
+                                    "role": "assistant",
+                                    "content": "A stub description of the image.",
+                                },
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": 0,
+                            "completion_tokens": 0,
+                            "total_tokens": 0,
+                        },
+                    }
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1/"
+
+    def start(self) -> "StubLLMServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def process_tree_rss(pid: int) -> Optional[tuple]:
+    """(RSS in bytes, process count) of a process and all its descendants, from /proc."""
+    try:
+        parents = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as fh:
+                        # The command name may contain spaces; the parent pid follows its closing ")"
+                        parents[int(entry)] = int(
+                            fh.read().rsplit(")", 1)[1].split()[1]
+                        )
+                except (OSError, IndexError, ValueError):
+                    continue
+    except OSError:
+        return None
+
+    tree = {pid}
+    added = True
+    while added:
+        children = {p for p, parent in parents.items() if parent in tree} - tree
+        tree |= children
+        added = bool(children)
+
+    total = 0
+    for p in tree:
+        try:
+            with open(f"/proc/{p}/statm") as fh:
+                total += int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            continue
+    return total, len(tree)
+
+
+class ServerProcess:
+    """app.py under gunicorn, in a scratch working directory of its own."""
+
+    def __init__(self, workers: int, threads: int, env: Dict[str, str]):
+        self.workers = workers
+        self.threads = threads
+        self.port = _free_port()
+        self.workdir = tempfile.mkdtemp(prefix="markitdown_load_")
+        self.env = {**os.environ, **env}
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 60.0) -> "ServerProcess":
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "app:app",
+                "--bind",
+                f"127.0.0.1:{self.port}",
+                "--workers",
+                str(self.workers),
+                "--threads",
+                str(self.threads),
+                "--pythonpath",
+                REPO_ROOT,
+                "--chdir",
+                self.workdir,
+                "--log-level",
+                "warning",
+            ],
+            env=self.env,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"gunicorn exited with status {self.process.returncode}"
+                )
+            try:
+                if requests.get(self.url + "/metrics", timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"gunicorn did not start within {timeout}s")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class RSSSampler:
+    """Samples the RSS of a process tree in the background."""
+
+    def __init__(self, pid: int, interval: float, started: float):
+        self.pid = pid
+        self.interval = interval
+        self.started = started
+        self.samples: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            sample = process_tree_rss(self.pid)
+            if sample is not None:
+                self.samples.append(
+                    {
+                        "t": time.monotonic() - self.started,
+                        "rss_mb": sample[0] / (1024 * 1024),
+                        "processes": sample[1],
+                    }
+                )
+            self._stop.wait(self.interval)
+
+    def start(self) -> "RSSSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def send_convert(
+    session: requests.Session, url: str, document: Dict[str, Any], timeout: float
+) -> int:
+    response = session.post(
+        url + "/convert",
+        files={"file": (document["filename"], document["data"])},
+        timeout=timeout,
+    )
+    return response.status_code
+
+
+def send_upload(
+    session: requests.Session, url: str, document: Dict[str, Any], timeout: float
+) -> int:
+    """A resumable upload: create the session, PUT the ranges in order, then complete it."""
+    data = document["data"]
+    response = session.post(
+        url + "/uploads",
+        json={"filename": document["filename"], "size": len(data)},
+        timeout=timeout,
+    )
+    if response.status_code != 201:
+        return response.status_code
+    upload_id = response.json()["upload_id"]
+    chunk_size = response.json()["chunk_size"]
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start : start + chunk_size]
+        response = session.put(
+            f"{url}/uploads/{upload_id}",
+            data=chunk,
+            headers={
+                "Content-Range": f"bytes {start}-{start + len(chunk) - 1}/{len(data)}"
+            },
+            timeout=timeout,
+        )
+        if response.status_code != 200:
+            return response.status_code
+    return session.post(
+        f"{url}/uploads/{upload_id}/complete", timeout=timeout
+    ).status_code
+
+
+SENDERS = {"convert": send_convert, "uploads": send_upload}
+
+
+class LoadGenerator:
+    """Sends a weighted mix of documents to a set of weighted endpoints, and records each request."""
+
+    def __init__(
+        self,
+        url: str,
+        documents: Dict[str, List[Dict[str, Any]]],
+        mix: Dict[str, float],
+        endpoints: Dict[str, float],
+        timeout: float = 300.0,
+        seed: int = 0,
+    ):
+        self.url = url
+        self.documents = documents
+        self.mix = mix
+        self.endpoints = endpoints
+        self.timeout = timeout
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _choose(self):
+        with self._rng_lock:
+            name = self._rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+            endpoint = self._rng.choices(
+                list(self.endpoints), weights=list(self.endpoints.values())
+            )[0]
+            return self._rng.choice(self.documents[name]), endpoint
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def request(self, started: float, due: float) -> Dict[str, Any]:
+        """Sends one request, timed from when it was due (seconds after `started`)."""
+        document, endpoint = self._choose()
+        record = {
+            "t": due,
+            "document": document["name"],
+            "endpoint": endpoint,
+            "status": None,
+            "error": None,
+        }
+        try:
+            record["status"] = SENDERS[endpoint](
+                self._session(), self.url, document, self.timeout
+            )
+        except requests.RequestException as e:
+            record["error"] = type(e).__name__
+        record["latency"] = time.monotonic() - started - due
+        return record
+
+    def closed_loop(
+        self, concurrency: int, duration: float, max_requests: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """`concurrency` clients, each sending its next request as soon as the last one is answered."""
+        records: List[Dict[str, Any]] = []
+        in_flight = [0]
+        lock = threading.Lock()
+        started = time.monotonic()
+
+        def client():
+            while time.monotonic() - started < duration:
+                with lock:
+                    if (
+                        max_requests is not None
+                        and len(records) + in_flight[0] >= max_requests
+                    ):
+                        return
+                    in_flight[0] += 1
+                record = self.request(started, time.monotonic() - started)
+                with lock:
+                    in_flight[0] -= 1
+                    records.append(record)
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return records
+
+    def open_loop(
+        self,
+        rate: float,
+        duration: float,
+        max_requests: Optional[int] = None,
+        max_outstanding: int = 256,
+    ) -> List[Dict[str, Any]]:
+        """Requests sent on a fixed schedule of `rate` per second, however long earlier ones take."""
+        count = int(rate * duration)
+        if max_requests is not None:
+            count = min(count, max_requests)
+        started = time.monotonic()
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_outstanding) as pool:
+            for i in range(count):
+                due = i / rate
+                delay = started + due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(self.request, started, due))
+        return [f.result() for f in futures]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """The p-th percentile (0-100) of values, interpolating linearly between the closest ranks."""
+    if not values:
+        return None
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _is_ok(record):
+    return record["status"] is not None and record["status"] < 400
+
+
+def summarize(records: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Counts, rates and latency percentiles for a set of request records."""
+    ok = [r["latency"] for r in records if _is_ok(r)]
+    busy = sum(1 for r in records if r["status"] == 429)
+    failed = sum(1 for r in records if not _is_ok(r) and r["status"] != 429)
+    statuses: Dict[str, int] = {}
+    for r in records:
+        key = str(r["status"]) if r["status"] is not None else r["error"]
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(records),
+        "ok": len(ok),
+        "busy": busy,
+        "errors": failed,
+        "error_rate": failed / len(records) if records else None,
+        "busy_rate": busy / len(records) if records else None,
+        "throughput_rps": len(ok) / elapsed if elapsed > 0 else None,
+        "latency_seconds": {
+            "p50": percentile(ok, 50),
+            "p95": percentile(ok, 95),
+            "p99": percentile(ok, 99),
+            "mean": sum(ok) / len(ok) if ok else None,
+            "max": max(ok) if ok else None,
+        },
+        "statuses": statuses,
+    }
+
+
+def timeline(
+    records: List[Dict[str, Any]],
+    rss_samples: List[Dict[str, Any]],
+    bucket: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """Per-`bucket` seconds: requests completed, errors, p95 latency and peak server RSS."""
+    buckets: Dict[int, Dict[str, Any]] = {}
+
+    def at(t):
+        return buckets.setdefault(
+            int(t // bucket),
+            {
+                "t": int(t // bucket) * bucket,
+                "completed": 0,
+                "errors": 0,
+                "latencies": [],
+                "rss_mb": None,
+            },
+        )
+
+    for r in records:
+        entry = at(r["t"] + r["latency"])
+        entry["completed"] += 1
+        if _is_ok(r):
+            entry["latencies"].append(r["latency"])
+        elif r["status"] != 429:
+            entry["errors"] += 1
+    for sample in rss_samples:
+        entry = at(sample["t"])
+        entry["rss_mb"] = max(entry["rss_mb"] or 0.0, sample["rss_mb"])
+
+    result = []
+    for key in sorted(buckets):
+        entry = buckets[key]
+        latencies = entry.pop("latencies")
+        entry["p95_seconds"] = percentile(latencies, 95)
+        result.append(entry)
+    return result
+
+
+def _parse_weights(value: str, allowed) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in allowed:
+            raise argparse.ArgumentTypeError(
+                f"unknown name '{name}' (choose from {', '.join(sorted(allowed))})"
+            )
+        try:
+            weights[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight for '{name}' is not a number")
+    if not weights or sum(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError("weights must add up to more than zero")
+    return weights
+
+
+def load_documents(
+    directory: str, names: List[str], variants: int, scale: float
+) -> Dict[str, List[Dict[str, Any]]]:
+    """`variants` differently seeded copies of each named corpus document, read into memory."""
+    documents: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+    for seed in range(variants):
+        for case in generate_corpus(
+            os.path.join(directory, str(seed)), scale=scale, only=names, seed=seed
+        ):
+            with open(case.path, "rb") as fh:
+                documents[case.name].append(
+                    {
+                        "name": case.name,
+                        "filename": os.path.basename(case.path),
+                        "data": fh.read(),
+                    }
+                )
+    return documents
+
+
+def run_load(
+    generator: LoadGenerator, args, server_pid: Optional[int]
+) -> Dict[str, Any]:
+    """Warms the server up, then runs and summarizes the measured load."""
+
+    def drive(duration, max_requests=None):
+        if args.rate is not None:
+            return generator.open_loop(args.rate, duration, max_requests)
+        return generator.closed_loop(args.concurrency, duration, max_requests)
+
+    if args.warmup > 0:
+        drive(args.warmup)
+
+    started = time.monotonic()
+    sampler = (
+        RSSSampler(server_pid, args.sample_interval, started).start()
+        if server_pid is not None
+        else None
+    )
+    try:
+        records = drive(args.duration, args.requests)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    elapsed = time.monotonic() - started
+    rss_samples = sampler.samples if sampler is not None else []
+
+    return {
+        "elapsed_seconds": elapsed,
+        "summary": summarize(records, elapsed),
+        "by_document": {
+            name: summarize([r for r in records if r["document"] == name], elapsed)
+            for name in generator.mix
+        },
+        "by_endpoint": {
+            name: summarize([r for r in records if r["endpoint"] == name], elapsed)
+            for name in generator.endpoints
+        },
+        "peak_rss_mb": max((s["rss_mb"] for s in rss_samples), default=None),
+        "timeline": timeline(records, rss_samples),
+    }
+
+
+def _format(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_summary(runs: List[Dict[str, Any]], stream=sys.stderr) -> None:
+    header = f"{'workers':>7} {'threads':>7} {'requests':>8} {'req/s':>7} {'errors':>7} {'429s':>6} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'peak MB':>8}"
+    print(header, file=stream)
+    print("-" * len(header), file=stream)
+    for run in runs:
+        s = run["summary"]
+        latency = s["latency_seconds"]
+        print(
+            f"{_format(run['workers'], '>7')} {_format(run['threads'], '>7')} {s['requests']:>8} "
+            f"{_format(s['throughput_rps'], '>7.2f')} {_format(s['error_rate'], '>7.1%')} "
+            f"{_format(s['busy_rate'], '>6.1%')} {_format(latency['p50'], '>7.3f')} "
+            f"{_format(latency['p95'], '>7.3f')} {_format(latency['p99'], '>7.3f')} "
+            f"{_format(run['peak_rss_mb'], '>8.1f')}",
+            file=stream,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Load-test the markitdown web service.",
+    )
+    target = parser.add_argument_group("server")
+    target.add_argument(
+        "--url", help="test a running server, instead of starting app.py under gunicorn"
+    )
+    target.add_argument(
+        "--server-pid",
+        type=int,
+        help="with --url, sample the RSS of this process and its children",
+    )
+    target.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[2],
+        help="gunicorn worker counts to try (default: 2)",
+    )
+    target.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="gunicorn thread counts to try (default: 1)",
+    )
+    target.add_argument(
+        "--server-env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="environment for the server, e.g. MAX_CONCURRENT_CONVERSIONS=4. Repeatable",
+    )
+    target.add_argument(
+        "--cache", action="store_true", help="leave the server's result cache on"
+    )
+    target.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.5,
+        help="seconds the stub LLM takes per call (default: 0.5)",
+    )
+
+    load = parser.add_argument_group("load")
+    mode = load.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="closed loop: clients sending back to back (default: 8)",
+    )
+    mode.add_argument(
+        "--rate", type=float, help="open loop: requests per second, sent on schedule"
+    )
+    load.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="seconds of measured load per run (default: 30)",
+    )
+    load.add_argument(
+        "--requests", type=int, help="stop each run after this many requests"
+    )
+    load.add_argument(
+        "--warmup",
+        type=float,
+        default=5.0,
+        help="seconds of unmeasured load first (default: 5)",
+    )
+    load.add_argument(
+        "--mix",
+        type=lambda v: _parse_weights(v, GENERATORS),
+        default=_parse_weights(
+            "pdf=3,docx=2,xlsx-long=1,pptx=1,html=2,png=1", GENERATORS
+        ),
+        help="weighted documents to send, e.g. pdf=3,docx=1 (default: pdf=3,docx=2,xlsx-long=1,pptx=1,html=2,png=1)",
+    )
+    load.add_argument(
+        "--endpoints",
+        type=lambda v: _parse_weights(v, ENDPOINTS),
+        default={"convert": 1.0},
+        help="weighted endpoints: convert (POST /convert) and uploads (resumable upload session) (default: convert=1)",
+    )
+    load.add_argument(
+        "--scale",
+        type=float,
+        default=0.5,
+        help="document size, as for benchmarks.converters (default: 0.5)",
+    )
+    load.add_argument(
+        "--variants",
+        type=int,
+        default=16,
+        help="differently seeded copies of each document (default: 16)",
+    )
+    load.add_argument(
+        "--timeout",
+        type=float,
+        default=300.0,
+        help="per-request timeout in seconds (default: 300)",
+    )
+    load.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.5,
+        help="seconds between RSS samples (default: 0.5)",
+    )
+    load.add_argument(
+        "--seed", type=int, default=0, help="seed for choosing documents (default: 0)"
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the JSON results here (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    server_env = {}
+    for item in args.server_env:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--server-env expects NAME=VALUE, got '{item}'")
+        server_env[name] = value
+
+    corpus_dir = tempfile.mkdtemp(prefix="markitdown_load_corpus_")
+    runs = []
+    try:
+        documents = load_documents(
+            corpus_dir, list(args.mix), args.variants, args.scale
+        )
+
+        if args.url:
+            generator = LoadGenerator(
+                args.url.rstrip("/"),
+                documents,
+                args.mix,
+                args.endpoints,
+                args.timeout,
+                args.seed,
+            )
+            run = {"workers": None, "threads": None, "llm_calls": None}
+            run.update(run_load(generator, args, args.server_pid))
+            runs.append(run)
+        else:
+            for workers in args.workers:
+                for threads in args.threads:
+                    print(
+                        f"Running with {workers} worker(s) x {threads} thread(s)...",
+                        file=sys.stderr,
+                    )
+                    llm = StubLLMServer(args.llm_latency).start()
+                    env = {
+                        "RESULT_CACHE": "true" if args.cache else "false",
+                        "LLM_API_KEY": "stub",
+                        "LLM_BASE_URL": llm.base_url,
+                        "LLM_API_MODEL": "stub",
+                        **server_env,
+                    }
+                    server = ServerProcess(workers, threads, env)
+                    try:
+                        server.start()
+                        generator = LoadGenerator(
+                            server.url,
+                            documents,
+                            args.mix,
+                            args.endpoints,
+                            args.timeout,
+                            args.seed,
+                        )
+                        run = {"workers": workers, "threads": threads}
+                        run.update(run_load(generator, args, server.process.pid))
+                        run["llm_calls"] = llm.calls
+                        runs.append(run)
+                    finally:
+                        server.stop()
+                        llm.stop()
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    print_summary(runs)
+    report = {
+        "benchmark": "load",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {
+            "url": args.url,
+            "mode": "open" if args.rate is not None else "closed",
+            "rate": args.rate,
+            "concurrency": None if args.rate is not None else args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": args.mix,
+            "endpoints": args.endpoints,
+            "scale": args.scale,
+            "variants": args.variants,
+            "cache": args.cache,
+            "llm_latency": args.llm_latency,
+            "server_env": server_env,
+        },
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
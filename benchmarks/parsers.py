@@ -0,0 +1,182 @@
+"""Checks that the BeautifulSoup parsers markitdown supports produce the same Markdown.
+
+    python -m benchmarks.parsers
+    python -m benchmarks.parsers --seed 0 --seed 1 --seed 2 --only html tag-soup
+
+Every document in the corpus whose converter goes through BeautifulSoup is converted with lxml and
+with html.parser, and the outputs compared, as are a set of malformed HTML fragments. The corpus is
+well-formed, and must convert the same with both. The parsers repair tag soup differently, so some
+of the fragments don't: those are listed in KNOWN_DIFFERENCES. Every difference is printed as a
+unified diff; any other makes the run exit non-zero. Needs lxml.
+"""
+
+import argparse
+import difflib
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from markitdown import DocumentSource, MarkItDown
+from markitdown._markitdown import IS_LXML_CAPABLE
+
+from .corpus import GENERATORS, Case, generate_corpus
+
+PARSERS = ["lxml", "html.parser"]
+
+# Documents whose converters parse HTML: directly, or (for DOCX, XLSX and PPTX tables) via
+# HtmlConverter. RSS item content always goes through html.parser, so isn't compared
+HTML_CASES = ["html", "docx", "xlsx-long", "xlsx-wide", "pptx"]
+
+# Malformed HTML of the kind found in the wild, converted as .html documents
+TAG_SOUP: Dict[str, str] = {
+    "unclosed-li": "<ul><li>a<li>b<li>c</ul>",
+    "unclosed-p": "<p>one<p>two<table><tr><td>x</td></tr></table>",
+    "unclosed-td": "<table><tr><td>a<td>b<tr><td>c<td>d</table>",
+    "unclosed-dd": "<dl><dt>t<dd>d<dt>t2<dd>d2</dl>",
+    "misnested": "<p><b>bold <i>both</b> italic</i></p>",
+    "stray-close": "<div>text</p></span> more</div>",
+    "nested-a": "<a href='/x'>one <a href='/y'>two</a></a>",
+    "textarea": "<form><textarea><b>x</b></textarea></form>",
+    "select": "<select><option>a<option>b</select>",
+    "script": "<p>a</p><script>if (a < b) { x = '</p>'; }</script><p>b</p>",
+    "no-body": "<title>T</title>plain <b>text</b>",
+    "bare-text": "just text & < more",
+    "entities": "<p>&copy; &nbsp;&amp; &lt;tag&gt; &unknown;</p>",
+}
+
+# Fragments lxml repairs differently from html.parser. lxml follows browsers: it closes an open
+# <li>, <td> or <dd> when the next one starts, treats a <textarea>'s content as text, moves <title>
+# into <head>, doesn't nest links, and keeps the ";" of an unknown entity. html.parser leaves the
+# elements nested as written
+KNOWN_DIFFERENCES = {
+    "unclosed-li",
+    "unclosed-td",
+    "unclosed-dd",
+    "nested-a",
+    "textarea",
+    "no-body",
+    "entities",
+}
+
+
+def _diff(name: str, outputs: List[str], context_lines: int) -> Optional[List[str]]:
+    if outputs[0] == outputs[1]:
+        return None
+    return list(
+        difflib.unified_diff(
+            outputs[0].splitlines(),
+            outputs[1].splitlines(),
+            fromfile=f"{name} ({PARSERS[0]})",
+            tofile=f"{name} ({PARSERS[1]})",
+            n=context_lines,
+            lineterm="",
+        )
+    )
+
+
+def compare(case: Case, context_lines: int = 3) -> Optional[List[str]]:
+    """Converts `case` with each parser. None if the outputs match, else a diff between them."""
+    outputs = [
+        MarkItDown(html_parser=parser).convert(case.path).text_content
+        for parser in PARSERS
+    ]
+    return _diff(case.name, outputs, context_lines)
+
+
+def compare_fragment(name: str, context_lines: int = 3) -> Optional[List[str]]:
+    """Converts the TAG_SOUP fragment `name` with each parser, as compare() does."""
+    outputs = []
+    for parser in PARSERS:
+        with DocumentSource.from_bytes(
+            TAG_SOUP[name].encode("utf-8"), name=f"{name}.html"
+        ) as source:
+            outputs.append(
+                MarkItDown(html_parser=parser).convert_source(source).text_content
+            )
+    return _diff(name, outputs, context_lines)
+
+
+def _report(label: str, diff: Optional[List[str]], known: bool, max_lines: int) -> bool:
+    """Prints how `label` compared, and any diff. True if the difference is unexpected."""
+    if diff is None:
+        status = "same"
+    else:
+        status = "DIFFERENT (known)" if known else "DIFFERENT"
+    print(f"{label:<22} {status}", file=sys.stderr)
+    if diff is not None:
+        for line in diff[:max_lines]:
+            print(line)
+        if len(diff) > max_lines:
+            print(f"... {len(diff) - max_lines} more lines")
+    return diff is not None and not known
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.parsers",
+        description="Check that lxml and html.parser give the same Markdown.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplies the size of every document (default: 1)",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=HTML_CASES + ["tag-soup"],
+        help="check only these documents, or (with tag-soup) the malformed fragments",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        action="append",
+        dest="seeds",
+        help="seed for the generated corpus. Repeat to check several corpora (default: 0)",
+    )
+    parser.add_argument(
+        "--max-diff-lines",
+        type=int,
+        default=50,
+        help="lines of each diff to print (default: 50)",
+    )
+    args = parser.parse_args(argv)
+
+    if not IS_LXML_CAPABLE:
+        parser.error("lxml is not installed, so there is nothing to compare")
+    if args.scale <= 0:
+        parser.error("--scale must be positive")
+
+    only = args.only or HTML_CASES + ["tag-soup"]
+    documents = [name for name in only if name in GENERATORS]
+    failures = 0
+    for seed in (args.seeds or [0]) if documents else []:
+        corpus_dir = tempfile.mkdtemp(prefix="markitdown_parsers_")
+        try:
+            for case in generate_corpus(
+                corpus_dir, scale=args.scale, only=documents, seed=seed
+            ):
+                failures += _report(
+                    f"{case.name} seed {seed}",
+                    compare(case),
+                    known=False,
+                    max_lines=args.max_diff_lines,
+                )
+        finally:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+    if "tag-soup" in only:
+        for name in TAG_SOUP:
+            failures += _report(
+                f"tag-soup {name}",
+                compare_fragment(name),
+                known=name in KNOWN_DIFFERENCES,
+                max_lines=args.max_diff_lines,
+            )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
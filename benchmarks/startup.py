@@ -0,0 +1,196 @@
+"""Measures how long MarkItDown takes to import, and the CLI to convert a small file in-process.
+
+    python -m benchmarks.startup --runs 20 --budget 0.15 -o startup.json
+
+Every measurement is a fresh interpreter, timed from the outside. The time for a bare `python -c
+pass` is measured the same way and subtracted, so what's reported is markitdown's own share. Heavy
+dependencies (pandas, pdfminer, ...) should only be imported by the converter that needs them; any
+that are loaded by importing MarkItDown alone are listed, and fail the run. With `--budget`, the run
+also fails when the median import time exceeds it.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from .converters import environment
+
+# Modules that importing MarkItDown must not load
+HEAVY_MODULES = [
+    "azure",
+    "bs4",
+    "charset_normalizer",
+    "faster_whisper",
+    "mammoth",
+    "markdownify",
+    "numpy",
+    "olefile",
+    "pandas",
+    "pdfminer",
+    "pptx",
+    "pydub",
+    "requests",
+    "speech_recognition",
+    "youtube_transcript_api",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _environ() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    # Installed packages have their bytecode cached; without this, every run would recompile
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def time_command(command: List[str], runs: int) -> List[float]:
+    """Runs `command` in a fresh interpreter `runs` times (after one untimed run), returning the wall times."""
+    env = _environ()
+    samples = []
+    for i in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - started
+        if i > 0:
+            samples.append(elapsed)
+    return samples
+
+
+def heavy_imports() -> List[str]:
+    """The heavy modules that are loaded by importing MarkItDown alone."""
+    script = (
+        "import sys, json\nfrom markitdown import MarkItDown\n"
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        env=_environ(),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _summary(samples: List[float], baseline: float) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    return {
+        "samples_seconds": samples,
+        "median_seconds": median,
+        "min_seconds": min(samples),
+        "over_interpreter_seconds": median - baseline,
+    }
+
+
+def run(runs: int = 10) -> Dict[str, Any]:
+    """Times a bare interpreter, importing MarkItDown, and the CLI on a small text file."""
+    interpreter = time_command([sys.executable, "-c", "pass"], runs)
+    baseline = statistics.median(interpreter)
+    results = {
+        "interpreter": {
+            "samples_seconds": interpreter,
+            "median_seconds": baseline,
+            "min_seconds": min(interpreter),
+        },
+        "import": _summary(
+            time_command(
+                [sys.executable, "-c", "from markitdown import MarkItDown"], runs
+            ),
+            baseline,
+        ),
+    }
+
+    fd, path = tempfile.mkstemp(suffix=".txt", prefix="markitdown_startup_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write("Hello, world.\n")
+        results["cli"] = _summary(
+            time_command(
+                [sys.executable, "-m", "markitdown", "--no-daemon", path], runs
+            ),
+            baseline,
+        )
+    finally:
+        os.unlink(path)
+
+    results["heavy_imports"] = heavy_imports()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Measure markitdown's import time and CLI startup.",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="fresh interpreters per measurement (default: 10)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="fail when the median import time, over a bare interpreter, exceeds this many seconds",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the JSON results here (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    results = run(args.runs)
+    print(
+        f"interpreter {results['interpreter']['median_seconds'] * 1000:8.1f} ms\n"
+        f"import      {results['import']['over_interpreter_seconds'] * 1000:+8.1f} ms\n"
+        f"cli (.txt)  {results['cli']['over_interpreter_seconds'] * 1000:+8.1f} ms",
+        file=sys.stderr,
+    )
+
+    failures = []
+    if results["heavy_imports"]:
+        failures.append(
+            "importing MarkItDown loads: " + ", ".join(results["heavy_imports"])
+        )
+    if (
+        args.budget is not None
+        and results["import"]["over_interpreter_seconds"] > args.budget
+    ):
+        failures.append(
+            f"import takes {results['import']['over_interpreter_seconds']:.3f}s, over the {args.budget:.3f}s budget"
+        )
+    for failure in failures:
+        print(failure, file=sys.stderr)
+
+    report = {
+        "benchmark": "startup",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {"runs": args.runs, "budget_seconds": args.budget},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
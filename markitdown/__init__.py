@@ -2,10 +2,53 @@
 #
 # SPDX-License-Identifier: MIT
 
-from ._markitdown import MarkItDown, FileConversionException, UnsupportedFormatException
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._markitdown import (
+        MarkItDown,
+        DocumentSource,
+        MetricsRegistry,
+        DEFAULT_METRICS,
+        Tracer,
+        Span,
+        SpanExporter,
+        ConsoleSpanExporter,
+        FileSpanExporter,
+        FileConversionException,
+        UnsupportedFormatException,
+        ConversionTimeoutException,
+        ConversionMemoryException,
+        AudioTranscriber,
+        SpeechRecognitionTranscriber,
+        WhisperTranscriber,
+    )
 
 __all__ = [
     "MarkItDown",
+    "DocumentSource",
+    "MetricsRegistry",
+    "DEFAULT_METRICS",
+    "Tracer",
+    "Span",
+    "SpanExporter",
+    "ConsoleSpanExporter",
+    "FileSpanExporter",
     "FileConversionException",
     "UnsupportedFormatException",
+    "ConversionTimeoutException",
+    "ConversionMemoryException",
+    "AudioTranscriber",
+    "SpeechRecognitionTranscriber",
+    "WhisperTranscriber",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # _markitdown is only imported once something from it is used, so that the CLI can hand
+    # a conversion to a running daemon without importing it
+    if name in __all__:
+        from . import _markitdown
+
+        return getattr(_markitdown, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
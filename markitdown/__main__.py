@@ -2,11 +2,20 @@
 #
 # SPDX-License-Identifier: MIT
 import argparse
+import json
 import sys
 import shutil
 from textwrap import dedent
 from .__about__ import __version__
-from ._markitdown import MarkItDown, DocumentConverterResult
+from ._daemon import (
+    IS_DAEMON_CAPABLE,
+    DaemonConversionError,
+    DaemonTimeoutError,
+    convert_with_daemon,
+    default_socket_path,
+    serve,
+    stop_daemon,
+)
 
 
 def main():
@@ -40,6 +49,13 @@ def main():
                 OR
                 
                 markitdown example.pdf > example.md
+
+            DAEMON:
+
+                markitdown --daemon &
+                
+                Keeps a converter running in the background. While it is, markitdown
+                hands conversions to it rather than starting from scratch each time.
             """
         ).strip(),
     )
@@ -72,10 +88,113 @@ def main():
         help="Document Intelligence Endpoint. Required if using Document Intelligence.",
     )
 
+    parser.add_argument(
+        "-m",
+        "--main-content",
+        action="store_true",
+        help="For HTML input, keep only the main content of the page, dropping navigation, footers, sidebars and other boilerplate.",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="Stop the conversion if it takes longer than this many seconds. Runs the conversion in a child process.",
+    )
+
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        help="Stop the conversion if it needs more than this many megabytes of memory. Runs the conversion in a child process.",
+    )
+
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage timings of the conversion (as JSON) to stderr.",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the conversion with cProfile, and print the top functions by cumulative time to stderr.",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a conversion daemon in the foreground, instead of converting. Other invocations hand their conversions to it.",
+    )
+
+    parser.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop the running conversion daemon.",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Convert in this process, even if a conversion daemon is running.",
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="The conversion daemon's socket. Defaults to $MARKITDOWN_SOCKET, or a per-user socket in $XDG_RUNTIME_DIR or /tmp.",
+    )
+
     parser.add_argument("filename", nargs="?")
     args = parser.parse_args()
 
     which_exiftool = shutil.which("exiftool")
+    max_memory = args.max_memory * 1024 * 1024 if args.max_memory is not None else None
+    socket_path = args.socket or (default_socket_path() if IS_DAEMON_CAPABLE else None)
+
+    if args.daemon:
+        serve(socket_path, exiftool_path=which_exiftool)
+        return
+    if args.stop_daemon:
+        if not stop_daemon(socket_path):
+            sys.exit(f"markitdown: no daemon is listening on {socket_path}")
+        return
+
+    stdin = sys.stdin.buffer
+
+    # Document Intelligence is always used in-process
+    if not args.no_daemon and not args.use_docintel:
+        try:
+            result = convert_with_daemon(
+                socket_path,
+                args.filename,
+                stdin,
+                options={
+                    "main_content": args.main_content,
+                    "timeout": args.timeout,
+                    "max_memory": max_memory,
+                },
+                collect_timings=args.timings,
+                profile=args.profile,
+            )
+        except DaemonConversionError as e:
+            if e.exit_message or not e.traceback:
+                sys.exit(f"markitdown: {e}")
+            sys.stderr.write(e.traceback)
+            sys.exit(1)
+        except DaemonTimeoutError as e:
+            print(f"markitdown: {e}, so converting in-process", file=sys.stderr)
+            if e.stream is not None:
+                stdin = e.stream
+            result = None
+        if result is not None:
+            _handle_result(args, result)
+            return
+
+    from ._markitdown import (
+        MarkItDown,
+        ConversionTimeoutException,
+        ConversionMemoryException,
+    )
 
     if args.use_docintel:
         if args.endpoint is None:
@@ -85,20 +204,48 @@ def main():
         elif args.filename is None:
             raise ValueError("Filename is required when using Document Intelligence.")
         markitdown = MarkItDown(
-            exiftool_path=which_exiftool, docintel_endpoint=args.endpoint
+            exiftool_path=which_exiftool,
+            docintel_endpoint=args.endpoint,
+            main_content=args.main_content,
+            timeout=args.timeout,
+            max_memory=max_memory,
         )
     else:
-        markitdown = MarkItDown(exiftool_path=which_exiftool)
+        markitdown = MarkItDown(
+            exiftool_path=which_exiftool,
+            main_content=args.main_content,
+            timeout=args.timeout,
+            max_memory=max_memory,
+        )
 
-    if args.filename is None:
-        result = markitdown.convert_stream(sys.stdin.buffer)
-    else:
-        result = markitdown.convert(args.filename)
+    options = {}
+    if args.timings:
+        options["collect_timings"] = True
+    if args.profile:
+        options["profiler"] = "cprofile"
+
+    try:
+        if args.filename is None:
+            result = markitdown.convert_stream(stdin, **options)
+        else:
+            result = markitdown.convert(args.filename, **options)
+    except (ConversionTimeoutException, ConversionMemoryException) as e:
+        sys.exit(f"markitdown: {e}")
 
+    _handle_result(args, result)
+
+
+def _handle_result(args, result):
+    """Handle the output, then any timings or profile"""
     _handle_output(args, result)
 
+    if result.timings is not None:
+        print(json.dumps(result.timings, indent=2), file=sys.stderr)
+    if result.profile is not None:
+        print(result.profile, file=sys.stderr)
+
 
-def _handle_output(args, result: DocumentConverterResult):
+def _handle_output(args, result):
     """Handle output to stdout or file"""
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
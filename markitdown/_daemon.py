@@ -0,0 +1,392 @@
+# SPDX-FileCopyrightText: 2024-present Adam Fourney <adamfo@microsoft.com>
+#
+# SPDX-License-Identifier: MIT
+"""A background process that keeps a MarkItDown warm, so the CLI can skip Python's imports and the
+converters' own.
+
+The daemon listens on a Unix domain socket. For each conversion, the client sends a one-line JSON
+request, waits for a one-line JSON reply saying whether it was accepted, then sends the document
+(stdin's bytes, when it didn't name a file) and shuts down its side of the connection. The daemon
+replies with a line of JSON describing the result, followed by the Markdown itself. A daemon that
+doesn't answer in time is given up on, and the CLI converts in-process.
+
+This module is imported by every CLI invocation, so it must not import _markitdown at the top.
+"""
+
+import json
+import os
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from .__about__ import __version__
+
+IS_DAEMON_CAPABLE = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+# Requests larger than this are not from the CLI
+_MAX_REQUEST_LINE = 64 * 1024
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# How long to wait for the daemon to accept a connection and answer its request line
+_CONNECT_TIMEOUT = 5.0
+# How long to wait for a conversion without a timeout of its own, and the allowance over one that
+# has, for the daemon to stop it and reply
+DEFAULT_READ_TIMEOUT = 600.0
+_READ_TIMEOUT_MARGIN = 10.0
+# What's read from stdin is kept, in case the daemon times out. Beyond this, it is kept on disk
+_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+
+class DaemonResult:
+    """The result of a conversion done by the daemon. Has the same attributes as DocumentConverterResult."""
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        text_content: str = "",
+        timings: Optional[Dict[str, Any]] = None,
+        profile: Optional[str] = None,
+    ):
+        self.title = title
+        self.text_content = text_content
+        self.timings = timings
+        self.profile = profile
+
+
+class DaemonConversionError(Exception):
+    """A conversion failed in the daemon. `exit_message` is set where the CLI exits with a message rather than a traceback."""
+
+    def __init__(self, message: str, traceback: str = "", exit_message: bool = False):
+        super().__init__(message)
+        self.traceback = traceback
+        self.exit_message = exit_message
+
+
+class DaemonTimeoutError(Exception):
+    """The daemon didn't answer in time. Where the document was read from a stream, `stream` has
+    the whole of it, including what was already sent, so it can still be converted in-process.
+    """
+
+    def __init__(self, message: str, stream: Any = None):
+        super().__init__(message)
+        self.stream = stream
+
+
+def default_socket_path() -> str:
+    """$MARKITDOWN_SOCKET, or a socket named for this user in $XDG_RUNTIME_DIR, $TMPDIR or /tmp."""
+    path = os.environ.get("MARKITDOWN_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(directory, f"markitdown-{os.getuid()}.sock")
+
+
+def _send_line(fh: Any, message: Dict[str, Any]) -> None:
+    fh.write(json.dumps(message).encode("utf-8") + b"\n")
+    fh.flush()
+
+
+def _read_line(fh: Any) -> Optional[Dict[str, Any]]:
+    line = fh.readline(_MAX_REQUEST_LINE)
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    """Connects to the daemon. None if there isn't one, or if its socket belongs to someone else."""
+    if not IS_DAEMON_CAPABLE:
+        return None
+    try:
+        if os.stat(socket_path).st_uid != os.getuid():
+            return None
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except OSError:
+        return None
+    try:
+        client.settimeout(_CONNECT_TIMEOUT)
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def _request(socket_path: str, request: Dict[str, Any]) -> Optional[tuple]:
+    """Sends `request`, returning the connection and its reader when the daemon accepts it, else None."""
+    client = _connect(socket_path)
+    if client is None:
+        return None
+    request["version"] = __version__
+    try:
+        reader = client.makefile("rb")
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        reply = _read_line(reader)
+    except OSError:
+        client.close()
+        return None
+    if reply is None or not reply.get("accept"):
+        # e.g., a daemon left running across an upgrade
+        reader.close()
+        client.close()
+        return None
+    return client, reader
+
+
+def convert_with_daemon(
+    socket_path: str,
+    path: Optional[str],
+    stream: Any = None,
+    options: Optional[Dict[str, Any]] = None,
+    collect_timings: bool = False,
+    profile: bool = False,
+    read_timeout: Optional[float] = None,
+) -> Optional[DaemonResult]:
+    """Has the daemon convert `path` (a local path or URL), or when it is None, the bytes read from
+    `stream`. Returns None, having read nothing from `stream`, if no daemon will take the request;
+    raises DaemonConversionError if the conversion fails, and DaemonTimeoutError if the daemon goes
+    `read_timeout` seconds without answering. That defaults to the conversion's own timeout (plus a
+    margin) if it has one, else DEFAULT_READ_TIMEOUT."""
+    options = options or {}
+    if read_timeout is None:
+        if options.get("timeout") is None:
+            read_timeout = DEFAULT_READ_TIMEOUT
+        else:
+            read_timeout = options["timeout"] + _READ_TIMEOUT_MARGIN
+    if path is not None and "://" not in path:
+        # The daemon has a working directory of its own
+        path = os.path.abspath(path)
+    connection = _request(
+        socket_path,
+        {
+            "command": "convert",
+            "path": path,
+            "options": options,
+            "timings": collect_timings,
+            "profile": profile,
+        },
+    )
+    if connection is None:
+        return None
+    client, reader = connection
+    spool = None
+    try:
+        client.settimeout(read_timeout)
+        if path is None:
+            spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+        try:
+            if path is None:
+                while True:
+                    chunk = stream.read(_COPY_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    spool.write(chunk)
+                    client.sendall(chunk)
+            client.shutdown(socket.SHUT_WR)
+
+            reply = _read_line(reader)
+            if reply is None:
+                raise DaemonConversionError(
+                    "the markitdown daemon closed the connection"
+                )
+            if not reply.get("ok"):
+                raise DaemonConversionError(
+                    reply.get("error", ""),
+                    traceback=reply.get("traceback", ""),
+                    exit_message=reply.get("exit_message", False),
+                )
+            return DaemonResult(
+                title=reply.get("title"),
+                text_content=reader.read().decode("utf-8"),
+                timings=reply.get("timings"),
+                profile=reply.get("profile"),
+            )
+        except socket.timeout:
+            replay = None
+            if spool is not None:
+                # Whatever the daemon didn't get to
+                shutil.copyfileobj(stream, spool, _COPY_BUFFER_SIZE)
+                spool.seek(0)
+                # Now the caller's to close
+                replay, spool = spool, None
+            raise DaemonTimeoutError(
+                f"the markitdown daemon did not answer within {read_timeout} seconds",
+                stream=replay,
+            )
+    finally:
+        if spool is not None:
+            spool.close()
+        reader.close()
+        client.close()
+
+
+def stop_daemon(socket_path: str) -> bool:
+    """Asks the daemon to exit. False if there was none running."""
+    connection = _request(socket_path, {"command": "stop"})
+    if connection is None:
+        return False
+    client, reader = connection
+    reader.close()
+    client.close()
+    return True
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = _read_line(self.rfile)
+        if request is None:
+            return
+        if request.get("version") != __version__:
+            _send_line(
+                self.wfile,
+                {
+                    "accept": False,
+                    "reason": f"the daemon runs markitdown {__version__}",
+                },
+            )
+            return
+        _send_line(self.wfile, {"accept": True})
+
+        command = request.get("command")
+        if command == "stop":
+            self.server.shutdown()
+        elif command == "convert":
+            self._convert(request)
+
+    def _convert(self, request: Dict[str, Any]) -> None:
+        from ._markitdown import (
+            ConversionMemoryException,
+            ConversionTimeoutException,
+            FileConversionException,
+            UnsupportedFormatException,
+        )
+
+        kwargs = {}
+        if request.get("timings"):
+            kwargs["collect_timings"] = True
+        if request.get("profile"):
+            kwargs["profiler"] = "cprofile"
+        try:
+            markitdown = self.server.markitdown(request.get("options", {}))
+            if request.get("path") is None:
+                result = markitdown.convert_stream(self.rfile, **kwargs)
+            else:
+                result = markitdown.convert(request["path"], **kwargs)
+        except (
+            Exception,
+            FileConversionException,
+            UnsupportedFormatException,
+        ) as e:
+            import traceback
+
+            _send_line(
+                self.wfile,
+                {
+                    "ok": False,
+                    "error": str(e),
+                    "traceback": traceback.format_exc(),
+                    "exit_message": isinstance(
+                        e, (ConversionTimeoutException, ConversionMemoryException)
+                    ),
+                },
+            )
+            return
+
+        _send_line(
+            self.wfile,
+            {
+                "ok": True,
+                "title": result.title,
+                "timings": result.timings,
+                "profile": result.profile,
+            },
+        )
+        self.wfile.write(result.text_content.encode("utf-8"))
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves conversions on a Unix domain socket, with one MarkItDown per set of CLI options."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, exiftool_path: Optional[str] = None):
+        if not IS_DAEMON_CAPABLE:
+            raise ValueError(
+                "The markitdown daemon listens on a Unix domain socket, which is not supported on this platform."
+            )
+        self.socket_path = socket_path
+        self._exiftool_path = exiftool_path
+        self._instances: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(socket_path):
+            client = _connect(socket_path)
+            if client is not None:
+                client.close()
+                raise ValueError(
+                    f"A markitdown daemon is already listening on {socket_path}."
+                )
+            # Left behind by a daemon that didn't exit cleanly
+            os.unlink(socket_path)
+
+        # Only this user may connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _DaemonHandler)
+        finally:
+            os.umask(umask)
+
+    def markitdown(self, options: Dict[str, Any]) -> Any:
+        """The MarkItDown for these CLI options, created on first use."""
+        from ._markitdown import MarkItDown
+
+        key = (
+            bool(options.get("main_content", False)),
+            options.get("timeout"),
+            options.get("max_memory"),
+        )
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = MarkItDown(
+                    exiftool_path=self._exiftool_path,
+                    main_content=key[0],
+                    timeout=key[1],
+                    max_memory=key[2],
+                )
+            return self._instances[key]
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def serve(socket_path: str, exiftool_path: Optional[str] = None) -> None:
+    """Runs the daemon in the foreground until it is stopped, or sent SIGINT or SIGTERM."""
+    import signal
+
+    from ._markitdown import _preload_dependencies
+
+    server = DaemonServer(socket_path, exiftool_path=exiftool_path)
+
+    # What's imported now isn't imported during a conversion
+    _preload_dependencies()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"markitdown: listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,46 +1,76 @@
 # type: ignore
 import base64
 import binascii
+import contextvars
 import copy
+import email.utils
 import html
+import importlib
+import importlib.util
+import io
 import json
 import mimetypes
+import mmap
 import os
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import traceback
 import zipfile
-from xml.dom import minidom
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from xml.etree import ElementTree
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 from urllib.parse import parse_qs, quote, unquote, urlparse, urlunparse
 from warnings import warn, resetwarnings, catch_warnings
 
-import mammoth
-import markdownify
-import olefile
-import pandas as pd
-import pdfminer
-import pdfminer.high_level
-import pptx
-
-# File-format detection
-import puremagic
-import requests
-from bs4 import BeautifulSoup
-from charset_normalizer import from_path
-
-# Azure imports
-from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import (
-    AnalyzeDocumentRequest,
-    AnalyzeResult,
-    DocumentAnalysisFeature,
-)
-from azure.identity import DefaultAzureCredential
+
+class _LazyModule:
+    """Stands in for a module, importing it on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        try:
+            return getattr(self._module, attr)
+        except AttributeError:
+            # A submodule that its package doesn't import itself, e.g. pdfminer.high_level
+            try:
+                return importlib.import_module(f"{self._name}.{attr}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{self._name}.{attr}":
+                    raise
+                raise AttributeError(
+                    f"module '{self._name}' has no attribute '{attr}'"
+                ) from None
+
+
+# Dependencies are imported when a converter first needs them, rather than with
+# markitdown, so that importing it (and starting the CLI) stays fast
+bs4 = _LazyModule("bs4")
+charset_normalizer = _LazyModule("charset_normalizer")
+cProfile = _LazyModule("cProfile")
+mammoth = _LazyModule("mammoth")
+markdownify = _LazyModule("markdownify")
+multiprocessing = _LazyModule("multiprocessing")
+np = _LazyModule("numpy")
+olefile = _LazyModule("olefile")
+pd = _LazyModule("pandas")
+pdfminer = _LazyModule("pdfminer")
+pptx = _LazyModule("pptx")
+pstats = _LazyModule("pstats")
+puremagic = _LazyModule("puremagic")  # File-format detection
+requests = _LazyModule("requests")
 
 # TODO: currently, there is a bug in the document intelligence SDK with importing the "ContentFormat" enum.
 # This constant is a temporary fix until the bug is resolved.
@@ -49,132 +79,489 @@ CONTENT_FORMAT = "markdown"
 # Override mimetype for csv to fix issue on windows
 mimetypes.add_type("text/csv", ".csv")
 
-# Optional Transcription support
-IS_AUDIO_TRANSCRIPTION_CAPABLE = False
-try:
-    # Using warnings' catch_warnings to catch
-    # pydub's warning of ffmpeg or avconv missing
-    with catch_warnings(record=True) as w:
-        import pydub
+# Optional Transcription support. Importing pydub and speech_recognition is slow, so
+# whether they are usable is only worked out when an audio converter first asks
+pydub = _LazyModule("pydub")
+sr = _LazyModule("speech_recognition")
+_audio_transcription_capable: Optional[bool] = None
+
+
+def _is_audio_transcription_capable() -> bool:
+    global _audio_transcription_capable
+    if _audio_transcription_capable is None:
+        capable = False
+        try:
+            # Using warnings' catch_warnings to catch
+            # pydub's warning of ffmpeg or avconv missing
+            with catch_warnings(record=True) as w:
+                import pydub.silence  # noqa: F401
+
+                if w:
+                    raise ModuleNotFoundError
+            import speech_recognition  # noqa: F401
+
+            capable = True
+        except ModuleNotFoundError:
+            pass
+        finally:
+            resetwarnings()
+        _audio_transcription_capable = capable
+    return _audio_transcription_capable
+
+
+def __getattr__(name: str) -> Any:
+    # Capability flags that are only worked out on first use
+    if name == "IS_AUDIO_TRANSCRIPTION_CAPABLE":
+        return _is_audio_transcription_capable()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
-        if w:
-            raise ModuleNotFoundError
-    import speech_recognition as sr
 
-    IS_AUDIO_TRANSCRIPTION_CAPABLE = True
+# Optional offline speech-to-text support
+IS_OFFLINE_TRANSCRIPTION_CAPABLE = (
+    importlib.util.find_spec("faster_whisper") is not None
+)
+faster_whisper = _LazyModule("faster_whisper")
+
+# Optional YouTube transcription support
+IS_YOUTUBE_TRANSCRIPT_CAPABLE = (
+    importlib.util.find_spec("youtube_transcript_api") is not None
+)
+youtube_transcript_api = _LazyModule("youtube_transcript_api")
+
+# Submodules that converters use, but that their packages don't import themselves
+_PRELOADED_SUBMODULES = ["pdfminer.high_level", "pptx.enum.shapes"]
+
+
+def _preload_dependencies() -> None:
+    """
+    Imports every installed dependency now, rather than when a converter first needs it.
+    For long-running processes, e.g. the CLI's daemon, so that no conversion waits on an import.
+    """
+    _is_audio_transcription_capable()
+    names = [m._name for m in globals().values() if isinstance(m, _LazyModule)]
+    for name in names + _PRELOADED_SUBMODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            # Optional, and not installed
+            pass
+
+
+# Optional fast HTML parsing support. BeautifulSoup's lxml backend is considerably
+# faster than the pure-Python "html.parser", so prefer it whenever it is installed.
+IS_LXML_CAPABLE = False
+try:
+    import lxml  # noqa: F401
+
+    IS_LXML_CAPABLE = True
 except ModuleNotFoundError:
     pass
-finally:
-    resetwarnings()
 
-# Optional YouTube transcription support
+DEFAULT_HTML_PARSER = "lxml" if IS_LXML_CAPABLE else "html.parser"
+
+# Optional sandboxed conversion support. Conversions are run in a forked child process
+# (POSIX only), whose memory can be capped with resource.RLIMIT_AS
+IS_SANDBOX_CAPABLE = hasattr(os, "fork")
+IS_MEMORY_LIMIT_CAPABLE = False
 try:
-    from youtube_transcript_api import YouTubeTranscriptApi
+    import resource
 
-    IS_YOUTUBE_TRANSCRIPT_CAPABLE = True
+    IS_MEMORY_LIMIT_CAPABLE = True
 except ModuleNotFoundError:
     pass
 
 
-class _CustomMarkdownify(markdownify.MarkdownConverter):
-    """
-    A custom version of markdownify's MarkdownConverter. Changes include:
+_custom_markdownify_class = None
+
+
+def _custom_markdownify(**options: Any) -> Any:
+    """A _CustomMarkdownify converter. The class is defined on first use, as it subclasses
+    markdownify's MarkdownConverter, which is only imported then."""
+    global _custom_markdownify_class
+    if _custom_markdownify_class is None:
+
+        class _CustomMarkdownify(markdownify.MarkdownConverter):
+            """
+            A custom version of markdownify's MarkdownConverter. Changes include:
+
+            - Altering the default heading style to use '#', '##', etc.
+            - Removing javascript hyperlinks.
+            - Truncating images with large data:uri sources.
+            - Ensuring URIs are properly escaped, and do not conflict with Markdown syntax
+            """
+
+            def __init__(self, **options: Any):
+                options["heading_style"] = options.get("heading_style", markdownify.ATX)
+                # Explicitly cast options to the expected type if necessary
+                super().__init__(**options)
+
+            def convert_hn(
+                self,
+                n: int,
+                el: Any,
+                text: str,
+                convert_as_inline: Optional[bool] = False,
+                **kwargs,
+            ) -> str:
+                """Same as usual, but be sure to start with a new line"""
+                if not convert_as_inline:
+                    if not re.search(r"^\n", text):
+                        return "\n" + super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
+
+                return super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
+
+            def convert_a(
+                self,
+                el: Any,
+                text: str,
+                convert_as_inline: Optional[bool] = False,
+                **kwargs,
+            ):
+                """Same as usual converter, but removes Javascript links and escapes URIs."""
+                prefix, suffix, text = markdownify.chomp(text)  # type: ignore
+                if not text:
+                    return ""
+                href = el.get("href")
+                title = el.get("title")
+
+                # Escape URIs and skip non-http or file schemes
+                if href:
+                    try:
+                        parsed_url = urlparse(href)  # type: ignore
+                        if parsed_url.scheme and parsed_url.scheme.lower() not in ["http", "https", "file"]:  # type: ignore
+                            return "%s%s%s" % (prefix, text, suffix)
+                        href = urlunparse(parsed_url._replace(path=quote(unquote(parsed_url.path))))  # type: ignore
+                    except ValueError:  # It's not clear if this ever gets thrown
+                        return "%s%s%s" % (prefix, text, suffix)
+
+                # For the replacement see #29: text nodes underscores are escaped
+                if (
+                    self.options["autolinks"]
+                    and text.replace(r"\_", "_") == href
+                    and not title
+                    and not self.options["default_title"]
+                ):
+                    # Shortcut syntax
+                    return "<%s>" % href
+                if self.options["default_title"] and not title:
+                    title = href
+                title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+                return (
+                    "%s[%s](%s%s)%s" % (prefix, text, href, title_part, suffix)
+                    if href
+                    else text
+                )
 
-    - Altering the default heading style to use '#', '##', etc.
-    - Removing javascript hyperlinks.
-    - Truncating images with large data:uri sources.
-    - Ensuring URIs are properly escaped, and do not conflict with Markdown syntax
-    """
+            def convert_img(
+                self,
+                el: Any,
+                text: str,
+                convert_as_inline: Optional[bool] = False,
+                **kwargs,
+            ) -> str:
+                """Same as usual converter, but removes data URIs"""
 
-    def __init__(self, **options: Any):
-        options["heading_style"] = options.get("heading_style", markdownify.ATX)
-        # Explicitly cast options to the expected type if necessary
-        super().__init__(**options)
+                alt = el.attrs.get("alt", None) or ""
+                src = el.attrs.get("src", None) or ""
+                title = el.attrs.get("title", None) or ""
+                title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
+                if (
+                    convert_as_inline
+                    and el.parent.name not in self.options["keep_inline_images_in"]
+                ):
+                    return alt
 
-    def convert_hn(
-        self,
-        n: int,
-        el: Any,
-        text: str,
-        convert_as_inline: Optional[bool] = False,
-        **kwargs,
-    ) -> str:
-        """Same as usual, but be sure to start with a new line"""
-        if not convert_as_inline:
-            if not re.search(r"^\n", text):
-                return "\n" + super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
+                # Remove dataURIs
+                if src.startswith("data:"):
+                    src = src.split(",")[0] + "..."
+
+                return "![%s](%s%s)" % (alt, src, title_part)
+
+            def convert_soup(self, soup: Any) -> str:
+                return super().convert_soup(soup)  # type: ignore
+
+        _custom_markdownify_class = _CustomMarkdownify
+    return _custom_markdownify_class(**options)
+
+
+class DocumentConverterResult:
+    """The result of converting a document to text."""
+
+    def __init__(self, title: Union[str, None] = None, text_content: str = ""):
+        self.title: Union[str, None] = title
+        self.text_content: str = text_content
+
+        # Filled in by MarkItDown when asked to (collect_timings=True, profiler="cprofile")
+        self.timings: Union[Dict[str, Any], None] = None
+        self.profile: Union[str, None] = None
 
-        return super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
 
-    def convert_a(
-        self, el: Any, text: str, convert_as_inline: Optional[bool] = False, **kwargs
+class DocumentSource(os.PathLike):
+    """
+    The bytes of a document being converted, wherever they happen to live: in memory, or in a
+    file on disk. Streams and downloads are held in memory up to a size threshold, and only
+    spill to a temporary file (written once, with large buffered writes) beyond it.
+
+    Converters can read a source directly (via open(), read_bytes() or getbuffer()) without
+    it ever touching disk. Because a DocumentSource is also os.PathLike, converters that need
+    a real file (e.g., to hand to exiftool) can still use it as a path; an in-memory document
+    is then written to a temporary file on first use. Call close() (or use a `with` block) to
+    remove any temporary file.
+    """
+
+    DEFAULT_MEMORY_THRESHOLD = 16 * 1024 * 1024
+    _COPY_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        data: Optional[bytes] = None,
+        name: Optional[str] = None,
+        owns_path: bool = False,
     ):
-        """Same as usual converter, but removes Javascript links and escapes URIs."""
-        prefix, suffix, text = markdownify.chomp(text)  # type: ignore
-        if not text:
-            return ""
-        href = el.get("href")
-        title = el.get("title")
+        if (path is None) == (data is None):
+            raise ValueError("A DocumentSource needs exactly one of 'path' or 'data'.")
+        self.path: Union[str, None] = path
+        self.name: str = name or (os.path.basename(path) if path else "")
+        self._data: Union[bytes, None] = data
+        self._owns_path = owns_path
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> "DocumentSource":
+        """A document in an existing file, which is left in place."""
+        return cls(path=os.fspath(path))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: Optional[str] = None) -> "DocumentSource":
+        """A document already in memory."""
+        return cls(data=bytes(data), name=name)
+
+    @classmethod
+    def from_stream(
+        cls, stream: Any, threshold: int = DEFAULT_MEMORY_THRESHOLD
+    ) -> "DocumentSource":
+        """A document read from a (binary or text) file-like object."""
+
+        def _chunks():
+            while True:
+                chunk = stream.read(cls._COPY_BUFFER_SIZE)
+                if not chunk:
+                    return
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+        return cls.from_chunks(_chunks(), threshold)
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Any, threshold: int = DEFAULT_MEMORY_THRESHOLD
+    ) -> "DocumentSource":
+        """A document delivered as an iterable of byte strings (e.g., a streamed download)."""
+        buffer = bytearray()
+        chunks = iter(chunks)
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) > threshold:
+                break
+        else:
+            return cls(data=bytes(buffer))
 
-        # Escape URIs and skip non-http or file schemes
-        if href:
+        # Too big to keep in memory: spill what we have, then stream the rest to disk
+        handle, temp_path = tempfile.mkstemp()
+        try:
+            with os.fdopen(handle, "wb", buffering=cls._COPY_BUFFER_SIZE) as fh:
+                fh.write(buffer)
+                del buffer
+                for chunk in chunks:
+                    fh.write(chunk)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return cls(path=temp_path, name="", owns_path=True)
+
+    @property
+    def in_memory(self) -> bool:
+        return self._data is not None
+
+    @property
+    def owns_path(self) -> bool:
+        """Whether the file at path is a temporary one of MarkItDown's, rather than the caller's."""
+        return self._owns_path
+
+    @property
+    def size(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        return os.path.getsize(self.path)
+
+    def open(self) -> Any:
+        """A new binary file-like object over the document, positioned at the start."""
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self.path, "rb")
+
+    def read_bytes(self) -> bytes:
+        """The whole document, as bytes."""
+        if self._data is not None:
+            return self._data
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    def getbuffer(self) -> Any:
+        """A read-only buffer over the document. Files are memory-mapped rather than read."""
+        if self._data is not None or self.size == 0:
+            return memoryview(self._data or b"")
+        with open(self.path, "rb") as fh:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def local_path(self) -> str:
+        """A path to the document on disk, writing it to a temporary file first if necessary."""
+        if self.path is None:
+            suffix = os.path.splitext(self.name)[1]
+            handle, temp_path = tempfile.mkstemp(suffix=suffix)
+            with os.fdopen(handle, "wb") as fh:
+                fh.write(self._data)
+            self.path = temp_path
+            self._owns_path = True
+        return self.path
+
+    def __fspath__(self) -> str:
+        return self.local_path
+
+    def __str__(self) -> str:
+        return self.path or self.name or "<in-memory document>"
+
+    def __repr__(self) -> str:
+        return f"DocumentSource({str(self)!r}, size={self.size})"
+
+    def close(self) -> None:
+        """Remove any temporary file backing this source."""
+        if self._owns_path and self.path is not None:
             try:
-                parsed_url = urlparse(href)  # type: ignore
-                if parsed_url.scheme and parsed_url.scheme.lower() not in ["http", "https", "file"]:  # type: ignore
-                    return "%s%s%s" % (prefix, text, suffix)
-                href = urlunparse(parsed_url._replace(path=quote(unquote(parsed_url.path))))  # type: ignore
-            except ValueError:  # It's not clear if this ever gets thrown
-                return "%s%s%s" % (prefix, text, suffix)
-
-        # For the replacement see #29: text nodes underscores are escaped
-        if (
-            self.options["autolinks"]
-            and text.replace(r"\_", "_") == href
-            and not title
-            and not self.options["default_title"]
-        ):
-            # Shortcut syntax
-            return "<%s>" % href
-        if self.options["default_title"] and not title:
-            title = href
-        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
-        return (
-            "%s[%s](%s%s)%s" % (prefix, text, href, title_part, suffix)
-            if href
-            else text
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+            self._owns_path = False
+
+    def __enter__(self) -> "DocumentSource":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class _DocumentContext:
+    """
+    Per-conversion cache of a document, shared by all converters attempted during a single
+    call to MarkItDown.convert. Everything is computed lazily, so a converter that bails
+    early (e.g., on the extension) costs nothing, and a document is read, decoded and
+    parsed at most once no matter how many converters or extensions are tried.
+
+    The parsed soup is shared as well. Converters may prune it (e.g., drop script and style
+    blocks), but should not otherwise alter it in ways a later fallback converter can't tolerate.
+    """
+
+    def __init__(
+        self,
+        source: DocumentSource,
+        extensions: Optional[List[str]] = None,
+        timings: Optional[Dict[str, Any]] = None,
+    ):
+        self.source: DocumentSource = source
+        self.extensions: List[str] = extensions or []
+        self.timings: Union[Dict[str, Any], None] = (
+            timings  # Where to add read/parse times, if anywhere
         )
+        self._bytes: Union[bytes, None] = None
+        self._text: Union[str, None] = None
+        self._best_text: Union[str, None] = None
+        self._soups: Dict[str, Any] = {}
+
+    def read_bytes(self) -> bytes:
+        """The raw contents of the document."""
+        if self._bytes is None:
+            started = time.perf_counter()
+            self._bytes = self.source.read_bytes()
+            self._add_time("read_seconds", started)
+        return self._bytes
+
+    def read_text(self) -> str:
+        """The document decoded as UTF-8, with universal newlines (same as open(..., "rt"))."""
+        if self._text is None:
+            text = self.read_bytes().decode("utf-8")
+            self._text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return self._text
+
+    def read_best_text(self) -> str:
+        """The document decoded with whatever encoding charset_normalizer detects."""
+        if self._best_text is None:
+            self._best_text = str(
+                charset_normalizer.from_bytes(self.read_bytes()).best()
+            )
+        return self._best_text
 
-    def convert_img(
-        self, el: Any, text: str, convert_as_inline: Optional[bool] = False, **kwargs
-    ) -> str:
-        """Same as usual converter, but removes data URIs"""
+    def soup(self, html_parser: Optional[str] = None) -> Any:
+        """The document parsed as HTML with the given BeautifulSoup backend."""
+        html_parser = html_parser or DEFAULT_HTML_PARSER
+        if html_parser not in self._soups:
+            text = self.read_text()
+            started = time.perf_counter()
+            self._soups[html_parser] = bs4.BeautifulSoup(text, html_parser)
+            self._add_time("parse_seconds", started)
+        return self._soups[html_parser]
 
-        alt = el.attrs.get("alt", None) or ""
-        src = el.attrs.get("src", None) or ""
-        title = el.attrs.get("title", None) or ""
-        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
-        if (
-            convert_as_inline
-            and el.parent.name not in self.options["keep_inline_images_in"]
-        ):
-            return alt
+    def _add_time(self, stage: str, started: float) -> None:
+        if self.timings is not None:
+            elapsed = time.perf_counter() - started
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
 
-        # Remove dataURIs
-        if src.startswith("data:"):
-            src = src.split(",")[0] + "..."
 
-        return "![%s](%s%s)" % (alt, src, title_part)
+class _TimedProxy:
+    """
+    Wraps an object (e.g., an LLM client), timing every call made through it, however deeply
+    nested (client.chat.completions.create(...) counts as one call). Plain values, such as
+    strings and numbers, are passed through unwrapped.
+    """
 
-    def convert_soup(self, soup: Any) -> str:
-        return super().convert_soup(soup)  # type: ignore
+    def __init__(self, target: Any, calls: List[float]):
+        self._target = target
+        self._calls = calls
 
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if value is None or isinstance(value, (str, bytes, int, float, bool)):
+            return value
+        return _TimedProxy(value, self._calls)
 
-class DocumentConverterResult:
-    """The result of converting a document to text."""
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self._target(*args, **kwargs)
+        finally:
+            self._calls.append(time.perf_counter() - started)
 
-    def __init__(self, title: Union[str, None] = None, text_content: str = ""):
-        self.title: Union[str, None] = title
-        self.text_content: str = text_content
+
+def _open_source(local_path: Union[str, DocumentSource]) -> Any:
+    """Open a converter's input for binary reading, whether it is a DocumentSource or a path."""
+    if isinstance(local_path, DocumentSource):
+        return local_path.open()
+    return open(local_path, "rb")
+
+
+def _get_document_context(
+    local_path: Union[str, DocumentSource], kwargs: Dict[str, Any]
+) -> _DocumentContext:
+    """Return the shared context for local_path, or a fresh one if the caller didn't supply it."""
+    context = kwargs.get("_document_context")
+    if context is not None and (
+        context.source is local_path
+        or (isinstance(local_path, str) and context.source.path == local_path)
+    ):
+        return context
+    if isinstance(local_path, DocumentSource):
+        return _DocumentContext(local_path)
+    return _DocumentContext(DocumentSource.from_path(local_path))
 
 
 class DocumentConverter:
@@ -186,6 +573,51 @@ class DocumentConverter:
         raise NotImplementedError()
 
 
+class _LazyConverter(DocumentConverter):
+    """
+    Registers a converter by the file extensions it handles (None for any), and only
+    instantiates it when a document with one of them first comes along.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], DocumentConverter],
+        extensions: Optional[List[str]] = None,
+    ):
+        self.factory = factory
+        self.extensions = extensions
+        self._converter: Optional[DocumentConverter] = None
+        self._lock = threading.Lock()
+
+    def resolve(self, extension: Optional[str]) -> Optional[DocumentConverter]:
+        """The converter, if it handles the extension, else None."""
+        if (
+            self.extensions is not None
+            and (extension or "").lower() not in self.extensions
+        ):
+            return None
+        if self._converter is None:
+            with self._lock:
+                if self._converter is None:
+                    self._converter = self.factory()
+        return self._converter
+
+    def convert(
+        self, local_path: str, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        converter = self.resolve(kwargs.get("file_extension"))
+        return None if converter is None else converter.convert(local_path, **kwargs)
+
+
+def _resolve_converter(
+    converter: DocumentConverter, extension: Optional[str]
+) -> Optional[DocumentConverter]:
+    """The registered converter to try for an extension, or None if it can be skipped."""
+    if isinstance(converter, _LazyConverter):
+        return converter.resolve(extension)
+    return converter
+
+
 class PlainTextConverter(DocumentConverter):
     """Anything with content type text/plain"""
 
@@ -206,13 +638,158 @@ class PlainTextConverter(DocumentConverter):
         ):
             return None
 
-        text_content = str(from_path(local_path).best())
+        text_content = _get_document_context(local_path, kwargs).read_best_text()
         return DocumentConverterResult(
             title=None,
             text_content=text_content,
         )
 
 
+# Text that Markdownify would render verbatim: words separated by single spaces, with no
+# markup, entities, or characters that are (or, in some markdownify versions, may be) escaped
+_TRIVIAL_TEXT = re.compile(
+    r"(?:[^\W_]|[,.;:'\"?%$@/()])+(?: (?:[^\W_]|[,.;:'\"?%$@/()])+)*"
+)
+
+# Heuristics for main-content extraction (a simplified take on Mozilla's Readability)
+_UNLIKELY_TAGS = ["nav", "footer", "aside", "form", "iframe", "noscript", "dialog"]
+_UNLIKELY_CANDIDATES = re.compile(
+    r"banner|breadcrumb|combx|comment|community|consent|cookie|disqus|extra|footer|gdpr|"
+    r"header|legends|menu|modal|nav|newsletter|pager|popup|promo|related|remark|share|"
+    r"shoutbox|sidebar|skyscraper|social|sponsor|subscribe|tweet|twitter|widget",
+    re.IGNORECASE,
+)
+_LIKELY_CANDIDATES = re.compile(
+    r"and|article|body|column|content|entry|main|post|shadow|story|text", re.IGNORECASE
+)
+_CONTENT_TAGS = ["p", "pre", "td", "blockquote", "li", "h2", "h3"]
+_TAG_SCORES = {
+    "article": 10,
+    "main": 10,
+    "section": 5,
+    "div": 5,
+    "pre": 3,
+    "td": 3,
+    "blockquote": 3,
+    "form": -3,
+    "ol": -3,
+    "ul": -3,
+    "li": -3,
+    "th": -5,
+    "h1": -5,
+    "h2": -5,
+    "h3": -5,
+    "h4": -5,
+    "h5": -5,
+    "h6": -5,
+}
+
+
+def _link_density(el: Any) -> float:
+    """Fraction of an element's text that sits inside hyperlinks."""
+    text_length = len(el.get_text(strip=True))
+    if text_length == 0:
+        return 0.0
+    link_length = sum(len(a.get_text(strip=True)) for a in el.find_all("a"))
+    return link_length / text_length
+
+
+def _class_weight(el: Any) -> int:
+    """Bonus or penalty based on an element's class and id attributes."""
+    weight = 0
+    for attr in [" ".join(el.get("class") or []), el.get("id") or ""]:
+        if not attr:
+            continue
+        if _UNLIKELY_CANDIDATES.search(attr):
+            weight -= 25
+        if _LIKELY_CANDIDATES.search(attr):
+            weight += 25
+    return weight
+
+
+def _prune_to_main_content(root: Any) -> None:
+    """
+    Prune root in place down to its main content, dropping navigation, footers, banners,
+    sidebars and other boilerplate. Blocks are scored by the amount of text they contain
+    and penalized by their link density; the best block, plus any siblings that score
+    comparably, is kept. If nothing looks like content, only the boilerplate is removed.
+    """
+
+    # Drop elements that are almost never part of the main content
+    for el in root.find_all(_UNLIKELY_TAGS):
+        el.decompose()
+    for el in root.find_all(True):
+        if el.decomposed or el.name in ["html", "body", "article", "main"]:
+            continue
+        attrs = " ".join(el.get("class") or []) + " " + (el.get("id") or "")
+        if (
+            el.get("role") in ["navigation", "banner", "complementary", "contentinfo"]
+            or el.get("aria-hidden") == "true"
+            or (
+                _UNLIKELY_CANDIDATES.search(attrs)
+                and not _LIKELY_CANDIDATES.search(attrs)
+            )
+        ):
+            el.decompose()
+
+    # Score paragraphs, and credit their parents and grandparents
+    scores: Dict[int, float] = {}
+    candidates: Dict[int, Any] = {}
+    for el in root.find_all(_CONTENT_TAGS):
+        text = el.get_text(" ", strip=True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        for level, ancestor in enumerate([el.parent, el.parent and el.parent.parent]):
+            if ancestor is None or ancestor.name is None:
+                break
+            if id(ancestor) not in candidates:
+                candidates[id(ancestor)] = ancestor
+                scores[id(ancestor)] = _TAG_SCORES.get(
+                    ancestor.name, 0
+                ) + _class_weight(ancestor)
+            scores[id(ancestor)] += score if level == 0 else score / 2
+
+    if not candidates:
+        return
+
+    for key, el in candidates.items():
+        scores[key] *= 1 - _link_density(el)
+    best_key = max(scores, key=lambda key: scores[key])
+    best = candidates[best_key]
+    if best is root:
+        return
+
+    # Keep siblings that score comparably, or that are low-link paragraphs of real prose
+    threshold = max(10, scores[best_key] * 0.2)
+    keep = [best]
+    if best.parent is not None:
+        for sibling in best.parent.find_all(True, recursive=False):
+            if sibling is best:
+                continue
+            if scores.get(id(sibling), 0) >= threshold:
+                keep.append(sibling)
+            elif sibling.name == "p":
+                text = sibling.get_text(" ", strip=True)
+                if len(text) > 80 and _link_density(sibling) < 0.25:
+                    keep.append(sibling)
+
+    # Detach everything that isn't on the path from root down to the kept blocks
+    keep_ids = {id(el) for el in keep}
+    node = best.parent
+    while node is not None:
+        for child in list(node.children):
+            if id(child) in keep_ids:
+                continue
+            if child.name is None and node is best.parent:
+                continue  # Loose text between kept siblings
+            child.extract()
+        if node is root:
+            break
+        keep_ids = {id(node)}
+        node = node.parent
+
+
 class HtmlConverter(DocumentConverter):
     """Anything with content type text/html"""
 
@@ -224,17 +801,21 @@ class HtmlConverter(DocumentConverter):
         if extension.lower() not in [".html", ".htm"]:
             return None
 
-        result = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            result = self._convert(fh.read())
-
-        return result
+        soup = _get_document_context(local_path, kwargs).soup(kwargs.get("html_parser"))
+        return self._convert_soup(soup, main_content=kwargs.get("main_content", False))
 
-    def _convert(self, html_content: str) -> Union[None, DocumentConverterResult]:
+    def _convert(
+        self, html_content: str, html_parser: Optional[str] = None
+    ) -> Union[None, DocumentConverterResult]:
         """Helper function that converts an HTML string."""
+        return self._convert_soup(
+            bs4.BeautifulSoup(html_content, html_parser or DEFAULT_HTML_PARSER)
+        )
 
-        # Parse the string
-        soup = BeautifulSoup(html_content, "html.parser")
+    def _convert_soup(
+        self, soup: Any, main_content: bool = False
+    ) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts a parsed HTML document."""
 
         # Remove javascript and style blocks
         for script in soup(["script", "style"]):
@@ -242,11 +823,13 @@ class HtmlConverter(DocumentConverter):
 
         # Print only the main content
         body_elm = soup.find("body")
+        if main_content:
+            _prune_to_main_content(body_elm or soup)
         webpage_text = ""
         if body_elm:
-            webpage_text = _CustomMarkdownify().convert_soup(body_elm)
+            webpage_text = _custom_markdownify().convert_soup(body_elm)
         else:
-            webpage_text = _CustomMarkdownify().convert_soup(soup)
+            webpage_text = _custom_markdownify().convert_soup(soup)
 
         assert isinstance(webpage_text, str)
 
@@ -260,7 +843,20 @@ class HtmlConverter(DocumentConverter):
 
 
 class RSSConverter(DocumentConverter):
-    """Convert RSS / Atom type to markdown"""
+    """
+    Convert RSS / Atom type to markdown.
+
+    The feed is read incrementally with a pull parser, and each <item> / <entry> is rendered
+    and discarded as soon as it has been parsed, so memory use does not grow with the size of
+    the feed. The following keyword arguments are supported:
+
+    - rss_max_entries: stop after rendering this many entries (the rest of the file is not read)
+    - rss_since: a datetime; entries published or updated before it are skipped (entries
+      without a parsable date are kept)
+    """
+
+    # Namespace of the <content:encoded> extension element
+    _CONTENT_NAMESPACE = "http://purl.org/rss/1.0/modules/content/"
 
     def convert(
         self, local_path: str, **kwargs
@@ -269,131 +865,191 @@ class RSSConverter(DocumentConverter):
         extension = kwargs.get("file_extension", "")
         if extension.lower() not in [".xml", ".rss", ".atom"]:
             return None
+
+        max_entries = kwargs.get("rss_max_entries")
+        since = kwargs.get("rss_since")
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
         try:
-            doc = minidom.parse(local_path)
+            with _open_source(local_path) as fh:
+                return self._parse_feed(fh, max_entries, since)
         except BaseException as _:
             return None
-        result = None
-        if doc.getElementsByTagName("rss"):
-            # A RSS feed must have a root element of <rss>
-            result = self._parse_rss_type(doc)
-        elif doc.getElementsByTagName("feed"):
-            root = doc.getElementsByTagName("feed")[0]
-            if root.getElementsByTagName("entry"):
-                # An Atom feed must have a root element of <feed> and at least one <entry>
-                result = self._parse_atom_type(doc)
-            else:
-                return None
-        else:
-            # not rss or atom
-            return None
 
-        return result
-
-    def _parse_atom_type(
-        self, doc: minidom.Document
+    def _parse_feed(
+        self,
+        fh: Any,
+        max_entries: Union[int, None],
+        since: Union[datetime, None],
     ) -> Union[None, DocumentConverterResult]:
-        """Parse the type of an Atom feed.
+        """Stream the feed, rendering entries as they complete.
 
-        Returns None if the feed type is not recognized or something goes wrong.
+        Returns None if the document is not an RSS or Atom feed.
         """
-        try:
-            root = doc.getElementsByTagName("feed")[0]
-            title = self._get_data_by_tag_name(root, "title")
-            subtitle = self._get_data_by_tag_name(root, "subtitle")
-            entries = root.getElementsByTagName("entry")
-            md_text = f"# {title}\n"
-            if subtitle:
-                md_text += f"{subtitle}\n"
-            for entry in entries:
-                entry_title = self._get_data_by_tag_name(entry, "title")
-                entry_summary = self._get_data_by_tag_name(entry, "summary")
-                entry_updated = self._get_data_by_tag_name(entry, "updated")
-                entry_content = self._get_data_by_tag_name(entry, "content")
-
-                if entry_title:
-                    md_text += f"\n## {entry_title}\n"
-                if entry_updated:
-                    md_text += f"Updated on: {entry_updated}\n"
-                if entry_summary:
-                    md_text += self._parse_content(entry_summary)
-                if entry_content:
-                    md_text += self._parse_content(entry_content)
-
-            return DocumentConverterResult(
-                title=title,
-                text_content=md_text,
-            )
-        except BaseException as _:
+        feed_type = None  # "rss" or "atom"
+        feed_fields: Dict[str, str] = {}
+        header_done = False
+        has_channel = False
+        md_parts: List[str] = []
+        num_entries = 0
+        stack: List[Any] = []
+
+        for event, elem in ElementTree.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                if feed_type is None:
+                    # A RSS feed must have a root element of <rss>, and an Atom feed of <feed>
+                    root_name = self._local_name(elem.tag)
+                    if root_name == "rss":
+                        feed_type = "rss"
+                    elif root_name == "feed":
+                        feed_type = "atom"
+                    else:
+                        return None
+                elif not header_done and self._local_name(elem.tag) in [
+                    "item",
+                    "entry",
+                ]:
+                    md_parts.append(self._render_header(feed_type, feed_fields))
+                    header_done = True
+                stack.append(elem)
+                continue
+
+            # event == "end"
+            stack.pop()
+            name = self._local_name(elem.tag)
+            parent = stack[-1] if stack else None
+            parent_name = None if parent is None else self._local_name(parent.tag)
+
+            if name in ["item", "entry"]:
+                if (feed_type == "rss" and name == "item") or (
+                    feed_type == "atom" and name == "entry"
+                ):
+                    # Checked before rendering too, for rss_max_entries=0
+                    if max_entries is not None and num_entries >= max_entries:
+                        break
+                    entry = self._collect_fields(elem)
+                    if since is None or self._is_since(feed_type, entry, since):
+                        md_parts.append(self._render_entry(feed_type, entry))
+                        num_entries += 1
+
+                # Free the entry, so memory doesn't grow with the feed
+                elem.clear()
+                if parent is not None:
+                    parent.remove(elem)
+
+                if max_entries is not None and num_entries >= max_entries:
+                    break
+            elif not header_done and parent_name in ["channel", "feed"]:
+                if name not in feed_fields:
+                    feed_fields[name] = self._get_text(elem)
+            elif name == "channel" and parent_name == "rss":
+                has_channel = True
+
+        if feed_type == "rss" and not has_channel and not header_done:
+            # A RSS feed must have a <channel>
+            return None
+        if feed_type == "atom" and not header_done:
+            # An Atom feed must have at least one <entry>
             return None
+        if not header_done:
+            md_parts.append(self._render_header(feed_type, feed_fields))
 
-    def _parse_rss_type(
-        self, doc: minidom.Document
-    ) -> Union[None, DocumentConverterResult]:
-        """Parse the type of an RSS feed.
+        return DocumentConverterResult(
+            title=feed_fields.get("title"),
+            text_content="".join(md_parts),
+        )
 
-        Returns None if the feed type is not recognized or something goes wrong.
-        """
+    def _render_header(self, feed_type: str, fields: Dict[str, str]) -> str:
+        """Render the feed title and description / subtitle."""
+        md_text = ""
+        title = fields.get("title")
+        if feed_type == "atom":
+            md_text += f"# {title}\n"
+            if fields.get("subtitle"):
+                md_text += f"{fields['subtitle']}\n"
+        else:
+            if title:
+                md_text += f"# {title}\n"
+            if fields.get("description"):
+                md_text += f"{fields['description']}\n"
+        return md_text
+
+    def _render_entry(self, feed_type: str, entry: Dict[str, str]) -> str:
+        """Render a single <item> or <entry>."""
+        md_text = ""
+        if entry.get("title"):
+            md_text += f"\n## {entry['title']}\n"
+        if feed_type == "atom":
+            if entry.get("updated"):
+                md_text += f"Updated on: {entry['updated']}\n"
+            body_fields = ["summary", "content"]
+        else:
+            if entry.get("pubDate"):
+                md_text += f"Published on: {entry['pubDate']}\n"
+            body_fields = ["description", "content:encoded"]
+        for field in body_fields:
+            if entry.get(field):
+                md_text += self._parse_content(entry[field])
+        return md_text
+
+    def _collect_fields(self, elem: Any) -> Dict[str, str]:
+        """Gather the text of the first occurrence of each direct child of an entry."""
+        fields: Dict[str, str] = {}
+        for child in elem:
+            name = self._local_name(child.tag)
+            if name == "encoded" and child.tag.startswith(
+                "{" + self._CONTENT_NAMESPACE
+            ):
+                name = "content:encoded"
+            if name not in fields:
+                fields[name] = self._get_text(child)
+        return fields
+
+    def _is_since(self, feed_type: str, entry: Dict[str, str], since: datetime) -> bool:
+        """True if the entry is dated on or after `since`, or has no parsable date."""
+        if feed_type == "atom":
+            date_str = entry.get("updated") or entry.get("published")
+        else:
+            date_str = entry.get("pubDate")
+        if not date_str:
+            return True
         try:
-            root = doc.getElementsByTagName("rss")[0]
-            channel = root.getElementsByTagName("channel")
-            if not channel:
-                return None
-            channel = channel[0]
-            channel_title = self._get_data_by_tag_name(channel, "title")
-            channel_description = self._get_data_by_tag_name(channel, "description")
-            items = channel.getElementsByTagName("item")
-            if channel_title:
-                md_text = f"# {channel_title}\n"
-            if channel_description:
-                md_text += f"{channel_description}\n"
-            if not items:
-                items = []
-            for item in items:
-                title = self._get_data_by_tag_name(item, "title")
-                description = self._get_data_by_tag_name(item, "description")
-                pubDate = self._get_data_by_tag_name(item, "pubDate")
-                content = self._get_data_by_tag_name(item, "content:encoded")
-
-                if title:
-                    md_text += f"\n## {title}\n"
-                if pubDate:
-                    md_text += f"Published on: {pubDate}\n"
-                if description:
-                    md_text += self._parse_content(description)
-                if content:
-                    md_text += self._parse_content(content)
-
-            return DocumentConverterResult(
-                title=channel_title,
-                text_content=md_text,
-            )
-        except BaseException as _:
-            print(traceback.format_exc())
-            return None
+            if feed_type == "atom":
+                date = datetime.fromisoformat(date_str.strip())
+            else:
+                date = email.utils.parsedate_to_datetime(date_str.strip())
+        except (TypeError, ValueError):
+            return True
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date >= since
 
     def _parse_content(self, content: str) -> str:
         """Parse the content of an RSS feed item"""
+        # Plain prose that Markdownify would pass through untouched doesn't need a parse
+        if _TRIVIAL_TEXT.fullmatch(content) and not re.search(r"\d[.)]", content):
+            return content
         try:
             # using bs4 because many RSS feeds have HTML-styled content
-            soup = BeautifulSoup(content, "html.parser")
-            return _CustomMarkdownify().convert_soup(soup)
+            soup = bs4.BeautifulSoup(content, "html.parser")
+            return _custom_markdownify().convert_soup(soup)
         except BaseException as _:
             return content
 
-    def _get_data_by_tag_name(
-        self, element: minidom.Element, tag_name: str
-    ) -> Union[str, None]:
-        """Get data from first child element with the given tag name.
-        Returns None when no such element is found.
+    def _get_text(self, elem: Any) -> Union[str, None]:
+        """Get the text of an element, including any inline markup (e.g., Atom xhtml content).
+        Returns None when the element is empty.
         """
-        nodes = element.getElementsByTagName(tag_name)
-        if not nodes:
-            return None
-        fc = nodes[0].firstChild
-        if fc:
-            return fc.data
-        return None
+        if len(elem) == 0:
+            return elem.text
+        return (elem.text or "") + "".join(
+            ElementTree.tostring(child, encoding="unicode") for child in elem
+        )
+
+    def _local_name(self, tag: str) -> str:
+        """Strip any {namespace} prefix from an ElementTree tag."""
+        return tag.rsplit("}", 1)[-1]
 
 
 class WikipediaConverter(DocumentConverter):
@@ -411,9 +1067,7 @@ class WikipediaConverter(DocumentConverter):
             return None
 
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = _get_document_context(local_path, kwargs).soup(kwargs.get("html_parser"))
 
         # Remove javascript and style blocks
         for script in soup(["script", "style"]):
@@ -433,11 +1087,11 @@ class WikipediaConverter(DocumentConverter):
                 assert isinstance(main_title, str)
 
             # Convert the page
-            webpage_text = f"# {main_title}\n\n" + _CustomMarkdownify().convert_soup(
+            webpage_text = f"# {main_title}\n\n" + _custom_markdownify().convert_soup(
                 body_elm
             )
         else:
-            webpage_text = _CustomMarkdownify().convert_soup(soup)
+            webpage_text = _custom_markdownify().convert_soup(soup)
 
         return DocumentConverterResult(
             title=main_title,
@@ -460,9 +1114,7 @@ class YouTubeConverter(DocumentConverter):
             return None
 
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = _get_document_context(local_path, kwargs).soup(kwargs.get("html_parser"))
 
         # Read the meta tags
         assert soup.title is not None and soup.title.string is not None
@@ -531,7 +1183,7 @@ class YouTubeConverter(DocumentConverter):
                         "youtube_transcript_languages", ("en",)
                     )
                     # Must be a single transcript.
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=youtube_transcript_languages)  # type: ignore
+                    transcript = youtube_transcript_api.YouTubeTranscriptApi.get_transcript(video_id, languages=youtube_transcript_languages)  # type: ignore
                     transcript_text = " ".join([part["text"] for part in transcript])  # type: ignore
                     # Alternative formatting:
                     # formatter = TextFormatter()
@@ -577,8 +1229,173 @@ class YouTubeConverter(DocumentConverter):
         return None
 
 
+class _JsonStream:
+    """
+    A minimal pull reader over a JSON document in a binary file. Values are consumed one at a
+    time, so callers can walk a large document and skip the parts they don't need (without
+    decoding, or even holding, them in memory), while only materializing the parts they do.
+    """
+
+    _CHUNK_SIZE = 1 << 18
+    _WHITESPACE = re.compile(rb"[ \t\r\n]*")
+    _STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+    _SCALAR = re.compile(rb"[^,:\]}\s]*")
+
+    def __init__(self, fh: Any):
+        self._fh = fh
+        self._buf = b""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Read another chunk into the buffer, discarding what was already consumed."""
+        chunk = self._fh.read(self._CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> bytes:
+        """Skip whitespace, and return the next byte without consuming it (b"" at the end)."""
+        while True:
+            self._pos = self._WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos : self._pos + 1]
+            if not self._fill():
+                return b""
+
+    def expect(self, char: bytes) -> None:
+        """Consume the next non-whitespace byte, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self._pos += 1
+
+    def iter_object(self):
+        """Yield the keys of an object. The caller must consume each key's value."""
+        self.expect(b"{")
+        if self.peek() == b"}":
+            self._pos += 1
+            return
+        while True:
+            key, _ = self.read_string()
+            self.expect(b":")
+            yield key
+            if self.peek() == b"}":
+                self._pos += 1
+                return
+            self.expect(b",")
+
+    def iter_array(self):
+        """Yield once per array item. The caller must consume each item."""
+        self.expect(b"[")
+        if self.peek() == b"]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == b"]":
+                self._pos += 1
+                return
+            self.expect(b",")
+
+    def read_string(self, limit: Optional[int] = None) -> Tuple[str, bool]:
+        """
+        Read a string, keeping at most `limit` bytes of its (encoded) contents.
+        Returns the decoded text, and whether it was truncated.
+        """
+        self.expect(b'"')
+        raw = bytearray()
+        truncated = False
+        while True:
+            # Find the closing quote, or the end of the buffer (stopping before any lone
+            # backslash, whose escape sequence continues in the next chunk). Strings without
+            # escapes, such as base64 payloads, take the fast path.
+            quote = self._buf.find(b'"', self._pos)
+            if self._buf.find(b"\\", self._pos, None if quote < 0 else quote) < 0:
+                end = len(self._buf) if quote < 0 else quote
+            else:
+                end = self._STRING_BODY.match(self._buf, self._pos).end()
+            piece = self._buf[self._pos : end]
+            if limit is None or len(raw) + len(piece) <= limit:
+                raw += piece
+            else:
+                if len(raw) < limit:
+                    raw += piece[: limit - len(raw)]
+                truncated = True
+            self._pos = end
+            if (
+                self._pos < len(self._buf)
+                and self._buf[self._pos : self._pos + 1] == b'"'
+            ):
+                self._pos += 1
+                break
+            if not self._fill():
+                raise ValueError("Unterminated string")
+
+        # Truncation may have split an escape sequence or a multibyte character
+        for trim in range(0, 8 if truncated else 1):
+            try:
+                return (
+                    json.loads(b'"' + bytes(raw[: len(raw) - trim]) + b'"'),
+                    truncated,
+                )
+            except ValueError:
+                if trim >= len(raw):
+                    break
+        raise ValueError("Invalid string")
+
+    def read_value(self) -> Any:
+        """Read and fully materialize the next value."""
+        char = self.peek()
+        if char == b'"':
+            return self.read_string()[0]
+        if char == b"{":
+            return {key: self.read_value() for key in self.iter_object()}
+        if char == b"[":
+            return [self.read_value() for _ in self.iter_array()]
+        return json.loads(self._read_scalar())
+
+    def skip_value(self) -> None:
+        """Consume the next value without materializing it."""
+        char = self.peek()
+        if char == b'"':
+            self.read_string(limit=0)
+        elif char == b"{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == b"[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self._read_scalar()
+
+    def _read_scalar(self) -> bytes:
+        """Read a number, true, false or null."""
+        self.peek()
+        while True:
+            end = self._SCALAR.match(self._buf, self._pos).end()
+            if end < len(self._buf) or not self._fill():
+                break
+        scalar = self._buf[self._pos : end]
+        if not scalar:
+            raise ValueError(f"Unexpected {self.peek()!r}")
+        self._pos = end
+        return scalar
+
+
 class IpynbConverter(DocumentConverter):
-    """Converts Jupyter Notebook (.ipynb) files to Markdown."""
+    """
+    Converts Jupyter Notebook (.ipynb) files to Markdown.
+
+    The notebook is streamed rather than loaded, and cell outputs (which may hold megabytes of
+    base64-encoded plots or dataframes) are skipped without being decoded, so memory use is
+    proportional to the Markdown produced rather than to the size of the file. Supports:
+
+    - ipynb_include_outputs: if True, render the text outputs of code cells (default: False)
+    - ipynb_max_output_bytes: the most output text to include per cell (default: 4096); longer
+      outputs are truncated, and binary outputs (e.g., images) are replaced by a placeholder
+    """
 
     def convert(
         self, local_path: str, **kwargs: Any
@@ -590,42 +1407,50 @@ class IpynbConverter(DocumentConverter):
 
         # Parse and convert the notebook
         result = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            notebook_content = json.load(fh)
-            result = self._convert(notebook_content)
+        with _open_source(local_path) as fh:
+            result = self._convert(
+                fh,
+                include_outputs=kwargs.get("ipynb_include_outputs", False),
+                max_output_bytes=kwargs.get("ipynb_max_output_bytes", 4096),
+            )
 
         return result
 
-    def _convert(self, notebook_content: dict) -> Union[None, DocumentConverterResult]:
-        """Helper function that converts notebook JSON content to Markdown."""
+    def _convert(
+        self, fh: Any, include_outputs: bool = False, max_output_bytes: int = 4096
+    ) -> Union[None, DocumentConverterResult]:
+        """Helper function that streams notebook JSON content to Markdown."""
         try:
+            stream = _JsonStream(fh)
             md_output = []
             title = None
-
-            for cell in notebook_content.get("cells", []):
-                cell_type = cell.get("cell_type", "")
-                source_lines = cell.get("source", [])
-
-                if cell_type == "markdown":
-                    md_output.append("".join(source_lines))
-
-                    # Extract the first # heading as title if not already found
-                    if title is None:
-                        for line in source_lines:
-                            if line.startswith("# "):
-                                title = line.lstrip("# ").strip()
-                                break
-
-                elif cell_type == "code":
-                    # Code cells are wrapped in Markdown code blocks
-                    md_output.append(f"```python\n{''.join(source_lines)}\n```")
-                elif cell_type == "raw":
-                    md_output.append(f"```\n{''.join(source_lines)}\n```")
+            metadata_title = None
+            has_metadata_title = False
+
+            for key in stream.iter_object():
+                if key == "cells":
+                    for _ in stream.iter_array():
+                        cell_md, cell_title = self._convert_cell(
+                            stream, include_outputs, max_output_bytes
+                        )
+                        md_output.extend(cell_md)
+                        if title is None:
+                            title = cell_title
+                elif key == "metadata":
+                    for metadata_key in stream.iter_object():
+                        if metadata_key == "title":
+                            metadata_title = stream.read_value()
+                            has_metadata_title = True
+                        else:
+                            stream.skip_value()
+                else:
+                    stream.skip_value()
 
             md_text = "\n\n".join(md_output)
 
             # Check for title in notebook metadata
-            title = notebook_content.get("metadata", {}).get("title", title)
+            if has_metadata_title:
+                title = metadata_title
 
             return DocumentConverterResult(
                 title=title,
@@ -637,6 +1462,108 @@ class IpynbConverter(DocumentConverter):
                 f"Error converting .ipynb file: {str(e)}"
             ) from e
 
+    def _convert_cell(
+        self, stream: _JsonStream, include_outputs: bool, max_output_bytes: int
+    ) -> Tuple[List[str], Union[str, None]]:
+        """Convert the next cell in the stream. Returns its Markdown blocks, and its first # heading."""
+        cell_type = ""
+        source_lines: List[str] = []
+        outputs = ""
+
+        for key in stream.iter_object():
+            if key == "cell_type":
+                cell_type = stream.read_value()
+            elif key == "source":
+                source = stream.read_value()
+                source_lines = (
+                    source.splitlines(keepends=True)
+                    if isinstance(source, str)
+                    else source
+                )
+            elif key == "outputs" and include_outputs:
+                outputs = self._read_outputs(stream, max_output_bytes)
+            else:
+                stream.skip_value()
+
+        md_output = []
+        title = None
+        if cell_type == "markdown":
+            md_output.append("".join(source_lines))
+
+            # Extract the first # heading as title
+            for line in source_lines:
+                if line.startswith("# "):
+                    title = line.lstrip("# ").strip()
+                    break
+
+        elif cell_type == "code":
+            # Code cells are wrapped in Markdown code blocks
+            md_output.append(f"```python\n{''.join(source_lines)}\n```")
+            if outputs:
+                md_output.append(f"```\n{outputs}\n```")
+        elif cell_type == "raw":
+            md_output.append(f"```\n{''.join(source_lines)}\n```")
+
+        return md_output, title
+
+    def _read_outputs(self, stream: _JsonStream, max_output_bytes: int) -> str:
+        """Read a cell's outputs, keeping at most max_output_bytes of text in total."""
+        parts: List[str] = []
+        budget = max_output_bytes
+        truncated = False
+
+        for _ in stream.iter_array():
+            error = {}
+            for key in stream.iter_object():
+                if key == "text":
+                    # Stream output (stdout / stderr)
+                    text, was_truncated = self._read_text(stream, budget)
+                elif key == "data":
+                    # Rich output: keep text/plain, and note anything else
+                    text, was_truncated = "", False
+                    omitted = []
+                    for mime_type in stream.iter_object():
+                        if mime_type == "text/plain":
+                            text, was_truncated = self._read_text(stream, budget)
+                        else:
+                            omitted.append(mime_type)
+                            stream.skip_value()
+                    if not text and omitted:
+                        text = f"[{', '.join(omitted)} output omitted]"
+                elif key in ["ename", "evalue"]:
+                    # Errors: keep the exception, but not the (ANSI-colored) traceback
+                    error[key], was_truncated = self._read_text(stream, budget)
+                    text = ""
+                else:
+                    stream.skip_value()
+                    continue
+
+                if text:
+                    parts.append(text.rstrip("\n"))
+                    budget = max(0, budget - len(text.encode("utf-8")))
+                truncated = truncated or was_truncated
+
+            if error:
+                parts.append(f"{error.get('ename', '')}: {error.get('evalue', '')}")
+
+        output = "\n".join(parts)
+        if truncated:
+            output += "\n... [output truncated]"
+        return output
+
+    def _read_text(self, stream: _JsonStream, budget: int) -> Tuple[str, bool]:
+        """Read a string, or a list of strings (as used for multiline text), up to budget bytes."""
+        if stream.peek() != b"[":
+            return stream.read_string(limit=budget)
+        text = ""
+        truncated = False
+        for _ in stream.iter_array():
+            remaining = max(0, budget - len(text.encode("utf-8")))
+            piece, piece_truncated = stream.read_string(limit=remaining)
+            text += piece
+            truncated = truncated or piece_truncated
+        return text, truncated
+
 
 class BingSerpConverter(DocumentConverter):
     """
@@ -658,9 +1585,7 @@ class BingSerpConverter(DocumentConverter):
         query = parsed_params.get("q", [""])[0]
 
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = _get_document_context(local_path, kwargs).soup(kwargs.get("html_parser"))
 
         # Clean up some formatting
         for tptt in soup.find_all(class_="tptt"):
@@ -670,7 +1595,7 @@ class BingSerpConverter(DocumentConverter):
             slug.extract()
 
         # Parse the algorithmic results
-        _markdownify = _CustomMarkdownify()
+        _markdownify = _custom_markdownify()
         results = list()
         for result in soup.find_all(class_="b_algo"):
             # Rewrite redirect urls
@@ -720,10 +1645,11 @@ class PdfConverter(DocumentConverter):
         if extension.lower() != ".pdf":
             return None
 
-        return DocumentConverterResult(
-            title=None,
-            text_content=pdfminer.high_level.extract_text(local_path),
-        )
+        with _open_source(local_path) as fh, _trace_span("pdfminer.extract_text"):
+            return DocumentConverterResult(
+                title=None,
+                text_content=pdfminer.high_level.extract_text(fh),
+            )
 
 
 class DocxConverter(HtmlConverter):
@@ -738,12 +1664,12 @@ class DocxConverter(HtmlConverter):
             return None
 
         result = None
-        with open(local_path, "rb") as docx_file:
+        with _open_source(local_path) as docx_file:
             style_map = kwargs.get("style_map", None)
 
             result = mammoth.convert_to_html(docx_file, style_map=style_map)
             html_content = result.value
-            result = self._convert(html_content)
+            result = self._convert(html_content, kwargs.get("html_parser"))
 
         return result
 
@@ -759,12 +1685,18 @@ class XlsxConverter(HtmlConverter):
         if extension.lower() != ".xlsx":
             return None
 
-        sheets = pd.read_excel(local_path, sheet_name=None, engine="openpyxl")
+        with _open_source(local_path) as fh:
+            sheets = pd.read_excel(fh, sheet_name=None, engine="openpyxl")
         md_content = ""
         for s in sheets:
             md_content += f"## {s}\n"
             html_content = sheets[s].to_html(index=False)
-            md_content += self._convert(html_content).text_content.strip() + "\n\n"
+            md_content += (
+                self._convert(
+                    html_content, kwargs.get("html_parser")
+                ).text_content.strip()
+                + "\n\n"
+            )
 
         return DocumentConverterResult(
             title=None,
@@ -783,12 +1715,18 @@ class XlsConverter(HtmlConverter):
         if extension.lower() != ".xls":
             return None
 
-        sheets = pd.read_excel(local_path, sheet_name=None, engine="xlrd")
+        with _open_source(local_path) as fh:
+            sheets = pd.read_excel(fh, sheet_name=None, engine="xlrd")
         md_content = ""
         for s in sheets:
             md_content += f"## {s}\n"
             html_content = sheets[s].to_html(index=False)
-            md_content += self._convert(html_content).text_content.strip() + "\n\n"
+            md_content += (
+                self._convert(
+                    html_content, kwargs.get("html_parser")
+                ).text_content.strip()
+                + "\n\n"
+            )
 
         return DocumentConverterResult(
             title=None,
@@ -825,9 +1763,10 @@ class PptxConverter(HtmlConverter):
             }
         ]
 
-        response = llm_client.chat.completions.create(
-            model=llm_model, messages=messages
-        )
+        with _trace_span("llm.describe_image", model=llm_model):
+            response = llm_client.chat.completions.create(
+                model=llm_model, messages=messages
+            )
         return response.choices[0].message.content
 
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
@@ -838,7 +1777,8 @@ class PptxConverter(HtmlConverter):
 
         md_content = ""
 
-        presentation = pptx.Presentation(local_path)
+        with _open_source(local_path) as fh:
+            presentation = pptx.Presentation(fh)
         slide_num = 0
         for slide in presentation.slides:
             slide_num += 1
@@ -902,7 +1842,11 @@ class PptxConverter(HtmlConverter):
                         first_row = False
                     html_table += "</table></body></html>"
                     md_content += (
-                        "\n" + self._convert(html_table).text_content.strip() + "\n"
+                        "\n"
+                        + self._convert(
+                            html_table, kwargs.get("html_parser")
+                        ).text_content.strip()
+                        + "\n"
                     )
 
                 # Charts
@@ -967,6 +1911,116 @@ class PptxConverter(HtmlConverter):
         return md + "\n".join([header, separator] + markdown_table[1:])
 
 
+def _recognize_google(audio: Any) -> str:
+    """Transcribe speech_recognition AudioData with Google's free web speech API."""
+    return sr.Recognizer().recognize_google(audio)
+
+
+class AudioTranscriber:
+    """Abstract superclass of the speech-to-text backends used by WavConverter and Mp3Converter."""
+
+    def transcribe(self, segments: List[Any]) -> List[str]:
+        """
+        Transcribe a batch of mono pydub AudioSegments, returning one string per segment
+        (an empty string where no speech was recognized).
+        """
+        raise NotImplementedError()
+
+
+class SpeechRecognitionTranscriber(AudioTranscriber):
+    """
+    Transcribes segments with a speech_recognition recognizer, several at a time on a thread
+    pool. This is the default backend, and by default uses Google's free web speech API.
+
+    Args:
+        - recognize: a callable taking a speech_recognition AudioData and returning its text
+        - max_workers: how many segments to transcribe at once
+    """
+
+    def __init__(self, recognize: Optional[Any] = None, max_workers: int = 4):
+        self.recognize = recognize or _recognize_google
+        self.max_workers = max_workers
+
+    def transcribe(self, segments: List[Any]) -> List[str]:
+        def _transcribe_segment(segment) -> str:
+            audio = sr.AudioData(
+                segment.raw_data, segment.frame_rate, segment.sample_width
+            )
+            try:
+                return self.recognize(audio).strip()
+            except sr.UnknownValueError:
+                # No speech in this segment
+                return ""
+
+        workers = max(1, min(self.max_workers, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_transcribe_segment, segments))
+
+
+class WhisperTranscriber(AudioTranscriber):
+    """
+    Transcribes segments offline, on the local CPU, with faster-whisper (if installed). The
+    model is loaded once per transcriber, and segments are spread across its worker pool, so
+    reuse a single instance (e.g., via MarkItDown(audio_transcriber=...)) for many files.
+
+    Args:
+        - model_size: a Whisper model name (e.g., "tiny", "base", "small") or a local model path
+        - compute_type: the CTranslate2 quantization to run with
+        - num_workers: how many segments to transcribe at once
+        - cpu_threads: threads per worker (0 lets CTranslate2 decide)
+        - language: the spoken language, or None to detect it
+    """
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        compute_type: str = "int8",
+        num_workers: int = 2,
+        cpu_threads: int = 0,
+        language: Optional[str] = None,
+    ):
+        if not IS_OFFLINE_TRANSCRIPTION_CAPABLE:
+            raise ValueError(
+                "Offline transcription requires faster-whisper. Install it with 'pip install faster-whisper'."
+            )
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.num_workers = num_workers
+        self.cpu_threads = cpu_threads
+        self.language = language
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def _get_model(self):
+        with self._model_lock:
+            if self._model is None:
+                self._model = faster_whisper.WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                )
+            return self._model
+
+    def transcribe(self, segments: List[Any]) -> List[str]:
+        model = self._get_model()
+
+        def _transcribe_segment(segment) -> str:
+            # Whisper expects 16kHz float samples in [-1, 1]
+            segment = segment.set_frame_rate(16000).set_sample_width(2)
+            samples = np.frombuffer(segment.raw_data, dtype=np.int16)
+            samples = samples.astype(np.float32) / 32768.0
+            parts, _ = model.transcribe(
+                samples, language=self.language, beam_size=1, vad_filter=True
+            )
+            return " ".join(part.text.strip() for part in parts).strip()
+
+        workers = max(1, min(self.num_workers, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_transcribe_segment, segments))
+
+
 class MediaConverter(DocumentConverter):
     """
     Abstract class for multi-modal media (e.g., images and audio)
@@ -989,9 +2043,12 @@ This warning will be removed in future releases.
             return None
         else:
             try:
-                result = subprocess.run(
-                    [exiftool_path, "-json", local_path], capture_output=True, text=True
-                ).stdout
+                with _trace_span("exiftool"):
+                    result = subprocess.run(
+                        [exiftool_path, "-json", os.fspath(local_path)],
+                        capture_output=True,
+                        text=True,
+                    ).stdout
                 return json.loads(result)[0]
             except Exception:
                 return None
@@ -1029,9 +2086,9 @@ class WavConverter(MediaConverter):
                     md_content += f"{f}: {metadata[f]}\n"
 
         # Transcribe
-        if IS_AUDIO_TRANSCRIPTION_CAPABLE:
+        if _is_audio_transcription_capable():
             try:
-                transcript = self._transcribe_audio(local_path)
+                transcript = self._transcribe_audio(local_path, "wav", **kwargs)
                 md_content += "\n\n### Audio Transcript:\n" + (
                     "[No speech detected]" if transcript == "" else transcript
                 )
@@ -1045,11 +2102,85 @@ class WavConverter(MediaConverter):
             text_content=md_content.strip(),
         )
 
-    def _transcribe_audio(self, local_path) -> str:
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(local_path) as source:
-            audio = recognizer.record(source)
-            return recognizer.recognize_google(audio).strip()
+    def _transcribe_audio(self, local_path, audio_format="wav", **kwargs) -> str:
+        """
+        Transcribe an audio file. The audio is decoded in memory, split into segments that are
+        transcribed concurrently, and stitched back together (with timestamps, if there is
+        more than one segment). Supports:
+
+        - audio_segment_seconds: the longest segment to send to the recognizer (default: 30)
+        - audio_split_on_silence: if True, cut segments at pauses in speech rather than at
+          fixed offsets (default: False)
+        - audio_transcriber: the AudioTranscriber backend to use (default: a
+          SpeechRecognitionTranscriber built from the two options below)
+        - audio_max_workers: how many segments to transcribe at once (default: 4)
+        - audio_recognizer: a callable taking a speech_recognition AudioData and returning its
+          text (default: Google's free web speech API)
+        """
+        segment_ms = int(kwargs.get("audio_segment_seconds", 30) * 1000)
+        transcriber = kwargs.get("audio_transcriber")
+        if transcriber is None:
+            transcriber = SpeechRecognitionTranscriber(
+                recognize=kwargs.get("audio_recognizer"),
+                max_workers=kwargs.get("audio_max_workers", 4),
+            )
+
+        # Decode in memory. pydub reads WAV itself; for other formats it has ffmpeg read the
+        # file directly (given a path) or from a pipe (given a file-like object), and decode
+        # to a pipe. Recognizers expect mono PCM.
+        in_memory = isinstance(local_path, DocumentSource) and local_path.in_memory
+        if audio_format == "wav" or in_memory:
+            with _open_source(local_path) as fh:
+                sound = pydub.AudioSegment.from_file(fh, format=audio_format)
+        else:
+            sound = pydub.AudioSegment.from_file(
+                os.fspath(local_path), format=audio_format
+            )
+        sound = sound.set_channels(1)
+
+        if kwargs.get("audio_split_on_silence", False):
+            segments = self._split_on_silence(sound, segment_ms)
+        else:
+            segments = [
+                (start, sound[start : start + segment_ms])
+                for start in range(0, max(len(sound), 1), segment_ms)
+            ]
+
+        transcripts = transcriber.transcribe([segment for _, segment in segments])
+
+        if len(segments) == 1:
+            return transcripts[0]
+        return "\n".join(
+            f"[{self._format_timestamp(start)}] {text}"
+            for (start, _), text in zip(segments, transcripts)
+            if text
+        )
+
+    def _split_on_silence(self, sound, segment_ms: int) -> List[Tuple[int, Any]]:
+        """Split audio at pauses, packing consecutive stretches of sound into segments of at most segment_ms."""
+        ranges = pydub.silence.detect_nonsilent(
+            sound, min_silence_len=500, silence_thresh=sound.dBFS - 16
+        )
+        segments = []
+        group_start, group_end = None, None
+        for start, end in ranges:
+            if group_start is not None and end - group_start <= segment_ms:
+                group_end = end
+                continue
+            if group_start is not None:
+                segments.append((group_start, sound[group_start:group_end]))
+            # Stretches of sound longer than a segment are cut at fixed offsets
+            while end - start > segment_ms:
+                segments.append((start, sound[start : start + segment_ms]))
+                start += segment_ms
+            group_start, group_end = start, end
+        if group_start is not None:
+            segments.append((group_start, sound[group_start:group_end]))
+        return segments or [(0, sound)]
+
+    def _format_timestamp(self, ms: int) -> str:
+        seconds = ms // 1000
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
 
 
 class Mp3Converter(WavConverter):
@@ -1084,27 +2215,16 @@ class Mp3Converter(WavConverter):
                     md_content += f"{f}: {metadata[f]}\n"
 
         # Transcribe
-        if IS_AUDIO_TRANSCRIPTION_CAPABLE:
-            handle, temp_path = tempfile.mkstemp(suffix=".wav")
-            os.close(handle)
+        if _is_audio_transcription_capable():
             try:
-                sound = pydub.AudioSegment.from_mp3(local_path)
-                sound.export(temp_path, format="wav")
-
-                _args = dict()
-                _args.update(kwargs)
-                _args["file_extension"] = ".wav"
-
-                try:
-                    transcript = super()._transcribe_audio(temp_path).strip()
-                    md_content += "\n\n### Audio Transcript:\n" + (
-                        "[No speech detected]" if transcript == "" else transcript
-                    )
-                except Exception:
-                    md_content += "\n\n### Audio Transcript:\nError. Could not transcribe this audio."
-
-            finally:
-                os.unlink(temp_path)
+                transcript = self._transcribe_audio(local_path, "mp3", **kwargs)
+                md_content += "\n\n### Audio Transcript:\n" + (
+                    "[No speech detected]" if transcript == "" else transcript
+                )
+            except Exception:
+                md_content += (
+                    "\n\n### Audio Transcript:\nError. Could not transcribe this audio."
+                )
 
         # Return the result
         return DocumentConverterResult(
@@ -1170,7 +2290,7 @@ class ImageConverter(MediaConverter):
             prompt = "If the image contains text, write the text without adding any extra description. If not, write a detailed caption for the image."
 
         data_uri = ""
-        with open(local_path, "rb") as image_file:
+        with _open_source(local_path) as image_file:
             content_type, encoding = mimetypes.guess_type("_dummy" + extension)
             if content_type is None:
                 content_type = "image/jpeg"
@@ -1192,7 +2312,8 @@ class ImageConverter(MediaConverter):
             }
         ]
 
-        response = client.chat.completions.create(model=model, messages=messages)
+        with _trace_span("llm.describe_image", model=model):
+            response = client.chat.completions.create(model=model, messages=messages)
         return response.choices[0].message.content
 
 
@@ -1213,42 +2334,46 @@ class OutlookMsgConverter(DocumentConverter):
             return None
 
         try:
-            msg = olefile.OleFileIO(local_path)
-            # Extract email metadata
-            md_content = "# Email Message\n\n"
-
-            # Get headers
-            headers = {
-                "From": self._get_stream_data(msg, "__substg1.0_0C1F001F"),
-                "To": self._get_stream_data(msg, "__substg1.0_0E04001F"),
-                "Subject": self._get_stream_data(msg, "__substg1.0_0037001F"),
-            }
+            with _open_source(local_path) as fh:
+                return self._convert(olefile.OleFileIO(fh))
+
+        except Exception as e:
+            raise FileConversionException(
+                f"Could not convert MSG file '{local_path}': {str(e)}"
+            )
 
-            # Add headers to markdown
-            for key, value in headers.items():
-                if value:
-                    md_content += f"**{key}:** {value}\n"
+    def _convert(self, msg: "olefile.OleFileIO") -> DocumentConverterResult:
+        """Helper function that converts an open MSG file."""
+        # Extract email metadata
+        md_content = "# Email Message\n\n"
 
-            md_content += "\n## Content\n\n"
+        # Get headers
+        headers = {
+            "From": self._get_stream_data(msg, "__substg1.0_0C1F001F"),
+            "To": self._get_stream_data(msg, "__substg1.0_0E04001F"),
+            "Subject": self._get_stream_data(msg, "__substg1.0_0037001F"),
+        }
 
-            # Get email body
-            body = self._get_stream_data(msg, "__substg1.0_1000001F")
-            if body:
-                md_content += body
+        # Add headers to markdown
+        for key, value in headers.items():
+            if value:
+                md_content += f"**{key}:** {value}\n"
 
-            msg.close()
+        md_content += "\n## Content\n\n"
 
-            return DocumentConverterResult(
-                title=headers.get("Subject"), text_content=md_content.strip()
-            )
+        # Get email body
+        body = self._get_stream_data(msg, "__substg1.0_1000001F")
+        if body:
+            md_content += body
 
-        except Exception as e:
-            raise FileConversionException(
-                f"Could not convert MSG file '{local_path}': {str(e)}"
-            )
+        msg.close()
+
+        return DocumentConverterResult(
+            title=headers.get("Subject"), text_content=md_content.strip()
+        )
 
     def _get_stream_data(
-        self, msg: olefile.OleFileIO, stream_path: str
+        self, msg: "olefile.OleFileIO", stream_path: str
     ) -> Union[str, None]:
         """Helper to safely extract and decode stream data from the MSG file."""
         try:
@@ -1324,17 +2449,30 @@ class ZipConverter(DocumentConverter):
                 text_content=f"[ERROR] No converters available to process zip contents from: {local_path}",
             )
 
-        extracted_zip_folder_name = (
-            f"extracted_{os.path.basename(local_path).replace('.zip', '_zip')}"
-        )
-        extraction_dir = os.path.normpath(
-            os.path.join(os.path.dirname(local_path), extracted_zip_folder_name)
-        )
-        md_content = f"Content from the zip file `{os.path.basename(local_path)}`:\n\n"
+        source = _get_document_context(local_path, kwargs).source
+        zip_name = source.name or "document.zip"
+        extracted_zip_folder_name = f"extracted_{zip_name.replace('.zip', '_zip')}"
+        md_content = f"Content from the zip file `{zip_name}`:\n\n"
 
+        cleanup = kwargs.get("cleanup_extracted", True)
+        temp_dir = None
+        extraction_dir = None
         try:
+            if source.path is not None and not source.owns_path:
+                extraction_dir = os.path.normpath(
+                    os.path.join(
+                        os.path.dirname(source.path), extracted_zip_folder_name
+                    )
+                )
+            else:
+                # In memory, or spilled to a temporary file: the zip has no directory of its own
+                # to extract next to, and a fixed name would be shared by concurrent conversions
+                extraction_dir = temp_dir = tempfile.mkdtemp(
+                    prefix=extracted_zip_folder_name + "_"
+                )
+
             # Extract the zip file safely
-            with zipfile.ZipFile(local_path, "r") as zipObj:
+            with _open_source(local_path) as fh, zipfile.ZipFile(fh, "r") as zipObj:
                 # Safeguard against path traversal
                 for member in zipObj.namelist():
                     member_path = os.path.normpath(os.path.join(extraction_dir, member))
@@ -1362,11 +2500,15 @@ class ZipConverter(DocumentConverter):
                     file_kwargs = kwargs.copy()
                     file_kwargs["file_extension"] = file_extension
                     file_kwargs["_parent_converters"] = parent_converters
+                    file_kwargs["_document_context"] = _DocumentContext(
+                        DocumentSource.from_path(file_path), [file_extension]
+                    )
 
                     # Try converting the file using available converters
                     for converter in parent_converters:
+                        converter = _resolve_converter(converter, file_extension)
                         # Skip the zip converter to avoid infinite recursion
-                        if isinstance(converter, ZipConverter):
+                        if converter is None or isinstance(converter, ZipConverter):
                             continue
 
                         result = converter.convert(file_path, **file_kwargs)
@@ -1375,10 +2517,6 @@ class ZipConverter(DocumentConverter):
                             md_content += result.text_content + "\n\n"
                             break
 
-            # Clean up extracted files if specified
-            if kwargs.get("cleanup_extracted", True):
-                shutil.rmtree(extraction_dir)
-
             return DocumentConverterResult(title=None, text_content=md_content.strip())
 
         except zipfile.BadZipFile:
@@ -1396,16 +2534,38 @@ class ZipConverter(DocumentConverter):
                 title=None,
                 text_content=f"[ERROR] Failed to process zip file {local_path}: {str(e)}",
             )
+        finally:
+            # However the conversion went. A temporary directory is always removed; one next to
+            # the caller's zip, unless they asked to keep the extracted files
+            if temp_dir is not None or (extraction_dir is not None and cleanup):
+                shutil.rmtree(extraction_dir, ignore_errors=True)
 
 
 class DocumentIntelligenceConverter(DocumentConverter):
     """Specialized DocumentConverter that uses Document Intelligence to extract text from documents."""
 
+    EXTENSIONS = [
+        ".pdf",
+        ".docx",
+        ".xlsx",
+        ".pptx",
+        ".html",
+        ".jpeg",
+        ".jpg",
+        ".png",
+        ".bmp",
+        ".tiff",
+        ".heif",
+    ]
+
     def __init__(
         self,
         endpoint: str,
         api_version: str = "2024-07-31-preview",
     ):
+        from azure.ai.documentintelligence import DocumentIntelligenceClient
+        from azure.identity import DefaultAzureCredential
+
         self.endpoint = endpoint
         self.api_version = api_version
         self.doc_intel_client = DocumentIntelligenceClient(
@@ -1419,25 +2579,17 @@ class DocumentIntelligenceConverter(DocumentConverter):
     ) -> Union[None, DocumentConverterResult]:
         # Bail if extension is not supported by Document Intelligence
         extension = kwargs.get("file_extension", "")
-        docintel_extensions = [
-            ".pdf",
-            ".docx",
-            ".xlsx",
-            ".pptx",
-            ".html",
-            ".jpeg",
-            ".jpg",
-            ".png",
-            ".bmp",
-            ".tiff",
-            ".heif",
-        ]
-        if extension.lower() not in docintel_extensions:
+        if extension.lower() not in self.EXTENSIONS:
             return None
 
+        from azure.ai.documentintelligence.models import (
+            AnalyzeDocumentRequest,
+            AnalyzeResult,
+            DocumentAnalysisFeature,
+        )
+
         # Get the bytestring for the local path
-        with open(local_path, "rb") as f:
-            file_bytes = f.read()
+        file_bytes = _get_document_context(local_path, kwargs).read_bytes()
 
         # Certain document analysis features are not availiable for filetypes (.xlsx, .pptx, .html)
         if extension.lower() in [".xlsx", ".pptx", ".html"]:
@@ -1450,13 +2602,15 @@ class DocumentIntelligenceConverter(DocumentConverter):
             ]
 
         # Extract the text using Azure Document Intelligence
-        poller = self.doc_intel_client.begin_analyze_document(
-            model_id="prebuilt-layout",
-            body=AnalyzeDocumentRequest(bytes_source=file_bytes),
-            features=analysis_features,
-            output_content_format=CONTENT_FORMAT,  # TODO: replace with "ContentFormat.MARKDOWN" when the bug is fixed
-        )
-        result: AnalyzeResult = poller.result()
+        with _trace_span("docintel.begin_analyze"):
+            poller = self.doc_intel_client.begin_analyze_document(
+                model_id="prebuilt-layout",
+                body=AnalyzeDocumentRequest(bytes_source=file_bytes),
+                features=analysis_features,
+                output_content_format=CONTENT_FORMAT,  # TODO: replace with "ContentFormat.MARKDOWN" when the bug is fixed
+            )
+        with _trace_span("docintel.poll"):
+            result: AnalyzeResult = poller.result()
 
         # remove comments from the markdown content generated by Doc Intelligence and append to markdown string
         markdown_text = re.sub(r"<!--.*?-->", "", result.content, flags=re.DOTALL)
@@ -1466,6 +2620,274 @@ class DocumentIntelligenceConverter(DocumentConverter):
         )
 
 
+class MetricsRegistry:
+    """
+    A small, thread-safe registry of counters, gauges and histograms, rendered in the Prometheus
+    text exposition format. MarkItDown records its conversion metrics here; applications can
+    describe and record their own alongside them, and serve render() from a /metrics endpoint.
+    """
+
+    DEFAULT_BUCKETS = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+        60,
+        120,
+        300,
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._collectors: List[Any] = []
+
+    def describe(
+        self,
+        name: str,
+        metric_type: str,
+        help: str,
+        buckets: Optional[Tuple[float, ...]] = None,
+    ) -> None:
+        """Declare a metric ("counter", "gauge" or "histogram"). Declaring it again does nothing."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = {
+                    "type": metric_type,
+                    "help": help,
+                    "buckets": tuple(buckets or self.DEFAULT_BUCKETS),
+                    "values": {},
+                }
+
+    def add_collector(self, collector) -> None:
+        """Register a function to call (with the registry) just before rendering, e.g. to refresh gauges."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Add to a counter or gauge (amount may be negative for a gauge)."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._metrics[name]["values"]
+            values[key] = values.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._metrics[name]["values"][tuple(sorted(labels.items()))] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation in a histogram."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics[name]
+            state = metric["values"].get(key)
+            if state is None:
+                state = metric["values"][key] = [[0] * len(metric["buckets"]), 0.0, 0]
+            for i, bound in enumerate(metric["buckets"]):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector(self)
+
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for key, value in metric["values"].items():
+                    if metric["type"] != "histogram":
+                        lines.append(f"{name}{self._format_labels(key)} {value}")
+                        continue
+                    bucket_counts, total, count = value
+                    for bound, bucket_count in zip(metric["buckets"], bucket_counts):
+                        labels = self._format_labels(key + (("le", bound),))
+                        lines.append(f"{name}_bucket{labels} {bucket_count}")
+                    labels = self._format_labels(key + (("le", "+Inf"),))
+                    lines.append(f"{name}_bucket{labels} {count}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {total}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _format_labels(self, key: Tuple[Tuple[str, Any], ...]) -> str:
+        if not key:
+            return ""
+        pairs = []
+        for label, value in key:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            value = value.replace("\n", "\\n")
+            pairs.append(f'{label}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+
+# Where MarkItDown instances record their metrics, unless given a registry of their own
+DEFAULT_METRICS = MetricsRegistry()
+
+
+class Span:
+    """One timed operation in a trace. Ids follow the W3C Trace Context format (hex strings)."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_time = time.time()
+        self.duration: Union[float, None] = None
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    """Abstract superclass of span exporters. export() is called once with each finished span."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError()
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Prints one line per finished span (to stderr, by default)."""
+
+    def __init__(self, stream: Optional[Any] = None):
+        self._stream = stream
+
+    def export(self, span: Span) -> None:
+        stream = self._stream or sys.stderr
+        attributes = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+        print(
+            f"[trace {span.trace_id[:8]}] {span.name} {span.duration * 1000:.2f}ms {span.status} {attributes}".rstrip(),
+            file=stream,
+        )
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends finished spans to a file, as JSON lines."""
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock, open(self._path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+# The span (and tracer) in effect for the code currently running, so that nested work (converter
+# attempts, LLM calls, exiftool, ...) is traced as children without passing either around
+_CURRENT_SPAN: contextvars.ContextVar = contextvars.ContextVar(
+    "markitdown_span", default=None
+)
+_CURRENT_TRACER: contextvars.ContextVar = contextvars.ContextVar(
+    "markitdown_tracer", default=None
+)
+
+
+class Tracer:
+    """
+    Creates spans and hands each finished one to an exporter. Spans started while another is
+    current become its children; a span with no parent starts a new trace, unless trace_id and
+    parent_id (e.g., from an incoming W3C traceparent header) say otherwise.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    def start_span(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        **attributes: Any,
+    ) -> Span:
+        """Start a span (without making it current; see span() for that)."""
+        parent = _CURRENT_SPAN.get()
+        if trace_id is None and parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        return Span(name, trace_id or os.urandom(16).hex(), parent_id, attributes)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """Finish a span, and export it."""
+        span.duration = time.perf_counter() - span._started
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = type(error).__name__
+        try:
+            self.exporter.export(span)
+        except Exception:
+            pass  # Tracing must never break a conversion
+
+    @contextmanager
+    def use_span(self, span: Span):
+        """Make a started span current for a block (so the parent of spans started in it), without ending it after."""
+        span_token = _CURRENT_SPAN.set(span)
+        tracer_token = _CURRENT_TRACER.set(self)
+        try:
+            yield span
+        finally:
+            _CURRENT_TRACER.reset(tracer_token)
+            _CURRENT_SPAN.reset(span_token)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any):
+        """Run a block as a span, current for (and so the parent of spans started in) the block."""
+        span = self.start_span(name, **attributes)
+        error = None
+        try:
+            with self.use_span(span):
+                yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.end_span(span, error)
+
+
+def _trace_span(name: str, **attributes: Any) -> Any:
+    """A span for the current tracer, if there is one; otherwise, a context that does nothing."""
+    tracer = _CURRENT_TRACER.get()
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **attributes)
+
+
 class FileConversionException(BaseException):
     pass
 
@@ -1474,30 +2896,144 @@ class UnsupportedFormatException(BaseException):
     pass
 
 
+class ConversionTimeoutException(FileConversionException):
+    pass
+
+
+class ConversionMemoryException(FileConversionException):
+    pass
+
+
+def _sandbox_main(func, conn, max_memory: Optional[int]) -> None:
+    """Entry point of a sandboxed conversion's child process: cap its memory, run func(), and
+    send the outcome back to the parent."""
+    if max_memory is not None:
+        # The child starts out sharing the parent's address space, so the cap is on top of that
+        limit = max_memory
+        try:
+            with open("/proc/self/statm", "r") as fh:
+                limit += int(fh.read().split()[0]) * mmap.PAGESIZE
+        except OSError:
+            pass
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        outcome = ("ok", func())
+    except MemoryError:
+        outcome = ("memory", None)
+    except BaseException as e:
+        # Exceptions don't all survive pickling, so send their type and message instead
+        outcome = ("error", (type(e).__name__, str(e)))
+    conn.send(outcome)
+    conn.close()
+
+
+# How long a sandboxed conversion bounded only in memory may run. The child is forked, possibly from
+# a multithreaded process (e.g., a web server), and can inherit a lock that another thread held at
+# the time, which it would then wait on forever
+SANDBOX_DEFAULT_TIMEOUT = 600.0
+
+
+def _run_sandboxed(func, timeout: Optional[float], max_memory: Optional[int]) -> Any:
+    """Run func() in a child process, killing it if it runs longer than timeout seconds, and
+    limiting it to max_memory bytes more than this process is using. The child is forked, so
+    it inherits the converters, clients and document without any of them being pickled. What
+    func() returns is, so it should be plain data.
+    """
+    if timeout is None:
+        timeout = SANDBOX_DEFAULT_TIMEOUT
+    context = multiprocessing.get_context("fork")
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(target=_sandbox_main, args=(func, writer, max_memory))
+    process.start()
+    writer.close()
+    try:
+        if not reader.poll(timeout):
+            raise ConversionTimeoutException(
+                f"Conversion did not finish within {timeout} seconds, and was stopped."
+            )
+        try:
+            status, payload = reader.recv()
+        except EOFError:
+            process.join()
+            if (
+                process.exitcode == -9
+            ):  # SIGKILL, most likely from the out-of-memory killer
+                raise ConversionMemoryException(
+                    "The conversion process was killed, most likely for running out of memory."
+                )
+            raise FileConversionException(
+                f"The conversion process exited unexpectedly (exit code {process.exitcode})."
+            )
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        reader.close()
+
+    if status == "ok":
+        return payload
+    if status == "memory":
+        raise ConversionMemoryException(
+            f"Conversion ran out of memory (limit: {max_memory} bytes)."
+        )
+    name, message = payload
+    exception_type = {
+        "UnsupportedFormatException": UnsupportedFormatException,
+        "ConversionTimeoutException": ConversionTimeoutException,
+        "ConversionMemoryException": ConversionMemoryException,
+    }.get(name, FileConversionException)
+    raise exception_type(message)
+
+
 class MarkItDown:
     """(In preview) An extremely simple text-based document reader, suitable for LLM use.
     This reader will convert common file-types or webpages to Markdown."""
 
     def __init__(
         self,
-        requests_session: Optional[requests.Session] = None,
+        requests_session: Optional["requests.Session"] = None,
         llm_client: Optional[Any] = None,
         llm_model: Optional[str] = None,
         style_map: Optional[str] = None,
         exiftool_path: Optional[str] = None,
         docintel_endpoint: Optional[str] = None,
+        html_parser: Optional[str] = None,
+        main_content: bool = False,
+        audio_transcriber: Optional[AudioTranscriber] = None,
+        memory_threshold: int = DocumentSource.DEFAULT_MEMORY_THRESHOLD,
+        timeout: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
         # Deprecated
         mlm_client: Optional[Any] = None,
         mlm_model: Optional[str] = None,
     ):
-        if requests_session is None:
-            self._requests_session = requests.Session()
-        else:
-            self._requests_session = requests_session
+        # Without one, a session is created on first use, so requests is only imported to fetch URLs
+        self._requests_session = requests_session
 
         if exiftool_path is None:
             exiftool_path = os.environ.get("EXIFTOOL_PATH")
 
+        # BeautifulSoup backend used by the HTML-family converters
+        if html_parser is None:
+            html_parser = DEFAULT_HTML_PARSER
+        if html_parser == "lxml" and not IS_LXML_CAPABLE:
+            raise ValueError(
+                "The 'lxml' HTML parser was requested, but lxml is not installed. Install lxml, or use html_parser='html.parser' instead."
+            )
+
+        # Bounding conversions in time or memory runs them in a child process
+        if (timeout is not None or max_memory is not None) and not IS_SANDBOX_CAPABLE:
+            raise ValueError(
+                "'timeout' and 'max_memory' run each conversion in a forked child process, which is not supported on this platform."
+            )
+        if max_memory is not None and not IS_MEMORY_LIMIT_CAPABLE:
+            raise ValueError(
+                "'max_memory' requires the 'resource' module, which is not available on this platform."
+            )
+
         # Handle deprecation notices
         #############################
         if mlm_client is not None:
@@ -1531,45 +3067,110 @@ class MarkItDown:
         self._llm_model = llm_model
         self._style_map = style_map
         self._exiftool_path = exiftool_path
+        self._html_parser = html_parser
+        self._main_content = main_content
+        self._audio_transcriber = audio_transcriber
+        self._memory_threshold = memory_threshold
+        self._timeout = timeout
+        self._max_memory = max_memory
+
+        # Tracing. Without a tracer of its own, MarkItDown joins the caller's trace, if any
+        self._tracer = tracer
+
+        # Conversion metrics
+        self._metrics = metrics if metrics is not None else DEFAULT_METRICS
+        self._metrics.describe(
+            "markitdown_conversions_total",
+            "counter",
+            "Conversions, by the converter and extension that succeeded, and outcome.",
+        )
+        self._metrics.describe(
+            "markitdown_conversion_duration_seconds",
+            "histogram",
+            "Time taken by each conversion, by the converter and extension that succeeded.",
+        )
+        self._metrics.describe(
+            "markitdown_conversion_attempts",
+            "histogram",
+            "Converters tried per conversion, including the one that succeeded.",
+            buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+        )
+        self._metrics.describe(
+            "markitdown_input_bytes_total",
+            "counter",
+            "Bytes of documents converted, by the converter and extension that succeeded.",
+        )
+        self._metrics.describe(
+            "markitdown_output_bytes_total",
+            "counter",
+            "Bytes of Markdown produced (UTF-8), by the converter and extension that succeeded.",
+        )
+        self._metrics.describe(
+            "markitdown_conversions_in_flight",
+            "gauge",
+            "Conversions currently running.",
+        )
 
         self._page_converters: List[DocumentConverter] = []
 
         # Register converters for successful browsing operations
         # Later registrations are tried first / take higher priority than earlier registrations
         # To this end, the most specific converters should appear below the most generic converters
-        self.register_page_converter(PlainTextConverter())
-        self.register_page_converter(HtmlConverter())
-        self.register_page_converter(RSSConverter())
-        self.register_page_converter(WikipediaConverter())
-        self.register_page_converter(YouTubeConverter())
-        self.register_page_converter(BingSerpConverter())
-        self.register_page_converter(DocxConverter())
-        self.register_page_converter(XlsxConverter())
-        self.register_page_converter(XlsConverter())
-        self.register_page_converter(PptxConverter())
-        self.register_page_converter(WavConverter())
-        self.register_page_converter(Mp3Converter())
-        self.register_page_converter(ImageConverter())
-        self.register_page_converter(IpynbConverter())
-        self.register_page_converter(PdfConverter())
-        self.register_page_converter(ZipConverter())
-        self.register_page_converter(OutlookMsgConverter())
+        self.register_page_converter(_LazyConverter(PlainTextConverter))
+        self.register_page_converter(_LazyConverter(HtmlConverter, [".html", ".htm"]))
+        self.register_page_converter(
+            _LazyConverter(RSSConverter, [".xml", ".rss", ".atom"])
+        )
+        self.register_page_converter(
+            _LazyConverter(WikipediaConverter, [".html", ".htm"])
+        )
+        self.register_page_converter(
+            _LazyConverter(YouTubeConverter, [".html", ".htm"])
+        )
+        self.register_page_converter(
+            _LazyConverter(BingSerpConverter, [".html", ".htm"])
+        )
+        self.register_page_converter(_LazyConverter(DocxConverter, [".docx"]))
+        self.register_page_converter(_LazyConverter(XlsxConverter, [".xlsx"]))
+        self.register_page_converter(_LazyConverter(XlsConverter, [".xls"]))
+        self.register_page_converter(_LazyConverter(PptxConverter, [".pptx"]))
+        self.register_page_converter(_LazyConverter(WavConverter, [".wav"]))
+        self.register_page_converter(_LazyConverter(Mp3Converter, [".mp3"]))
+        self.register_page_converter(
+            _LazyConverter(ImageConverter, [".jpg", ".jpeg", ".png"])
+        )
+        self.register_page_converter(_LazyConverter(IpynbConverter, [".ipynb"]))
+        self.register_page_converter(_LazyConverter(PdfConverter, [".pdf"]))
+        self.register_page_converter(_LazyConverter(ZipConverter, [".zip"]))
+        self.register_page_converter(_LazyConverter(OutlookMsgConverter, [".msg"]))
 
         # Register Document Intelligence converter at the top of the stack if endpoint is provided
         if docintel_endpoint is not None:
             self.register_page_converter(
-                DocumentIntelligenceConverter(endpoint=docintel_endpoint)
+                _LazyConverter(
+                    lambda: DocumentIntelligenceConverter(endpoint=docintel_endpoint),
+                    DocumentIntelligenceConverter.EXTENSIONS,
+                )
             )
 
     def convert(
-        self, source: Union[str, requests.Response, Path], **kwargs: Any
+        self,
+        source: Union[str, "requests.Response", Path, DocumentSource],
+        **kwargs: Any,
     ) -> DocumentConverterResult:  # TODO: deal with kwargs
         """
         Args:
-            - source: can be a string representing a path either as string pathlib path object or url, or a requests.response object
+            - source: can be a string representing a path either as string pathlib path object or url, a requests.response object, or a DocumentSource
             - extension: specifies the file extension to use when interpreting the file. If None, infer from source (path, uri, content-type, etc.)
         """
+        with self._trace("MarkItDown.convert", source_type=type(source).__name__):
+            return self._dispatch_source(source, **kwargs)
 
+    def _dispatch_source(
+        self,
+        source: Union[str, "requests.Response", Path, DocumentSource],
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
         # Local path or url
         if isinstance(source, str):
             if (
@@ -1581,77 +3182,63 @@ class MarkItDown:
             else:
                 return self.convert_local(source, **kwargs)
         # Request response
-        elif isinstance(source, requests.Response):
+        elif "requests" in sys.modules and isinstance(source, requests.Response):
+            # (A Response can't have been made without requests having been imported)
             return self.convert_response(source, **kwargs)
         elif isinstance(source, Path):
             return self.convert_local(source, **kwargs)
+        elif isinstance(source, DocumentSource):
+            return self.convert_source(source, **kwargs)
 
     def convert_local(
         self, path: Union[str, Path], **kwargs: Any
     ) -> DocumentConverterResult:  # TODO: deal with kwargs
-        if isinstance(path, Path):
-            path = str(path)
+        return self.convert_source(DocumentSource.from_path(path), **kwargs)
+
+    def convert_source(
+        self, source: DocumentSource, **kwargs: Any
+    ) -> DocumentConverterResult:  # TODO: deal with kwargs
         # Prepare a list of extensions to try (in order of priority)
         ext = kwargs.get("file_extension")
         extensions = [ext] if ext is not None else []
 
-        # Get extension alternatives from the path and puremagic
-        base, ext = os.path.splitext(path)
+        # Get extension alternatives from the name and puremagic
+        base, ext = os.path.splitext(source.path or source.name)
         self._append_ext(extensions, ext)
 
-        for g in self._guess_ext_magic(path):
-            self._append_ext(extensions, g)
+        started = time.perf_counter()
+        with self._trace("MarkItDown.sniff"):
+            for g in self._guess_ext_magic(source):
+                self._append_ext(extensions, g)
+        sniff_seconds = time.perf_counter() - started
 
         # Convert
-        return self._convert(path, extensions, **kwargs)
+        res = self._convert(source, extensions, **kwargs)
+        if res.timings is not None:
+            res.timings["sniff_seconds"] = sniff_seconds
+        return res
 
     # TODO what should stream's type be?
     def convert_stream(
         self, stream: Any, **kwargs: Any
     ) -> DocumentConverterResult:  # TODO: deal with kwargs
-        # Prepare a list of extensions to try (in order of priority)
-        ext = kwargs.get("file_extension")
-        extensions = [ext] if ext is not None else []
-
-        # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
-        result = None
-        try:
-            # Write to the temporary file
-            content = stream.read()
-            if isinstance(content, str):
-                fh.write(content.encode("utf-8"))
-            else:
-                fh.write(content)
-            fh.close()
-
-            # Use puremagic to check for more extension options
-            for g in self._guess_ext_magic(temp_path):
-                self._append_ext(extensions, g)
-
-            # Convert
-            result = self._convert(temp_path, extensions, **kwargs)
-        # Clean up
-        finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
-            os.unlink(temp_path)
-
-        return result
+        # Read the stream into memory, or into a temporary file if it is large. Any temporary
+        # file will be deleted before this method exits
+        with DocumentSource.from_stream(stream, self._memory_threshold) as source:
+            return self.convert_source(source, **kwargs)
 
     def convert_url(
         self, url: str, **kwargs: Any
     ) -> DocumentConverterResult:  # TODO: fix kwargs type
         # Send a HTTP request to the URL
+        if self._requests_session is None:
+            self._requests_session = requests.Session()
         response = self._requests_session.get(url, stream=True)
         response.raise_for_status()
         return self.convert_response(response, **kwargs)
 
     def convert_response(
-        self, response: requests.Response, **kwargs: Any
+        self, response: "requests.Response", **kwargs: Any
     ) -> DocumentConverterResult:  # TODO fix kwargs type
         # Prepare a list of extensions to try (in order of priority)
         ext = kwargs.get("file_extension")
@@ -1662,48 +3249,200 @@ class MarkItDown:
         self._append_ext(extensions, mimetypes.guess_extension(content_type))
 
         # Read the content disposition if there is one
+        name = os.path.basename(urlparse(response.url).path)
         content_disposition = response.headers.get("content-disposition", "")
         m = re.search(r"filename=([^;]+)", content_disposition)
         if m:
-            base, ext = os.path.splitext(m.group(1).strip("\"'"))
+            name = os.path.basename(m.group(1).strip("\"'"))
+            base, ext = os.path.splitext(name)
             self._append_ext(extensions, ext)
 
         # Read from the extension from the path
         base, ext = os.path.splitext(urlparse(response.url).path)
         self._append_ext(extensions, ext)
 
-        # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
-        result = None
-        try:
-            # Download the file
-            for chunk in response.iter_content(chunk_size=512):
-                fh.write(chunk)
-            fh.close()
+        # Download the file into memory, or into a temporary file if it is large. Any
+        # temporary file will be deleted before this method exits
+        chunks = response.iter_content(chunk_size=DocumentSource._COPY_BUFFER_SIZE)
+        with DocumentSource.from_chunks(chunks, self._memory_threshold) as source:
+            source.name = name
 
             # Use puremagic to check for more extension options
-            for g in self._guess_ext_magic(temp_path):
-                self._append_ext(extensions, g)
+            started = time.perf_counter()
+            with self._trace("MarkItDown.sniff"):
+                for g in self._guess_ext_magic(source):
+                    self._append_ext(extensions, g)
+            sniff_seconds = time.perf_counter() - started
 
             # Convert
-            result = self._convert(temp_path, extensions, url=response.url, **kwargs)
-        # Clean up
+            res = self._convert(source, extensions, url=response.url, **kwargs)
+            if res.timings is not None:
+                res.timings["sniff_seconds"] = sniff_seconds
+            return res
+
+    def _convert(
+        self,
+        local_path: Union[str, DocumentSource],
+        extensions: List[Union[str, None]],
+        **kwargs,
+    ) -> DocumentConverterResult:
+        if not isinstance(local_path, DocumentSource):
+            local_path = DocumentSource.from_path(local_path)
+
+        # Diagnostics: per-stage timings on the result, and profiling. Neither is passed on to
+        # converters (a profiler object need not survive their deepcopy of the options)
+        collect_timings = kwargs.pop("collect_timings", False)
+        profiler = kwargs.pop("profiler", None)
+
+        # What _try_converters did: the converters it tried, and which (if any) succeeded
+        stats = {"attempts": 0, "converter": "none", "extension": "none"}
+        if collect_timings:
+            stats["timings"] = {"input_bytes": local_path.size, "attempts": []}
+        status = "error"
+        started = time.perf_counter()
+        self._metrics.inc("markitdown_conversions_in_flight")
+        try:
+            with self._trace(
+                "MarkItDown._convert", extensions=extensions, size=local_path.size
+            ) as span:
+                # Run the conversion in a child process, if it is to be bounded in time or memory
+                if self._timeout is not None or self._max_memory is not None:
+
+                    in_memory = local_path.in_memory
+
+                    def sandboxed():
+                        try:
+                            res = self._run_profiled(
+                                lambda: self._try_converters(
+                                    local_path, extensions, stats, **kwargs
+                                ),
+                                profiler,
+                            )
+                        finally:
+                            # A converter that needed a path had the child write the document
+                            # to a temporary file, which the parent's copy of the source
+                            # knows nothing about
+                            if in_memory:
+                                local_path.close()
+                        # Only plain data goes back to the parent. A title can be a bs4
+                        # NavigableString, which would take its whole soup along with it
+                        return (
+                            {
+                                "title": None if res.title is None else str(res.title),
+                                "text_content": str(res.text_content),
+                                "timings": res.timings,
+                                "profile": res.profile,
+                            },
+                            stats,
+                        )
+
+                    outcome, child_stats = _run_sandboxed(
+                        sandboxed, self._timeout, self._max_memory
+                    )
+                    res = DocumentConverterResult(
+                        title=outcome["title"], text_content=outcome["text_content"]
+                    )
+                    res.timings = outcome["timings"]
+                    res.profile = outcome["profile"]
+                    stats.update(child_stats)
+                else:
+                    res = self._run_profiled(
+                        lambda: self._try_converters(
+                            local_path, extensions, stats, **kwargs
+                        ),
+                        profiler,
+                    )
+                if span is not None:
+                    span.set_attribute("converter", stats["converter"])
+                    span.set_attribute("attempts", stats["attempts"])
+            status = "success"
+            if collect_timings:
+                res.timings = stats["timings"]
+                res.timings["total_seconds"] = time.perf_counter() - started
+            return res
+        except UnsupportedFormatException:
+            status = "unsupported"
+            raise
         finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
-            os.unlink(temp_path)
+            self._metrics.inc("markitdown_conversions_in_flight", -1)
+            labels = {"converter": stats["converter"], "extension": stats["extension"]}
+            self._metrics.inc("markitdown_conversions_total", status=status, **labels)
+            if status == "success":
+                self._metrics.observe(
+                    "markitdown_conversion_duration_seconds",
+                    time.perf_counter() - started,
+                    **labels,
+                )
+                self._metrics.observe(
+                    "markitdown_conversion_attempts", stats["attempts"]
+                )
+                self._metrics.inc(
+                    "markitdown_input_bytes_total", local_path.size, **labels
+                )
+                self._metrics.inc(
+                    "markitdown_output_bytes_total",
+                    len(res.text_content.encode("utf-8")),
+                    **labels,
+                )
 
-        return result
+    def _trace(self, name: str, **attributes: Any) -> Any:
+        """A span for this instance's tracer (or the caller's), or a context that does nothing."""
+        if self._tracer is not None:
+            return self._tracer.span(name, **attributes)
+        return _trace_span(name, **attributes)
 
-    def _convert(
-        self, local_path: str, extensions: List[Union[str, None]], **kwargs
+    def _run_profiled(self, func, profiler) -> DocumentConverterResult:
+        """
+        Run a conversion under a profiler: "cprofile" attaches a cProfile report (the top
+        functions by cumulative time) to the result's profile attribute; any other object is
+        enable()d before the conversion and disable()d after it, like a cProfile.Profile or a
+        sampling profiler. The profiler runs wherever the conversion does, so in sandboxed
+        mode (timeout or max_memory) only "cprofile" reports make it back.
+        """
+        if profiler is None:
+            return func()
+        if profiler == "cprofile":
+            profile = cProfile.Profile()
+            res = profile.runcall(func)
+            report = io.StringIO()
+            pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(
+                30
+            )
+            res.profile = report.getvalue()
+            return res
+        profiler.enable()
+        try:
+            return func()
+        finally:
+            profiler.disable()
+
+    def _try_converters(
+        self,
+        local_path: DocumentSource,
+        extensions: List[Union[str, None]],
+        stats: Dict[str, Any],
+        **kwargs,
     ) -> DocumentConverterResult:
         error_trace = ""
+        timings = stats.get("timings")
+        llm_calls: List[float] = []
+
+        # Shared by every attempt below, so the document is read and parsed at most once
+        context = _DocumentContext(
+            local_path, [e for e in extensions if e is not None], timings
+        )
+
+        # Passed through rather than deep-copied with the other options: a transcriber holds a
+        # lock, and copying it would reload its model on every attempt
+        audio_transcriber = kwargs.pop("audio_transcriber", self._audio_transcriber)
+
         for ext in extensions + [None]:  # Try last with no extension
             for converter in self._page_converters:
+                # Converters registered by extension are skipped (and not even created) for others
+                converter = _resolve_converter(converter, ext)
+                if converter is None:
+                    continue
+
                 _kwargs = copy.deepcopy(kwargs)
 
                 # Overwrite file_extension appropriately
@@ -1726,22 +3465,74 @@ class MarkItDown:
                 if "exiftool_path" not in _kwargs and self._exiftool_path is not None:
                     _kwargs["exiftool_path"] = self._exiftool_path
 
+                if "html_parser" not in _kwargs and self._html_parser is not None:
+                    _kwargs["html_parser"] = self._html_parser
+
+                if "main_content" not in _kwargs and self._main_content:
+                    _kwargs["main_content"] = self._main_content
+
+                if audio_transcriber is not None:
+                    _kwargs["audio_transcriber"] = audio_transcriber
+
                 # Add the list of converters for nested processing
                 _kwargs["_parent_converters"] = self._page_converters
+                _kwargs["_document_context"] = context
+
+                # Time LLM calls, when collecting timings
+                if timings is not None and _kwargs.get("llm_client") is not None:
+                    _kwargs["llm_client"] = _TimedProxy(
+                        _kwargs["llm_client"], llm_calls
+                    )
 
                 # If we hit an error log it and keep trying
-                try:
-                    res = converter.convert(local_path, **_kwargs)
-                except Exception:
-                    error_trace = ("\n\n" + traceback.format_exc()).strip()
+                res = None
+                outcome = "declined"
+                stats["attempts"] += 1
+                started = time.perf_counter()
+                with self._trace(
+                    "converter.attempt",
+                    converter=type(converter).__name__,
+                    extension=ext,
+                ) as span:
+                    try:
+                        res = converter.convert(local_path, **_kwargs)
+                    except MemoryError:
+                        # No other converter will fare better
+                        raise
+                    except Exception:
+                        error_trace = ("\n\n" + traceback.format_exc()).strip()
+                        outcome = "error"
+                    if span is not None:
+                        span.set_attribute(
+                            "outcome", "success" if res is not None else outcome
+                        )
+
+                if timings is not None:
+                    timings["attempts"].append(
+                        {
+                            "converter": type(converter).__name__,
+                            "extension": ext,
+                            "seconds": time.perf_counter() - started,
+                            "outcome": "success" if res is not None else outcome,
+                        }
+                    )
 
                 if res is not None:
+                    stats["converter"] = type(converter).__name__
+                    stats["extension"] = ext if ext is not None else "none"
+
                     # Normalize the content
+                    started = time.perf_counter()
                     res.text_content = "\n".join(
                         [line.rstrip() for line in re.split(r"\r?\n", res.text_content)]
                     )
                     res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
 
+                    if timings is not None:
+                        timings["normalize_seconds"] = time.perf_counter() - started
+                        timings["llm_calls"] = len(llm_calls)
+                        timings["llm_seconds"] = sum(llm_calls)
+
                     # Todo
                     return res
 
@@ -1770,6 +3561,12 @@ class MarkItDown:
 
     def _guess_ext_magic(self, path):
         """Use puremagic (a Python implementation of libmagic) to guess a file's extension based on the first few bytes."""
+        # In-memory documents are sniffed where they are
+        if isinstance(path, DocumentSource):
+            if path.in_memory:
+                return self._guess_ext_magic_bytes(path.read_bytes())
+            path = path.path
+
         # Use puremagic to guess
         try:
             guesses = puremagic.magic_file(path)
@@ -1809,6 +3606,30 @@ class MarkItDown:
             pass
         return []
 
+    def _guess_ext_magic_bytes(self, data: bytes) -> List[str]:
+        """Same as _guess_ext_magic, but for a document held in memory."""
+        try:
+            guesses = []
+            if len(data) > 0:
+                guesses = puremagic.magic_string(data)
+            if len(guesses) == 0:
+                # See _guess_ext_magic: retry after trimming leading ASCII whitespace
+                stripped = data.lstrip(b" \t\n\r\x0b\f")
+                if len(stripped) > 0:
+                    guesses = puremagic.magic_string(stripped)
+        except puremagic.main.PureError:
+            return []
+
+        extensions = list()
+        for g in guesses:
+            ext = g.extension.strip()
+            if len(ext) > 0:
+                if not ext.startswith("."):
+                    ext = "." + ext
+                if ext not in extensions:
+                    extensions.append(ext)
+        return extensions
+
     def register_page_converter(self, converter: DocumentConverter) -> None:
         """Register a page text converter."""
         self._page_converters.insert(0, converter)
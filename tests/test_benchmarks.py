@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks import parsers, startup
+from markitdown._markitdown import IS_LXML_CAPABLE
+
+
+@pytest.mark.skipif(not IS_LXML_CAPABLE, reason="lxml is not installed")
+def test_parsers_agree_on_the_corpus():
+    assert parsers.main(["--scale", "0.05", "--only"] + parsers.HTML_CASES) == 0
+
+
+@pytest.mark.skipif(not IS_LXML_CAPABLE, reason="lxml is not installed")
+@pytest.mark.parametrize("name", sorted(parsers.TAG_SOUP))
+def test_parsers_on_tag_soup(name):
+    # A fragment that starts or stops converting differently should be documented
+    diff = parsers.compare_fragment(name)
+    assert (diff is not None) == (name in parsers.KNOWN_DIFFERENCES), diff
+
+
+def test_importing_markitdown_loads_no_heavy_modules():
+    # In a fresh interpreter, as the CLI would be
+    assert startup.heavy_imports() == []
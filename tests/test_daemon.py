@@ -0,0 +1,71 @@
+import io
+import socket
+import threading
+
+import pytest
+
+from markitdown import _daemon
+
+pytestmark = pytest.mark.skipif(
+    not _daemon.IS_DAEMON_CAPABLE, reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def stuck_daemon(tmp_path):
+    """A daemon that accepts requests, then never answers them."""
+    socket_path = str(tmp_path / "markitdown.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    received = []
+    done = threading.Event()
+
+    def serve():
+        connection, _ = server.accept()
+        with connection, connection.makefile("rb") as reader:
+            reader.readline()
+            connection.sendall(b'{"accept": true}\n')
+            # The document, up to the client's shutdown
+            received.append(reader.read())
+            done.wait()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield socket_path, received
+    done.set()
+    thread.join()
+    server.close()
+
+
+def test_stalled_conversion_times_out_with_the_document(stuck_daemon):
+    socket_path, received = stuck_daemon
+    with pytest.raises(_daemon.DaemonTimeoutError) as info:
+        _daemon.convert_with_daemon(
+            socket_path, None, io.BytesIO(b"hello, world"), read_timeout=0.2
+        )
+    # The daemon had the whole document, and so does the in-process fallback
+    assert received == [b"hello, world"]
+    with info.value.stream as stream:
+        assert stream.read() == b"hello, world"
+
+
+def test_read_timeout_follows_the_conversion_timeout(stuck_daemon, monkeypatch):
+    socket_path, _ = stuck_daemon
+    monkeypatch.setattr(_daemon, "_READ_TIMEOUT_MARGIN", 0.1)
+    with pytest.raises(_daemon.DaemonTimeoutError, match="within 0.2 seconds"):
+        _daemon.convert_with_daemon(
+            socket_path, "document.txt", options={"timeout": 0.1}
+        )
+
+
+def test_unresponsive_daemon_is_not_used(tmp_path, monkeypatch):
+    # Listening, but never accepting a connection
+    monkeypatch.setattr(_daemon, "_CONNECT_TIMEOUT", 0.2)
+    socket_path = str(tmp_path / "markitdown.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        stream = io.BytesIO(b"hello")
+        assert _daemon.convert_with_daemon(socket_path, None, stream) is None
+        assert stream.tell() == 0
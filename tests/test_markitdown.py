@@ -0,0 +1,84 @@
+import io
+import os
+import tempfile
+import threading
+import zipfile
+
+from markitdown import DocumentSource, MarkItDown
+from markitdown._markitdown import DocumentConverter, DocumentConverterResult
+
+
+def _zip_bytes(prefix: str, count: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for i in range(count):
+            zf.writestr(f"{prefix}_{i}.txt", f"{prefix} file {i}\n" * 200)
+    return buffer.getvalue()
+
+
+def test_concurrent_spilled_zips_extract_apart(tmp_path, monkeypatch):
+    # Downloads larger than the memory threshold are spilled to temporary files, but keep the
+    # name from their URL. Each must still get an extraction directory of its own
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    markitdown = MarkItDown(memory_threshold=1024)
+    prefixes = [f"zip{n}" for n in range(8)]
+    results = {}
+    errors = []
+    barrier = threading.Barrier(len(prefixes))
+
+    def convert(prefix):
+        try:
+            data = _zip_bytes(prefix, 20)
+            barrier.wait()
+            # As convert_response() does
+            with DocumentSource.from_chunks([data], threshold=1024) as source:
+                source.name = "archive.zip"
+                results[prefix] = markitdown.convert_source(source).text_content
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=convert, args=(p,)) for p in prefixes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for prefix in prefixes:
+        text = results[prefix]
+        assert text.count("## File: ") == 20
+        for other in prefixes:
+            if other != prefix:
+                assert f"{other}_" not in text
+
+    # Every temporary file and directory has been removed
+    assert os.listdir(tmp_path) == []
+
+
+def test_corrupt_spilled_zip_leaves_nothing_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    markitdown = MarkItDown(memory_threshold=16)
+    result = markitdown.convert_stream(
+        io.BytesIO(b"PK\x03\x04" + b"\x00" * 100), file_extension=".zip"
+    )
+    assert result.text_content.startswith("[ERROR] Invalid or corrupted zip file")
+    assert os.listdir(tmp_path) == []
+
+
+class _PathConverter(DocumentConverter):
+    """Reads the document through a path, as the converters for binary formats do."""
+
+    def convert(self, local_path, **kwargs):
+        with open(os.fspath(local_path), "rb") as fh:
+            return DocumentConverterResult(title=None, text_content=fh.read().decode())
+
+
+def test_sandboxed_conversion_removes_child_temp_file(tmp_path, monkeypatch):
+    # The source is in memory in the parent, so only the forked child knows of its temporary file
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    markitdown = MarkItDown(timeout=30)
+    markitdown.register_page_converter(_PathConverter())
+    with DocumentSource.from_bytes(b"hello", name="doc.bin") as source:
+        assert markitdown.convert_source(source).text_content == "hello"
+        assert source.in_memory and source.path is None
+        assert os.listdir(tmp_path) == []